@@ -17,7 +17,7 @@ GTM Framework: Bull's-eye (Gabriel Weinberg)
     Middle Ring: Influencers (INFLUENCER) + Events (EVENTS)
     Pharma Line: Companion Diagnostics & Clinical Trials (PHARMA)
 
-Database: Supabase (PostgreSQL)
+Database: Supabase (PostgreSQL), or a local SQLite file (--storage sqlite)
     Tables: growth_leads, growth_email_drafts
     See: migrations/001_growth_system_tables.sql
 
@@ -26,18 +26,42 @@ Usage:
     python ai_growth_system.py --vertical DIRECT_B2B --mode draft
     python ai_growth_system.py --vertical all --mode full
     python ai_growth_system.py --vertical all --mode full --dry-run
+    python ai_growth_system.py --vertical all --mode search --record fixtures/
+    python ai_growth_system.py --vertical all --mode search --replay fixtures/
+    python ai_growth_system.py --vertical all --mode full --storage sqlite:////tmp/crm.db
+    python ai_growth_system.py --resume 20260301-142500-9f3a
 """
 
 import argparse
+import base64
+import codecs
+import functools
+import hashlib
+import itertools
 import json
 import logging
+import math
 import os
 import random
 import re
+import signal
+import socket
+import sqlite3
 import sys
+import threading
 import time
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+import unicodedata
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks
+    fcntl = None  # type: ignore
 
 # ---------------------------------------------------------------------------
 # Third-party imports (graceful degradation if missing)
@@ -63,6 +87,12 @@ try:
 except ImportError:
     httpx = None  # type: ignore
 
+try:
+    import h2  # noqa: F401 — lets httpx speak HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # ---------------------------------------------------------------------------
 # Logging setup
 # ---------------------------------------------------------------------------
@@ -839,8 +869,22 @@ def _load_env() -> None:
     logger.warning("No .env.local or .env file found. Using OS env vars.")
 
 
-def _get_supabase_client() -> Any:
-    """Create a Supabase client using the project's connection pattern."""
+def _supabase_url() -> Optional[str]:
+    """Supabase project URL from the environment."""
+    # Support both VITE_-prefixed (frontend) and plain (backend) vars
+    return (
+        os.environ.get("SUPABASE_URL")
+        or os.environ.get("VITE_SUPABASE_URL")
+    )
+
+
+def _get_supabase_client(http: Optional["HttpClients"] = None) -> Any:
+    """
+    Create a Supabase client using the project's connection pattern.
+
+    With `http`, PostgREST requests go through its pooled "supabase"
+    client (needs a supabase-py whose ClientOptions takes httpx_client).
+    """
     if create_client is None:
         logger.error(
             "supabase package not installed. "
@@ -848,11 +892,7 @@ def _get_supabase_client() -> Any:
         )
         sys.exit(1)
 
-    # Support both VITE_-prefixed (frontend) and plain (backend) vars
-    url = (
-        os.environ.get("SUPABASE_URL")
-        or os.environ.get("VITE_SUPABASE_URL")
-    )
+    url = _supabase_url()
     # Prefer service key for backend scripts (bypasses RLS)
     key = (
         os.environ.get("SUPABASE_SERVICE_KEY")
@@ -867,20 +907,78 @@ def _get_supabase_client() -> Any:
         )
         sys.exit(1)
 
+    if http is not None:
+        try:
+            from supabase import ClientOptions
+            return create_client(
+                url, key,
+                options=ClientOptions(httpx_client=http.get("supabase")),
+            )
+        except (ImportError, TypeError):
+            logger.info(
+                "supabase-py too old to share a connection pool; "
+                "it will manage its own connections"
+            )
     return create_client(url, key)
 
 
-def parse_linkedin_url(url: str) -> Optional[str]:
-    """Extract the LinkedIn profile slug from a URL."""
-    match = re.search(r"linkedin\.com/in/([^/?#]+)", url)
-    return match.group(1).rstrip("/") if match else None
+def _state_path(*parts: str) -> str:
+    """
+    Path inside the local state directory (caches, run statistics).
+
+    Defaults to .growth_state/ next to this script; override with the
+    GROWTH_STATE_DIR environment variable.
+    """
+    base = os.environ.get("GROWTH_STATE_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".growth_state"
+    )
+    path = os.path.join(base, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def _postgrest_quote(value: str) -> str:
+    """Quote a value for a PostgREST or=(...) filter string."""
+    return '"%s"' % value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a search query (case and whitespace folded)."""
+    return " ".join(query.lower().split())
+
+
+def search_key(query: str, num_results: int) -> str:
+    """Stable identity of a result page: normalized query + result count."""
+    return f"{num_results}|{normalize_query(query)}"
+
+
+# Patterns and lookup tables for result parsing, compiled once at import
+# rather than on every hit — bulk imports parse millions of titles.
+LINKEDIN_SLUG_RE = re.compile(r"linkedin\.com/in/([^/?#]+)")
+LINKEDIN_PROFILE_URL_RE = re.compile(r"https?://(www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+/?")
+LINKEDIN_SUFFIX_RE = re.compile(r"\s*[|–—]\s*LinkedIn\s*$", re.IGNORECASE)
+TITLE_SEPARATOR_RE = re.compile(r"\s*[-–—]\s*")
+TRUNCATION_RE = re.compile(r"\s*\.{2,}\s*$")
+SLUG_ID_RE = re.compile(r"^[0-9a-f]{5,}$")
+SNIPPET_CLAUSE_RE = re.compile(r"[^.·|]+")
+# Standard email regex — catches most valid emails
+EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}")
+# Obvious junk (image files, example domains, etc.)
+BLOCKED_EMAIL_DOMAINS = frozenset(
+    {"example.com", "email.com", "test.com", "sentry.io", "linkedin.com"}
+)
+BLOCKED_EMAIL_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp")
 
 
 def _clean_truncated(text: Optional[str]) -> Optional[str]:
     """Remove trailing ellipsis left by Google's title truncation."""
     if not text:
         return text
-    return re.sub(r"\s*\.{2,}\s*$", "", text).rstrip("…").strip() or None
+    last = text[-1]
+    if last not in ".…" and not last.isspace():
+        # Fast path: nothing trailing to remove
+        return text.strip() or None
+    return TRUNCATION_RE.sub("", text).rstrip("…").strip() or None
 
 
 def parse_linkedin_title(title: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
@@ -893,9 +991,10 @@ def parse_linkedin_title(title: str) -> Tuple[Optional[str], Optional[str], Opti
         return None, None, None
 
     # Remove " | LinkedIn" suffix
-    title = re.sub(r"\s*[|–—]\s*LinkedIn\s*$", "", title, flags=re.IGNORECASE)
+    if title.rstrip()[-8:].lower() == "linkedin":
+        title = LINKEDIN_SUFFIX_RE.sub("", title)
     # Split by common separators
-    parts = [p.strip() for p in re.split(r"\s*[-–—]\s*", title) if p.strip()]
+    parts = [p for p in TITLE_SEPARATOR_RE.split(title.strip()) if p]
 
     name = _clean_truncated(parts[0]) if len(parts) > 0 else None
     job_title = _clean_truncated(parts[1]) if len(parts) > 1 else None
@@ -917,7 +1016,7 @@ def infer_name_from_slug(slug: str) -> str:
     name_parts = []
     for part in parts:
         # Skip parts that look like LinkedIn's random ID suffixes
-        if re.match(r"^[0-9a-f]{5,}$", part):
+        if SLUG_ID_RE.match(part):
             continue
         if part.isdigit():
             continue
@@ -927,55 +1026,24 @@ def infer_name_from_slug(slug: str) -> str:
 
 
 def infer_geo_from_query(query: str) -> Optional[str]:
-    """Infer geographic region from the search query used."""
-    geo_keywords = {
-        "Argentina": "Argentina",
-        "Brazil": "Brazil",
-        "Brasil": "Brazil",
-        "South Africa": "South Africa",
-        "Nigeria": "Nigeria",
-        "Paraguay": "Paraguay",
-        "Uruguay": "Uruguay",
-        "Bolivia": "Bolivia",
-        "Peru": "Peru",
-        "Colombia": "Colombia",
-        "México": "Mexico",
-        "Mexico": "Mexico",
-        "Chile": "Chile",
-        "Kenya": "Kenya",
-        "Ghana": "Ghana",
-        "Ethiopia": "Ethiopia",
-        "Tanzania": "Tanzania",
-        "West Africa": "West Africa",
-        "LATAM": "Latin America",
-        "Latin America": "Latin America",
-    }
-    for keyword, geo in geo_keywords.items():
-        if keyword.lower() in query.lower():
-            return geo
-    return None
+    """Infer geographic region from the search query used (memoised)."""
+    return GAZETTEER.infer_query(query)["geo"]
 
 
 def extract_emails_from_text(text: str) -> List[str]:
     """Extract email addresses from a text string (search snippet, title, etc.)."""
-    if not text:
+    if not text or "@" not in text:
         return []
-    # Standard email regex — catches most valid emails
-    pattern = r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}"
-    emails = re.findall(pattern, text)
-    # Filter out obvious junk (image files, example domains, etc.)
-    blocked_domains = {"example.com", "email.com", "test.com", "sentry.io", "linkedin.com"}
-    blocked_extensions = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp"}
     clean = []
-    for email in emails:
+    for email in EMAIL_RE.findall(text):
         email_lower = email.lower()
-        domain = email_lower.split("@")[1] if "@" in email_lower else ""
-        if domain in blocked_domains:
+        if email_lower.rpartition("@")[2] in BLOCKED_EMAIL_DOMAINS:
             continue
-        if any(email_lower.endswith(ext) for ext in blocked_extensions):
+        if email_lower.endswith(BLOCKED_EMAIL_EXTENSIONS):
             continue
         clean.append(email_lower)
-    return list(set(clean))
+    # De-duplicated, in order of appearance
+    return list(dict.fromkeys(clean))
 
 
 def build_email_search_queries(name: str, company: Optional[str]) -> List[str]:
@@ -1010,358 +1078,4648 @@ def determine_language(geo: Optional[str]) -> str:
     """Determine email language based on lead geography."""
     if not geo:
         return "en"
-    geo_lower = geo.lower()
-    if "brazil" in geo_lower or "brasil" in geo_lower:
-        return "pt"
-    latam_es = [
-        "argentina", "paraguay", "uruguay", "bolivia", "peru",
-        "mexico", "colombia", "chile", "ecuador", "venezuela",
-        "costa rica", "panama", "guatemala",
-    ]
-    for country in latam_es:
-        if country in geo_lower:
-            return "es"
-    return "en"
+    return GAZETTEER.infer_query(geo)["language"]
 
 
 # ============================================================================
-# Agent 1: SafeSearcher
+# Geo gazetteer
 # ============================================================================
-# GTM: Implements the Google Dorking search patterns from each vertical
-# in the Bull's-eye framework.
+# Countries, regions and major cities with their Spanish/Portuguese
+# spellings, compiled into one Aho-Corasick automaton over accent-folded
+# text. A single scan of a query or snippet finds every place it names;
+# query results are memoised since one query backs many hits.
+#
+# Entries: (name, kind, language, country, aliases). `language` drives
+# the draft language; cities resolve to their country. Extra entries can
+# be loaded from a JSON list of objects with the same keys
+# (--gazetteer FILE). Many city names are also given names or surnames
+# (Rosario, Mendoza, Fortaleza), so in result snippets a city only
+# counts in a location position, never as part of the lead's name.
+
+DEFAULT_GAZETTEER: List[Tuple[str, str, Optional[str], Optional[str], Tuple[str, ...]]] = [
+    # Latin America
+    ("Argentina", "country", "es", None, ()),
+    ("Brazil", "country", "pt", None, ("Brasil",)),
+    ("Mexico", "country", "es", None, ("México", "Méjico")),
+    ("Colombia", "country", "es", None, ()),
+    ("Chile", "country", "es", None, ()),
+    ("Peru", "country", "es", None, ("Perú",)),
+    ("Uruguay", "country", "es", None, ()),
+    ("Paraguay", "country", "es", None, ()),
+    ("Bolivia", "country", "es", None, ()),
+    ("Ecuador", "country", "es", None, ()),
+    ("Venezuela", "country", "es", None, ()),
+    ("Costa Rica", "country", "es", None, ()),
+    ("Panama", "country", "es", None, ("Panamá",)),
+    ("Guatemala", "country", "es", None, ()),
+    ("Honduras", "country", "es", None, ()),
+    ("El Salvador", "country", "es", None, ()),
+    ("Nicaragua", "country", "es", None, ()),
+    ("Dominican Republic", "country", "es", None, ("República Dominicana",)),
+    ("Cuba", "country", "es", None, ()),
+    ("Puerto Rico", "country", "es", None, ()),
+    # Africa
+    ("South Africa", "country", "en", None, ("Sudáfrica", "África do Sul")),
+    ("Nigeria", "country", "en", None, ("Nigéria",)),
+    ("Kenya", "country", "en", None, ("Kenia", "Quênia")),
+    ("Ghana", "country", "en", None, ("Gana",)),
+    ("Ethiopia", "country", "en", None, ("Etiopía", "Etiópia")),
+    ("Tanzania", "country", "en", None, ("Tanzânia",)),
+    ("Uganda", "country", "en", None, ()),
+    ("Rwanda", "country", "en", None, ("Ruanda",)),
+    ("Zambia", "country", "en", None, ("Zâmbia",)),
+    ("Zimbabwe", "country", "en", None, ("Zimbábue",)),
+    ("Botswana", "country", "en", None, ()),
+    ("Namibia", "country", "en", None, ("Namíbia",)),
+    ("Cameroon", "country", "en", None, ("Camerún", "Camarões")),
+    ("Egypt", "country", "en", None, ("Egipto", "Egito")),
+    ("Morocco", "country", "en", None, ("Marruecos", "Marrocos")),
+    ("Côte d'Ivoire", "country", "en", None, ("Ivory Coast", "Costa de Marfil", "Costa do Marfim")),
+    ("Senegal", "country", "en", None, ()),
+    ("Angola", "country", "pt", None, ()),
+    ("Mozambique", "country", "pt", None, ("Moçambique",)),
+    ("Cape Verde", "country", "pt", None, ("Cabo Verde",)),
+    # Elsewhere
+    ("Spain", "country", "es", None, ("España",)),
+    ("Portugal", "country", "pt", None, ()),
+    ("United States", "country", "en", None, ("Estados Unidos",)),
+    ("United Kingdom", "country", "en", None, ("Reino Unido",)),
+    # Regions (no single language)
+    ("Latin America", "region", None, None,
+     ("LATAM", "Latinoamérica", "América Latina", "Latinoamerica")),
+    ("South America", "region", None, None, ("Sudamérica", "Suramérica", "América do Sul")),
+    ("Central America", "region", None, None, ("Centroamérica", "América Central")),
+    ("Caribbean", "region", None, None, ("Caribe",)),
+    ("West Africa", "region", None, None, ("África Occidental", "África Ocidental")),
+    ("East Africa", "region", None, None, ("África Oriental",)),
+    ("Southern Africa", "region", None, None, ("África Austral",)),
+    ("Sub-Saharan Africa", "region", None, None, ("África Subsahariana", "África Subsaariana")),
+    ("Africa", "region", None, None, ("África", "African")),
+    # Major cities
+    ("Buenos Aires", "city", "es", "Argentina", ()),
+    ("Rosario", "city", "es", "Argentina", ()),
+    ("Mendoza", "city", "es", "Argentina", ()),
+    ("São Paulo", "city", "pt", "Brazil", ()),
+    ("Rio de Janeiro", "city", "pt", "Brazil", ()),
+    ("Belo Horizonte", "city", "pt", "Brazil", ()),
+    ("Porto Alegre", "city", "pt", "Brazil", ()),
+    ("Curitiba", "city", "pt", "Brazil", ()),
+    ("Brasília", "city", "pt", "Brazil", ()),
+    ("Recife", "city", "pt", "Brazil", ()),
+    ("Fortaleza", "city", "pt", "Brazil", ()),
+    ("Mexico City", "city", "es", "Mexico", ("Ciudad de México", "CDMX")),
+    ("Guadalajara", "city", "es", "Mexico", ()),
+    ("Monterrey", "city", "es", "Mexico", ()),
+    ("Bogotá", "city", "es", "Colombia", ()),
+    ("Medellín", "city", "es", "Colombia", ()),
+    ("Santiago de Chile", "city", "es", "Chile", ()),
+    ("Montevideo", "city", "es", "Uruguay", ()),
+    ("Asunción", "city", "es", "Paraguay", ()),
+    ("Quito", "city", "es", "Ecuador", ()),
+    ("Caracas", "city", "es", "Venezuela", ()),
+    ("Johannesburg", "city", "en", "South Africa", ("Joanesburgo",)),
+    ("Cape Town", "city", "en", "South Africa", ("Ciudad del Cabo", "Cidade do Cabo")),
+    ("Durban", "city", "en", "South Africa", ()),
+    ("Pretoria", "city", "en", "South Africa", ()),
+    ("Lagos", "city", "en", "Nigeria", ()),
+    ("Abuja", "city", "en", "Nigeria", ()),
+    ("Nairobi", "city", "en", "Kenya", ()),
+    ("Accra", "city", "en", "Ghana", ()),
+    ("Addis Ababa", "city", "en", "Ethiopia", ()),
+    ("Dar es Salaam", "city", "en", "Tanzania", ()),
+    ("Kampala", "city", "en", "Uganda", ()),
+    ("Kigali", "city", "en", "Rwanda", ()),
+    ("Cairo", "city", "en", "Egypt", ("El Cairo",)),
+    ("Luanda", "city", "pt", "Angola", ()),
+    ("Maputo", "city", "pt", "Mozambique", ()),
+    ("Madrid", "city", "es", "Spain", ()),
+    ("Barcelona", "city", "es", "Spain", ()),
+    ("Lisbon", "city", "pt", "Portugal", ("Lisboa",)),
+]
+
+
+COMBINING_MARKS_RE = re.compile(r"[\u0300-\u036f]")
+
+
+def fold_text(text: Optional[str]) -> str:
+    """
+    Lowercase ASCII form with accents stripped, e.g. 'José Pérez' →
+    'jose perez'. Characters with no ASCII base (·, ’, non-Latin
+    scripts) become spaces.
+    """
+    text = text or ""
+    if not text.isascii():
+        text = COMBINING_MARKS_RE.sub("", unicodedata.normalize("NFKD", text))
+        text = text.encode("ascii", "replace").decode("ascii").replace("?", " ")
+    return text.lower()
+
+
+GAZETTEER_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Snippet segments ("Pathologist at X · Buenos Aires · 500+ connections")
+SNIPPET_SEGMENT_RE = re.compile(r"[·|•\n]")
+# Folded words that may lead or pad a location segment
+LOCATION_LABELS = frozenset({
+    "location", "ubicacion", "localizacion", "localizacao", "based",
+})
+LOCATION_FILLER = frozenset({
+    "in", "area", "greater", "metropolitan", "metropolitana", "region",
+    "regiao", "de", "do", "da", "del", "province", "provincia", "state",
+    "estado", "city", "ciudad", "cidade",
+})
+
+
+class AhoCorasick:
+    """
+    Multi-pattern automaton over word tokens.
 
-class SafeSearcher:
+    Built once from (token tuple, value) pairs; `find(tokens)` reports
+    every occurrence of any pattern in one left-to-right pass. Working on
+    words rather than characters gives whole-word matching for free
+    ("Peru" never matches inside "Perugia") and far fewer steps per text.
     """
-    Searches for LinkedIn prospects via Google Dorking by vertical.
 
-    Uses googlesearch-python to find LinkedIn profile URLs matching
-    the target roles and geographies defined in VERTICAL_CONFIGS.
+    def __init__(self, patterns: Iterable[Tuple[Tuple[str, ...], Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        for pattern, value in patterns:
+            state = 0
+            for token in pattern:
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), value))
+
+        # Breadth-first failure links; outputs inherit along them
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(token, 0) if state else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, tokens: List[str]) -> List[Tuple[int, int, Any]]:
+        """All matches as (start, end, value) token offsets, by end."""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        matches = []
+        state = 0
+        for i, token in enumerate(tokens):
+            if not state:
+                # Most words start nothing: one dict probe and move on
+                state = root.get(token, 0)
+                if not state:
+                    continue
+            else:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            for length, value in out[state]:
+                matches.append((i + 1 - length, i + 1, value))
+        return matches
+
 
-    Rate limiting: 10-20s random interval between searches.
-    Max searches per run: configurable (default 20).
-    HTTP 429 handling: exponential backoff (30s, 60s, 120s), max 3 retries.
+class Gazetteer:
+    """
+    Place-name lookup compiled into an AhoCorasick automaton.
+
+    `infer(text)` returns {"geos": [...], "countries": [...],
+    "geo": primary geo or None, "language": "es" | "pt" | "en"} with
+    every place named in the text, overlapping names resolved
+    leftmost-longest ("South Africa" rather than "Africa"). The primary
+    geo is the first country named (cities count as their country),
+    else the first region. `infer_query` is the memoised variant for
+    search queries; `infer_snippet` is the stricter one for result
+    snippets.
     """
 
-    # Rate limiting constants
-    MIN_DELAY_SECONDS = 10
-    MAX_DELAY_SECONDS = 20
-    BACKOFF_BASE_SECONDS = 30
-    MAX_RETRIES = 3
-    RESULTS_PER_QUERY = 10
-
-    def __init__(self, max_searches: int = 20):
-        if google_search is None:
-            logger.error(
-                "googlesearch-python not installed. "
-                "Run: pip install -r requirements_growth.txt"
+    QUERY_MEMO_SIZE = 4096
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Optional[str], Optional[str], Tuple[str, ...]]]):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.add(entries)
+
+    def add(self, entries: Iterable[Tuple[str, str, Optional[str], Optional[str], Tuple[str, ...]]]) -> None:
+        """Add entries (replacing same-named ones) and recompile."""
+        for name, kind, language, country, aliases in entries:
+            self.entries[name] = {
+                "name": name,
+                "kind": kind,
+                "language": language,
+                "country": country or (name if kind == "country" else None),
+                "aliases": tuple(aliases),
+            }
+        self._automaton = AhoCorasick(
+            (tuple(GAZETTEER_TOKEN_RE.findall(fold_text(spelling))), entry)
+            for entry in self.entries.values()
+            for spelling in (entry["name"],) + entry["aliases"]
+        )
+        self.infer_query = functools.lru_cache(maxsize=self.QUERY_MEMO_SIZE)(self.infer)
+
+    @classmethod
+    def load(cls, path: str) -> List[Tuple[str, str, Optional[str], Optional[str], Tuple[str, ...]]]:
+        """Read extra entries from a JSON list of entry objects."""
+        with open(path, encoding="utf-8") as fh:
+            raw = json.load(fh)
+        return [
+            (
+                item["name"], item.get("kind", "country"), item.get("language"),
+                item.get("country"), tuple(item.get("aliases", ())),
             )
-            sys.exit(1)
+            for item in raw
+        ]
 
-        self.max_searches = max_searches
-        self.searches_done = 0
-        self.results: List[Dict[str, Any]] = []
+    def infer(self, text: Optional[str]) -> Dict[str, Any]:
+        tokens = GAZETTEER_TOKEN_RE.findall(fold_text(text)) if text else []
+        return self._summarise(entry for _, _, entry in self._scan(tokens))
 
-    def search_vertical(self, vertical: str) -> List[Dict[str, Any]]:
+    def infer_snippet(
+        self, snippet: Optional[str], name: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Execute all search queries for a given vertical.
-
-        Returns a list of raw lead dicts with keys:
-            full_name, job_title, company, linkedin_url, vertical,
-            source_query, geo
+        infer() for a result snippet. Countries and regions count
+        anywhere; a city only in a segment that is nothing but place
+        names (or starts with a label like "Location:"), and never when
+        it shares a word with the lead's `name`.
         """
-        config = VERTICAL_CONFIGS.get(vertical)
-        if not config:
-            logger.error("Unknown vertical: %s", vertical)
-            return []
+        tokens = GAZETTEER_TOKEN_RE.findall(fold_text(snippet)) if snippet else []
+        matches = self._scan(tokens)
+        if all(entry["kind"] != "city" for _, _, entry in matches):
+            return self._summarise(entry for _, _, entry in matches)
+        name_tokens = set(GAZETTEER_TOKEN_RE.findall(fold_text(name)))
+        entries = []
+        for segment in SNIPPET_SEGMENT_RE.split(snippet or ""):
+            tokens = GAZETTEER_TOKEN_RE.findall(fold_text(segment))
+            matches = self._scan(tokens)
+            if not matches:
+                continue
+            covered = {i for start, stop, _ in matches for i in range(start, stop)}
+            located = tokens[0] in LOCATION_LABELS or all(
+                i in covered or token in LOCATION_FILLER
+                for i, token in enumerate(tokens)
+            )
+            for start, stop, entry in matches:
+                if entry["kind"] == "city" and (
+                    not located or name_tokens.intersection(tokens[start:stop])
+                ):
+                    continue
+                entries.append(entry)
+        return self._summarise(entries)
+
+    def is_place(self, text: str) -> bool:
+        """True if `text` is exactly one place name (any spelling)."""
+        tokens = GAZETTEER_TOKEN_RE.findall(fold_text(text))
+        return bool(tokens) and any(
+            start == 0 and stop == len(tokens)
+            for start, stop, _ in self._automaton.find(tokens)
+        )
 
-        queries = config["search_queries"]
-        leads_found: List[Dict[str, Any]] = []
+    def _scan(self, tokens: List[str]) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Place matches in `tokens`, overlaps resolved leftmost-longest."""
+        matches = sorted(
+            self._automaton.find(tokens), key=lambda m: (m[0], m[0] - m[1])
+        )
+        kept = []
+        end = 0
+        for start, stop, entry in matches:
+            if start < end:
+                continue
+            end = stop
+            kept.append((start, stop, entry))
+        return kept
 
-        for query in queries:
-            if self.searches_done >= self.max_searches:
-                logger.warning(
-                    "Reached max searches limit (%d). Stopping.",
-                    self.max_searches,
-                )
-                break
+    @staticmethod
+    def _summarise(entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        geos: List[str] = []
+        countries: List[str] = []
+        language = None
+        region = None
+        for entry in entries:
+            if entry["name"] not in geos:
+                geos.append(entry["name"])
+            if entry["country"]:
+                if entry["country"] not in countries:
+                    countries.append(entry["country"])
+                language = language or entry["language"]
+            elif region is None:
+                region = entry["name"]
+        return {
+            "geos": geos,
+            "countries": countries,
+            "geo": countries[0] if countries else region,
+            "language": language or "en",
+        }
 
-            logger.info(
-                "[SafeSearcher] Executing query %d/%d for %s: %.80s...",
-                self.searches_done + 1,
-                self.max_searches,
-                vertical,
-                query,
-            )
 
-            results = self._execute_search(query)
-            self.searches_done += 1
+GAZETTEER = Gazetteer(DEFAULT_GAZETTEER)
 
-            for result in results:
-                url = result.get("url", "")
-                if "linkedin.com/in/" not in url:
-                    continue
 
-                slug = parse_linkedin_url(url)
-                if not slug:
-                    continue
+# ============================================================================
+# Search result parsing
+# ============================================================================
 
-                # Parse name/title/company from search result title
-                title = result.get("title", "")
-                name, job_title, company = parse_linkedin_title(title)
-
-                # Fallback: infer name from URL slug
-                if not name:
-                    name = infer_name_from_slug(slug)
-
-                geo = infer_geo_from_query(query)
-
-                # Try to extract email from search snippet/description
-                snippet = result.get("description", "")
-                found_emails = extract_emails_from_text(
-                    f"{title} {snippet}"
-                )
-
-                # Try to get fuller job title / company from snippet
-                # when the Google title was truncated
-                if snippet and job_title:
-                    # Snippets often start with the full title text
-                    snippet_lower = snippet.lower()
-                    jt_lower = job_title.lower()
-                    if jt_lower in snippet_lower:
-                        idx = snippet_lower.index(jt_lower)
-                        # Extract longer version up to next sentence boundary
-                        rest = snippet[idx:]
-                        match = re.match(r"^([^.·|]+)", rest)
-                        if match:
-                            fuller = _clean_truncated(match.group(1).strip())
-                            if fuller and len(fuller) > len(job_title):
-                                job_title = fuller
-
-                lead = {
-                    "full_name": name,
-                    "job_title": job_title,
-                    "company": company,
-                    "email": found_emails[0] if found_emails else None,
-                    "linkedin_url": f"https://www.linkedin.com/in/{slug}",
-                    "vertical": vertical,
-                    "source_query": query,
-                    "geo": geo,
-                    "description": snippet,
-                }
-                leads_found.append(lead)
-                logger.info(
-                    "[SafeSearcher] Found: %s — %s at %s (%s)",
-                    name, job_title or "?", company or "?", url,
-                )
+class ResultColumns:
+    """
+    Parsed search hits stored column-wise: one list per field.
 
-            logger.info(
-                "[SafeSearcher] Query returned %d LinkedIn profiles",
-                len([r for r in results if "linkedin.com/in/" in r.get("url", "")]),
-            )
+    Produced by ResultParser.parse_page for a whole result page (or
+    accumulated across pages of a replayed/imported SERP archive), so
+    bulk consumers can take the columns as-is instead of allocating a
+    dict per lead. `rows()` yields the usual raw lead dicts on demand.
+    """
 
-            # Rate limiting between searches
-            if self.searches_done < self.max_searches:
-                delay = random.uniform(
-                    self.MIN_DELAY_SECONDS, self.MAX_DELAY_SECONDS
-                )
-                logger.info(
-                    "[SafeSearcher] Rate limit: waiting %.1fs before next query",
-                    delay,
-                )
-                time.sleep(delay)
+    FIELDS = (
+        "slug", "full_name", "job_title", "company", "email", "geo",
+        "vertical", "source_query", "description",
+    )
+    __slots__ = FIELDS
+
+    def __init__(self) -> None:
+        for field in self.FIELDS:
+            setattr(self, field, [])
+
+    def __len__(self) -> int:
+        return len(self.slug)
+
+    def extend(self, other: "ResultColumns") -> None:
+        for field in self.FIELDS:
+            getattr(self, field).extend(getattr(other, field))
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Raw lead dicts, as ResultParser.parse would return them."""
+        for (slug, name, job_title, company, email, geo,
+             vertical, query, snippet) in zip(
+                *(getattr(self, field) for field in self.FIELDS)):
+            yield {
+                "full_name": name,
+                "job_title": job_title,
+                "company": company,
+                "email": email,
+                "linkedin_url": f"https://www.linkedin.com/in/{slug}",
+                "vertical": vertical,
+                "source_query": query,
+                "geo": geo,
+                "description": snippet,
+            }
 
-        logger.info(
-            "[SafeSearcher] Vertical %s complete: %d leads found from %d searches",
-            vertical, len(leads_found), self.searches_done,
-        )
-        self.results.extend(leads_found)
-        return leads_found
 
-    def search_email_for_lead(
-        self, name: str, company: Optional[str] = None
-    ) -> Optional[str]:
-        """
-        Try to find an email for a person via Google Dorking.
+class ResultParser:
+    """
+    Turns raw search hits into raw leads, one pass per hit.
+
+    Uses only the module's precompiled patterns and frozen lookup
+    tables: the URL is scanned once for the slug, the title is split
+    once, the snippet is searched once for a fuller job title, and
+    title + snippet are scanned for emails only when they contain '@'.
+    `parse_page` handles a whole result page into ResultColumns;
+    `parse` is the single-hit form. SafeSearcher and bulk SERP imports
+    share this path (see bench_growth_parser.py for its throughput).
+    """
+
+    def parse(
+        self,
+        result: Dict[str, str],
+        query: str,
+        vertical: str,
+        geo_query: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Parse one hit; None if it is not a LinkedIn profile."""
+        page = self.parse_page([result], query, vertical, geo_query)
+        return next(page.rows(), None)
 
-        Runs targeted email-finding queries and returns the first
-        email found, or None if nothing found.
+    def parse_page(
+        self,
+        results: List[Dict[str, str]],
+        query: str,
+        vertical: Optional[str] = None,
+        geo_query: Optional[str] = None,
+        attribute: Optional[Callable[[str, Dict[str, str]], Tuple[str, str]]] = None,
+        columns: Optional[ResultColumns] = None,
+    ) -> ResultColumns:
         """
-        queries = build_email_search_queries(name, company)
-        if not queries:
-            return None
+        Parse a page of hits for `query` into columns (appending to
+        `columns` if given). Non-profile hits are skipped.
 
-        for query in queries:
-            if self.searches_done >= self.max_searches:
-                break
+        `attribute(query, result)` returns the (vertical, geo query) of
+        each profile hit, for pages of compiled queries; otherwise all
+        hits get `vertical` and the geo of `geo_query or query`.
+        """
+        columns = columns if columns is not None else ResultColumns()
+        page_geo = None if attribute else infer_geo_from_query(geo_query or query)
+        slugs, names, job_titles = columns.slug, columns.full_name, columns.job_title
+        companies, emails, geos = columns.company, columns.email, columns.geo
+        verticals, queries, snippets = (
+            columns.vertical, columns.source_query, columns.description
+        )
+        for result in results:
+            match = LINKEDIN_SLUG_RE.search(result.get("url", ""))
+            if not match:
+                continue
+            slug = match.group(1).rstrip("/")
+            if not slug:
+                continue
 
-            logger.info(
-                "[SafeSearcher] Email search for '%s': %.80s...",
-                name, query,
-            )
-            results = self._execute_search(query)
-            self.searches_done += 1
+            # Parse name/title/company from search result title
+            title = result.get("title", "")
+            name, job_title, company = parse_linkedin_title(title)
 
-            # Extract emails from all results
-            for result in results:
-                text = f"{result.get('title', '')} {result.get('description', '')}"
-                emails = extract_emails_from_text(text)
-                if emails:
-                    logger.info(
-                        "[SafeSearcher] Found email for %s: %s",
-                        name, emails[0],
-                    )
-                    return emails[0]
+            # Fallback: infer name from URL slug
+            if not name:
+                name = infer_name_from_slug(slug)
 
-            # Rate limit
-            if self.searches_done < self.max_searches:
-                delay = random.uniform(
-                    self.MIN_DELAY_SECONDS, self.MAX_DELAY_SECONDS
-                )
-                time.sleep(delay)
+            snippet = result.get("description", "")
+            if snippet and job_title:
+                job_title = self._expand_job_title(job_title, snippet)
 
-        return None
+            # Try to extract email from search snippet/description
+            found_emails = extract_emails_from_text(f"{title} {snippet}")
 
-    def search_all_verticals(self) -> List[Dict[str, Any]]:
-        """Execute searches across all verticals."""
-        all_leads: List[Dict[str, Any]] = []
-        for vertical in VERTICAL_CONFIGS:
-            if self.searches_done >= self.max_searches:
-                break
-            leads = self.search_vertical(vertical)
-            all_leads.extend(leads)
-        return all_leads
+            if attribute:
+                hit_vertical, hit_geo_query = attribute(query, result)
+                geo = infer_geo_from_query(hit_geo_query)
+            else:
+                hit_vertical, geo = vertical, page_geo
+
+            slugs.append(slug)
+            names.append(name)
+            job_titles.append(job_title)
+            companies.append(company)
+            emails.append(found_emails[0] if found_emails else None)
+            geos.append(geo or GAZETTEER.infer_snippet(snippet, name)["geo"])
+            verticals.append(hit_vertical)
+            queries.append(query)
+            snippets.append(snippet)
+        return columns
 
-    def _execute_search(self, query: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _expand_job_title(job_title: str, snippet: str) -> str:
         """
-        Execute a single Google search with retry/backoff on HTTP 429.
-
-        Returns list of dicts with 'url', 'title', 'description'.
+        Longer job title from the snippet when Google truncated the
+        title. Snippets often start with the full title text, so an
+        exact-case find is tried before a case-insensitive one.
         """
-        for attempt in range(self.MAX_RETRIES + 1):
-            try:
-                results = []
-                # Use advanced=True to get title + description
-                for item in google_search(
-                    query,
-                    num_results=self.RESULTS_PER_QUERY,
-                    advanced=True,
-                    sleep_interval=0,
-                ):
-                    results.append({
-                        "url": getattr(item, "url", str(item)),
-                        "title": getattr(item, "title", ""),
-                        "description": getattr(item, "description", ""),
-                    })
-                return results
+        if len(job_title) >= len(snippet):
+            return job_title
+        idx = snippet.find(job_title)
+        if idx < 0:
+            idx = snippet.lower().find(job_title.lower())
+            if idx < 0:
+                return job_title
+        # Extract longer version up to next sentence boundary
+        clause = SNIPPET_CLAUSE_RE.match(snippet, idx)
+        if clause:
+            fuller = _clean_truncated(clause.group(0).strip())
+            if fuller and len(fuller) > len(job_title):
+                return fuller
+        return job_title
 
-            except Exception as exc:
-                exc_str = str(exc).lower()
-                is_rate_limit = "429" in exc_str or "too many" in exc_str
 
-                if is_rate_limit and attempt < self.MAX_RETRIES:
-                    backoff = self.BACKOFF_BASE_SECONDS * (2 ** attempt)
-                    logger.warning(
-                        "[SafeSearcher] HTTP 429 — backing off %ds "
-                        "(attempt %d/%d)",
-                        backoff, attempt + 1, self.MAX_RETRIES,
+# ============================================================================
+# Rate limiting
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every in-flight search.
+
+    Tokens refill continuously at `rate` per second (capacity 1, so no
+    bursts). Each acquire() costs a random amount in [1 - jitter, 1 + jitter]
+    tokens: the mean cost is 1, so the long-run request rate is exactly
+    `rate` while the spacing between requests stays irregular.
+    """
+
+    def __init__(self, rate: float, jitter: float = 0.0):
+        self.rate = rate
+        self.jitter = jitter
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    1.0, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= random.uniform(
+                        1.0 - self.jitter, 1.0 + self.jitter
                     )
-                    time.sleep(backoff)
+                    return waited
                 else:
-                    logger.error(
-                        "[SafeSearcher] Search failed: %s", exc,
-                    )
-                    return []
+                    delay = (1.0 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens to every caller for `seconds`."""
+        with self._lock:
+            self._blocked_until = max(
+                self._blocked_until, time.monotonic() + seconds
+            )
 
-        return []
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate; tokens accrued so far are kept."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                1.0, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self.rate = rate
+
+
+class SearchRateLimited(Exception):
+    """Raised by a search backend when the engine throttles us (HTTP 429)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) to seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateController:
+    """
+    AIMD control of a TokenBucket's request rate.
+
+    Every clean result page raises the rate by INCREASE_STEP (additive
+    increase); a 429 or an empty page multiplies it by DECREASE_FACTOR
+    (multiplicative decrease). The rate is clamped to [min_rate,
+    max_rate] and saved per backend, so the next run starts from the last
+    rate that worked instead of the conservative default. Saved state
+    older than STATE_MAX_AGE_HOURS is ignored.
+    """
+
+    INCREASE_STEP = 0.005           # requests/second added per clean page
+    DECREASE_FACTOR = 0.5
+    MIN_RATE = 1.0 / 60             # never slower than one search a minute
+    MAX_RATE = 1.0 / 5              # never faster than one every 5 seconds
+    STATE_MAX_AGE_HOURS = 72
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        backend_name: str,
+        state_path: Optional[str] = None,
+    ):
+        self.bucket = bucket
+        self.backend_name = backend_name
+        self.state_path = state_path or _state_path("rate_control.json")
+        self.stats = {"clean": 0, "throttled": 0, "empty": 0}
+        self._lock = threading.Lock()
+
+        self.initial_rate = self._clamp(self._load_rate() or bucket.rate)
+        self.rate = self.initial_rate
+        bucket.set_rate(self.rate)
+
+    def on_success(self, result_count: int) -> None:
+        """Feed back the size of a result page that came back without error."""
+        with self._lock:
+            if result_count:
+                self.stats["clean"] += 1
+                self._apply(self.rate + self.INCREASE_STEP)
+            else:
+                self.stats["empty"] += 1
+                self._apply(self.rate * self.DECREASE_FACTOR)
+                self._save()
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Back off after a 429; pauses the bucket for Retry-After if given."""
+        with self._lock:
+            self.stats["throttled"] += 1
+            self._apply(self.rate * self.DECREASE_FACTOR)
+            self._save()
+        if retry_after:
+            self.bucket.pause(retry_after)
+
+    def close(self) -> None:
+        """Persist the final rate for the next run."""
+        with self._lock:
+            self._save()
+
+    def _apply(self, rate: float) -> None:
+        new_rate = self._clamp(rate)
+        if new_rate != self.rate:
+            logger.debug(
+                "[RateControl] %s: %.2f → %.2f searches/min",
+                self.backend_name, self.rate * 60, new_rate * 60,
+            )
+        self.rate = new_rate
+        self.bucket.set_rate(new_rate)
+
+    def _clamp(self, rate: float) -> float:
+        return min(self.MAX_RATE, max(self.MIN_RATE, rate))
+
+    def _load_rate(self) -> Optional[float]:
+        try:
+            with open(self.state_path, encoding="utf-8") as fh:
+                entry = json.load(fh).get(self.backend_name) or {}
+        except (OSError, ValueError):
+            return None
+        age_hours = (time.time() - entry.get("saved_at", 0)) / 3600
+        if age_hours > self.STATE_MAX_AGE_HOURS:
+            return None
+        rate = entry.get("rate")
+        if rate:
+            logger.info(
+                "[RateControl] Resuming %s at %.2f searches/min",
+                self.backend_name, rate * 60,
+            )
+        return rate
+
+    def _save(self) -> None:
+        try:
+            with open(self.state_path, encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            state = {}
+        state[self.backend_name] = {"rate": self.rate, "saved_at": time.time()}
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(state, fh, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as exc:
+            logger.warning("[RateControl] Could not save state: %s", exc)
 
 
 # ============================================================================
-# Agent 2: LeadManager
+# Search result cache
 # ============================================================================
-# GTM: Manages the prospect pipeline from raw discovery to DB insertion.
 
-class LeadManager:
+class SearchCache:
     """
-    Validates, deduplicates, and inserts leads into Supabase.
+    Persistent SQLite cache of search result pages.
 
-    Dedup is based on linkedin_url (unique constraint in DB).
-    Tags each lead with its vertical from VERTICAL_CONFIGS.
+    Keyed by the normalized query string and the requested result count;
+    stores the url/title/description dicts returned by a search. Entries
+    older than `ttl_hours` are treated as misses, and once more than
+    `max_entries` rows exist the least recently used ones are evicted.
+    Empty result pages are never cached (they are usually failures).
     """
 
-    def __init__(self, supabase_client: Any, dry_run: bool = False):
-        self.db = supabase_client
-        self.dry_run = dry_run
-        self.stats = {
-            "processed": 0,
-            "inserted": 0,
-            "duplicates": 0,
-            "errors": 0,
-        }
+    DEFAULT_TTL_HOURS = 7 * 24
+    DEFAULT_MAX_ENTRIES = 5000
 
-    def process_leads(self, raw_leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        Process a batch of raw leads from SafeSearcher.
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_hours: float = DEFAULT_TTL_HOURS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path or _state_path("search_cache.sqlite3")
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            " cache_key   TEXT PRIMARY KEY,"
+            " query       TEXT NOT NULL,"
+            " num_results INTEGER NOT NULL,"
+            " results     TEXT NOT NULL,"
+            " fetched_at  REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_last_access"
+            " ON search_cache(last_access)"
+        )
+        self._conn.commit()
+
+    def get(
+        self, query: str, num_results: int
+    ) -> Optional[List[Dict[str, str]]]:
+        """Return cached results, or None on a miss or expired entry."""
+        key = search_key(query, num_results)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, fetched_at FROM search_cache"
+                " WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+            if row and now - row[1] <= self.ttl_seconds:
+                self._conn.execute(
+                    "UPDATE search_cache SET last_access = ?"
+                    " WHERE cache_key = ?",
+                    (now, key),
+                )
+                self._conn.commit()
+                self.stats["hits"] += 1
+                return json.loads(row[0])
+            if row:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE cache_key = ?", (key,)
+                )
+                self._conn.commit()
+            return None
 
-        Returns list of successfully inserted lead records.
+    def put(
+        self, query: str, num_results: int, results: List[Dict[str, str]]
+    ) -> None:
         """
-        inserted = []
+        Record a miss that went to the network and store its result page,
+        evicting LRU entries beyond max_entries.
+        """
+        with self._lock:
+            self.stats["misses"] += 1
+        if not results:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache"
+                " (cache_key, query, num_results, results, fetched_at,"
+                "  last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    search_key(query, num_results), query, num_results,
+                    json.dumps(results), now, now,
+                ),
+            )
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM search_cache"
+            ).fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE cache_key IN ("
+                    " SELECT cache_key FROM search_cache"
+                    " ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats["evicted"] += overflow
+            self._conn.commit()
 
-        for lead in raw_leads:
-            self.stats["processed"] += 1
-            linkedin_url = lead.get("linkedin_url", "").strip()
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
-            if not linkedin_url:
-                logger.warning("[LeadManager] Skipping lead with empty LinkedIn URL")
-                self.stats["errors"] += 1
-                continue
 
-            if not self._is_valid_linkedin_url(linkedin_url):
-                logger.warning(
-                    "[LeadManager] Invalid LinkedIn URL: %s", linkedin_url
-                )
-                self.stats["errors"] += 1
-                continue
+# ============================================================================
+# Shared HTTP clients
+# ============================================================================
+# One keep-alive connection pool per upstream (Supabase, Anthropic, the
+# HTTP search endpoint, result pages), owned by GrowthPipeline and handed
+# to the agents, so a run pays for a TCP/TLS handshake per connection
+# rather than per request. Requests are traced to count how many of them
+# had to open a new connection.
 
-            # Check for existing lead in growth_leads (dedup by LinkedIn URL)
-            if self._lead_exists(linkedin_url):
-                logger.debug(
-                    "[LeadManager] Duplicate skipped (growth_leads): %s", linkedin_url
-                )
-                self.stats["duplicates"] += 1
-                continue
+class HttpClients:
+    """
+    Pooled httpx.Client per upstream, created on first use.
 
-            # Check if this person already exists in the CRM contacts table
-            full_name = lead.get("full_name", "")
-            email = lead.get("email")
-            if self._contact_exists(full_name, email):
-                logger.info(
-                    "[LeadManager] Already in CRM contacts, skipping: %s (%s)",
-                    full_name, email or "no email",
+    All clients share the same pool limits, negotiate HTTP/2 when the h2
+    package is installed (keep-alive HTTP/1.1 otherwise) and use the
+    upstream's default timeout from TIMEOUTS unless `timeout` is given.
+    close() closes them all; agents handed a client don't close it.
+    """
+
+    DEFAULT_MAX_CONNECTIONS = 20
+    DEFAULT_MAX_KEEPALIVE = 10
+    KEEPALIVE_EXPIRY = 30.0
+    # Request timeouts in seconds (Supabase: postgrest-py's own default)
+    TIMEOUTS = {
+        "supabase": 120.0,
+        "anthropic": 30.0,
+        "search": 20.0,
+        "pages": 10.0,
+    }
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        timeout: Optional[float] = None,
+    ):
+        max_connections = max(1, max_connections)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max(0, max_keepalive), max_connections),
+            keepalive_expiry=self.KEEPALIVE_EXPIRY,
+        )
+        self.timeout = timeout
+        self.http2 = HTTP2_AVAILABLE
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, upstream: str, **options: Any) -> Any:
+        """
+        The client for `upstream`.
+
+        `options` (e.g. headers, follow_redirects) are passed to
+        httpx.Client when the client is first created.
+        """
+        with self._lock:
+            client = self._clients.get(upstream)
+            if client is None:
+                stats = {"requests": 0, "connections": 0, "tls_handshakes": 0}
+                self.stats[upstream] = stats
+                client = httpx.Client(
+                    http2=self.http2,
+                    limits=self.limits,
+                    timeout=self.timeout or self.TIMEOUTS.get(upstream, 30.0),
+                    event_hooks={"request": [self._tracer(stats)]},
+                    **options,
                 )
-                self.stats["duplicates"] += 1
-                continue
+                self._clients[upstream] = client
+            return client
+
+    def _tracer(self, stats: Dict[str, int]) -> Callable[[Any], None]:
+        """Request hook counting requests and the connections they open."""
+        events = {
+            "connection.connect_tcp.complete": "connections",
+            "connection.start_tls.complete": "tls_handshakes",
+        }
 
-            # Split full_name into first/last
-            first_name, last_name = self._split_name(
-                lead.get("full_name", "")
-            )
-
-            record = {
-                "full_name": lead.get("full_name"),
-                "first_name": first_name,
-                "last_name": last_name,
-                "job_title": lead.get("job_title"),
-                "company": lead.get("company"),
-                "email": lead.get("email"),
-                "linkedin_url": linkedin_url,
-                "vertical": lead.get("vertical", "DIRECT_B2B"),
-                "source_query": lead.get("source_query"),
-                "geo": lead.get("geo"),
-                "status": "new",
-                "extra_data": {"description": lead.get("description", "")},
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            key = events.get(event)
+            if key:
+                with self._lock:
+                    stats[key] += 1
+
+        def on_request(request: Any) -> None:
+            with self._lock:
+                stats["requests"] += 1
+            # httpcore reports connection events through this extension
+            request.extensions["trace"] = trace
+
+        return on_request
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Per-upstream request, connection and reuse counts."""
+        with self._lock:
+            return {
+                upstream: dict(
+                    stats,
+                    reused=max(0, stats["requests"] - stats["connections"]),
+                )
+                for upstream, stats in self.stats.items()
+                if stats["requests"]
             }
 
-            if self.dry_run:
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+
+
+# ============================================================================
+# Search backends
+# ============================================================================
+# SafeSearcher only needs "query in, url/title/description dicts out".
+# Backends that talk to a real engine are rate limited; local ones
+# (fixtures, self-hosted stand-ins) can run at full speed.
+
+class SearchBackend(Protocol):
+    """
+    Interface every search provider implements.
+
+    Backends raise SearchRateLimited when the engine throttles them so
+    SafeSearcher can back off and slow down.
+    """
+
+    name: str
+    rate_limited: bool
+
+    def search(self, query: str, num_results: int) -> List[Dict[str, str]]:
+        """Return up to num_results dicts with 'url', 'title', 'description'."""
+        ...
+
+
+class GoogleSearchBackend:
+    """Google results via googlesearch-python (the original provider)."""
+
+    name = "google"
+    rate_limited = True
+
+    def __init__(self):
+        if google_search is None:
+            logger.error(
+                "googlesearch-python not installed. "
+                "Run: pip install -r requirements_growth.txt"
+            )
+            sys.exit(1)
+
+    def search(self, query: str, num_results: int) -> List[Dict[str, str]]:
+        results = []
+        try:
+            # Use advanced=True to get title + description
+            for item in google_search(
+                query,
+                num_results=num_results,
+                advanced=True,
+                sleep_interval=0,
+            ):
+                results.append({
+                    "url": getattr(item, "url", str(item)),
+                    "title": getattr(item, "title", ""),
+                    "description": getattr(item, "description", ""),
+                })
+        except Exception as exc:
+            # googlesearch surfaces 429s as requests.HTTPError
+            exc_str = str(exc).lower()
+            if "429" in exc_str or "too many" in exc_str:
+                response = getattr(exc, "response", None)
+                headers = getattr(response, "headers", None) or {}
+                raise SearchRateLimited(
+                    str(exc),
+                    retry_after=parse_retry_after(headers.get("Retry-After")),
+                ) from exc
+            raise
+        return results
+
+
+class HttpJsonSearchBackend:
+    """
+    Generic JSON search API, e.g. a SearXNG instance or a local stand-in.
+
+    Sends GET <endpoint>?q=<query>&format=json and reads a top-level
+    `results` list whose items carry `url`, `title` and `content`
+    (SearXNG) or `description`/`snippet`.
+    """
+
+    name = "http"
+
+    def __init__(
+        self,
+        endpoint: str,
+        rate_limited: bool = True,
+        timeout: float = 20.0,
+        client: Any = None,
+    ):
+        if httpx is None:
+            logger.error(
+                "httpx not installed. Run: pip install -r requirements_growth.txt"
+            )
+            sys.exit(1)
+        self.endpoint = endpoint
+        self.rate_limited = rate_limited
+        self.client = client or httpx.Client(timeout=timeout)
+
+    def search(self, query: str, num_results: int) -> List[Dict[str, str]]:
+        response = self.client.get(
+            self.endpoint,
+            params={"q": query, "format": "json"},
+        )
+        if response.status_code == 429:
+            raise SearchRateLimited(
+                f"HTTP 429 from {self.endpoint}",
+                retry_after=parse_retry_after(
+                    response.headers.get("Retry-After")
+                ),
+            )
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"HTTP {response.status_code} from {self.endpoint}: "
+                f"{response.text[:200]}"
+            )
+        items = response.json().get("results") or []
+        return [
+            {
+                "url": item.get("url", ""),
+                "title": item.get("title", ""),
+                "description": (
+                    item.get("content")
+                    or item.get("description")
+                    or item.get("snippet")
+                    or ""
+                ),
+            }
+            for item in items[:num_results]
+        ]
+
+
+def _fixture_path(directory: str, query: str, num_results: int) -> str:
+    """File holding the recorded result page for a query."""
+    digest = hashlib.sha1(
+        search_key(query, num_results).encode("utf-8")
+    ).hexdigest()
+    return os.path.join(directory, f"{digest}.json")
+
+
+class FixtureSearchBackend:
+    """
+    Replays result pages captured with --record, without rate limits.
+
+    Unknown queries return no results (with a warning) so an offline run
+    behaves like an engine that found nothing.
+    """
+
+    name = "fixture"
+    rate_limited = False
+
+    def __init__(self, directory: str):
+        if not os.path.isdir(directory):
+            logger.error("Fixture directory not found: %s", directory)
+            sys.exit(1)
+        self.directory = directory
+
+    def search(self, query: str, num_results: int) -> List[Dict[str, str]]:
+        path = _fixture_path(self.directory, query, num_results)
+        if not os.path.exists(path):
+            logger.warning(
+                "[FixtureBackend] No recording for query: %.80s...", query
+            )
+            return []
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)["results"]
+
+
+class RecordingSearchBackend:
+    """Wraps another backend and writes every result page as a fixture."""
+
+    def __init__(self, inner: SearchBackend, directory: str):
+        self.inner = inner
+        self.directory = directory
+        self.name = f"{inner.name}+record"
+        self.rate_limited = inner.rate_limited
+        os.makedirs(directory, exist_ok=True)
+
+    def search(self, query: str, num_results: int) -> List[Dict[str, str]]:
+        results = self.inner.search(query, num_results)
+        path = _fixture_path(self.directory, query, num_results)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "query": query,
+                    "num_results": num_results,
+                    "backend": self.inner.name,
+                    "recorded_at": datetime.now(timezone.utc).isoformat(),
+                    "results": results,
+                },
+                fh,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp_path, path)
+        return results
+
+
+def build_search_backend(
+    kind: str = "google",
+    url: Optional[str] = None,
+    record_dir: Optional[str] = None,
+    replay_dir: Optional[str] = None,
+    rate_limited: Optional[bool] = None,
+    http: Optional[HttpClients] = None,
+) -> SearchBackend:
+    """
+    Create the search backend selected on the command line.
+
+    The http backend uses the "search" client of `http` when given;
+    googlesearch-python makes its own requests.
+    """
+    backend: SearchBackend
+    if replay_dir:
+        backend = FixtureSearchBackend(replay_dir)
+    elif kind == "http":
+        url = url or os.environ.get("SEARCH_BACKEND_URL")
+        if not url:
+            logger.error(
+                "--search-backend http needs --search-url "
+                "(or SEARCH_BACKEND_URL)."
+            )
+            sys.exit(1)
+        backend = HttpJsonSearchBackend(
+            url, client=http.get("search") if http else None,
+        )
+    else:
+        backend = GoogleSearchBackend()
+
+    if rate_limited is not None:
+        backend.rate_limited = rate_limited
+    if record_dir:
+        backend = RecordingSearchBackend(backend, record_dir)
+    return backend
+
+
+# ============================================================================
+# Query scheduling
+# ============================================================================
+
+class QueryScheduler:
+    """
+    Orders a vertical's search queries by their historical lead yield.
+
+    Yield = new leads (not already in growth_leads) per search, tracked
+    per query in a local SQLite file across runs. The next query is the
+    one with the highest UCB1 score:
+
+        mean_yield / RESULTS_PER_QUERY + sqrt(2 * ln(N) / n)
+
+    where n is that query's search count and N the total over the
+    candidates. Never-searched queries score +inf and go first, in file
+    order, so the first run behaves exactly like the old fixed order.
+    """
+
+    def __init__(self, path: Optional[str] = None, results_per_query: int = 10):
+        self.path = path or _state_path("query_yield.sqlite3")
+        self.results_per_query = results_per_query
+        self.run_queries: Dict[str, str] = {}   # query → vertical, this run
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_yield ("
+            " query_key     TEXT PRIMARY KEY,"
+            " vertical      TEXT NOT NULL,"
+            " query         TEXT NOT NULL,"
+            " searches      INTEGER NOT NULL DEFAULT 0,"
+            " results       INTEGER NOT NULL DEFAULT 0,"
+            " new_leads     INTEGER NOT NULL DEFAULT 0,"
+            " last_searched REAL)"
+        )
+        self._conn.commit()
+
+    def pop_next(self, pending: List[str]) -> str:
+        """Remove and return the pending query with the best UCB1 score."""
+        stats = self._load(pending)
+        total = sum(row[0] for row in stats.values()) or 1
+
+        def score(query: str) -> float:
+            searches, new_leads = stats.get(normalize_query(query), (0, 0))
+            if not searches:
+                return math.inf
+            mean = new_leads / searches / self.results_per_query
+            return mean + math.sqrt(2 * math.log(total) / searches)
+
+        best = max(range(len(pending)), key=lambda i: (score(pending[i]), -i))
+        return pending.pop(best)
+
+    def record_search(self, query: str, vertical: str, results: int) -> None:
+        """Count one search of `query` that returned `results` profiles."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO query_yield (query_key, vertical, query,"
+                " searches, results, last_searched) VALUES (?, ?, ?, 1, ?, ?)"
+                " ON CONFLICT(query_key) DO UPDATE SET"
+                " searches = searches + 1, results = results + excluded.results,"
+                " vertical = excluded.vertical, query = excluded.query,"
+                " last_searched = excluded.last_searched",
+                (normalize_query(query), vertical, query, results, time.time()),
+            )
+            self._conn.commit()
+            self.run_queries[query] = vertical
+
+    def record_new_leads(self, query: str, new_leads: int) -> None:
+        """Credit `query` with leads that were not duplicates."""
+        if not new_leads:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE query_yield SET new_leads = new_leads + ?"
+                " WHERE query_key = ?",
+                (new_leads, normalize_query(query)),
+            )
+            self._conn.commit()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """All-time stats for the queries searched this run, best first."""
+        rows = []
+        stats = self._load(list(self.run_queries))
+        for query, vertical in self.run_queries.items():
+            searches, new_leads = stats.get(normalize_query(query), (0, 0))
+            rows.append({
+                "vertical": vertical,
+                "query": query,
+                "searches": searches,
+                "new_leads": new_leads,
+                "yield": new_leads / searches if searches else 0.0,
+            })
+        rows.sort(key=lambda r: r["yield"], reverse=True)
+        return rows
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _load(self, queries: List[str]) -> Dict[str, Tuple[int, int]]:
+        keys = [normalize_query(q) for q in queries]
+        if not keys:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query_key, searches, new_leads FROM query_yield"
+                " WHERE query_key IN (%s)" % ",".join("?" * len(keys)),
+                keys,
+            ).fetchall()
+        return {key: (searches, new) for key, searches, new in rows}
+
+
+# ============================================================================
+# Query compilation
+# ============================================================================
+# Several verticals send near-identical dorks ("Medical Director" OR ... with
+# overlapping geos). The compiler splits each query into its AND-ed OR-groups,
+# tags every group as role, topic or geo (place names come from GAZETTEER),
+# and greedily merges queries whose groups overlap until no merge fits the
+# engine's query-length limit.
+
+QUERY_TOKEN_RE = re.compile(r'"[^"]*"|\S+')
+
+ROLE_WORDS = (
+    "director", "head", "chief", "manager", "lead", "pathologist",
+    "patólogo", "jefe", "coordinador", "speaker", "organizer", "chair",
+    "panelist", "moderator", "committee", "editor", "founder", "author",
+    "professor", "researcher", "journalist", "reporter", "analyst",
+    "consultant", "advisor", "liaison", "host", "creator", "blogger",
+    "thought leader", "business development", "partnerships",
+    "board member", "venture", "clinical operations", "clinical research",
+)
+
+
+def parse_query_groups(query: str) -> Tuple[List[str], List[List[str]]]:
+    """
+    Split a dork into (operators, OR-groups).
+
+    'site:x "A" OR "B" pathology Argentina OR Brazil' becomes
+    (['site:x'], [['"A"', '"B"'], ['pathology'], ['Argentina', 'Brazil']]).
+    """
+    operators: List[str] = []
+    groups: List[List[str]] = []
+    join_next = False
+    for token in QUERY_TOKEN_RE.findall(query):
+        if token == "OR":
+            join_next = bool(groups)
+            continue
+        if ":" in token and not token.startswith('"'):
+            operators.append(token)
+            join_next = False
+            continue
+        if join_next:
+            groups[-1].append(token)
+        else:
+            groups.append([token])
+        join_next = False
+    return operators, groups
+
+
+def _term_text(term: str) -> str:
+    return term.strip('"').lower()
+
+
+def classify_group(group: List[str]) -> str:
+    """Tag an OR-group as 'role', 'geo' or 'topic'."""
+    texts = [_term_text(t) for t in group]
+    if any(word in text for text in texts for word in ROLE_WORDS):
+        return "role"
+    if all(GAZETTEER.is_place(text) for text in texts):
+        return "geo"
+    return "topic"
+
+
+class CompiledQuery:
+    """A query to execute plus the vertical queries it stands in for."""
+
+    def __init__(
+        self, operators: List[str], groups: List[List[str]],
+        sources: List[Tuple[str, str]],
+    ):
+        self.operators = operators
+        self.groups = groups
+        self.sources = sources      # [(vertical, original query), ...]
+        self._source_terms = [
+            (vertical, source, [
+                [_term_text(t) for t in g]
+                for g in parse_query_groups(source)[1]
+            ])
+            for vertical, source in sources
+        ]
+
+    @property
+    def query(self) -> str:
+        return " ".join(
+            self.operators + [" OR ".join(group) for group in self.groups]
+        )
+
+    @property
+    def verticals(self) -> List[str]:
+        return list(dict.fromkeys(v for v, _ in self.sources))
+
+    @property
+    def signature(self) -> List[str]:
+        return [classify_group(group) for group in self.groups]
+
+    def word_count(self) -> int:
+        """Words as the engine counts them (OR operators included)."""
+        words = len(self.operators)
+        for group in self.groups:
+            words += len(group) - 1
+            words += sum(len(_term_text(t).split()) or 1 for t in group)
+        return words
+
+    def attribute(self, text: str) -> Tuple[str, str]:
+        """
+        Pick the (vertical, original query) a result most likely answers:
+        the source whose OR-groups have the most terms present in `text`.
+        Ties go to the first source.
+        """
+        if len(self._source_terms) == 1:
+            vertical, source, _ = self._source_terms[0]
+            return vertical, source
+        haystack = text.lower()
+        best = max(
+            self._source_terms,
+            key=lambda entry: sum(
+                1 for group in entry[2]
+                if any(term in haystack for term in group)
+            ),
+        )
+        return best[0], best[1]
+
+
+class QueryCompiler:
+    """
+    Reduce each vertical's search_queries to a smaller cover set.
+
+    Two queries can merge when they belong to the same vertical, have the
+    same operators and the same role/topic/geo group layout, and every aligned pair of OR-groups
+    shares a term, except at most one pair (two when the role groups
+    overlap). The merged query ORs each pair together, so it matches
+    every (role, topic, geo) combination either original did. Identical
+    queries collapse into one. Merges that would exceed MAX_QUERY_WORDS
+    (Google ignores words past 32) are skipped. Each compiled query
+    remembers its source queries so results can be attributed back.
+
+    A merged query still fetches one page of results, so the cover set
+    trades result slots for searches: it can match every profile the
+    originals did, but returns at most RESULTS_PER_QUERY of them.
+    """
+
+    MAX_QUERY_WORDS = 32
+
+    def __init__(self, max_query_words: int = MAX_QUERY_WORDS):
+        self.max_query_words = max_query_words
+
+    def compile(self, verticals: List[str]) -> List[CompiledQuery]:
+        compiled: List[CompiledQuery] = []
+        for vertical in verticals:
+            for query in VERTICAL_CONFIGS[vertical]["search_queries"]:
+                operators, groups = parse_query_groups(query)
+                compiled.append(
+                    CompiledQuery(operators, groups, [(vertical, query)])
+                )
+
+        original = len(compiled)
+        while True:
+            best: Optional[Tuple[int, int, int, CompiledQuery]] = None
+            for i in range(len(compiled)):
+                for j in range(i + 1, len(compiled)):
+                    merged = self._merge(compiled[i], compiled[j])
+                    if merged is None:
+                        continue
+                    score = self._overlap(compiled[i], compiled[j])
+                    if best is None or score > best[0]:
+                        best = (score, i, j, merged)
+            if best is None:
+                break
+            _, i, j, merged = best
+            compiled[i] = merged
+            del compiled[j]
+
+        logger.info(
+            "[QueryCompiler] %d queries from %s compiled into %d",
+            original, ", ".join(verticals), len(compiled),
+        )
+        return compiled
+
+    def _aligned(
+        self, a: CompiledQuery, b: CompiledQuery
+    ) -> Optional[List[Tuple[List[str], List[str]]]]:
+        """Pair up a's and b's groups by role/topic/geo, in order."""
+        if a.verticals != b.verticals:
+            # A vertical's anti_patterns can rule out another's audience
+            # (DIRECT_B2B never pitches pharma), so never mix verticals
+            return None
+        if a.operators != b.operators or a.signature != b.signature:
+            return None
+        return list(zip(a.groups, b.groups))
+
+    @staticmethod
+    def _overlap(a: CompiledQuery, b: CompiledQuery) -> int:
+        """Shared terms across aligned groups (merge priority)."""
+        return sum(
+            len({_term_text(t) for t in ga} & {_term_text(t) for t in gb})
+            for ga, gb in zip(a.groups, b.groups)
+        )
+
+    def _merge(
+        self, a: CompiledQuery, b: CompiledQuery
+    ) -> Optional[CompiledQuery]:
+        pairs = self._aligned(a, b)
+        if pairs is None:
+            return None
+        disjoint = 0
+        role_shared = False
+        groups = []
+        for ga, gb in pairs:
+            seen = {_term_text(t) for t in ga}
+            if not seen & {_term_text(t) for t in gb}:
+                disjoint += 1
+            elif classify_group(ga) == "role":
+                role_shared = True
+            groups.append(ga + [t for t in gb if _term_text(t) not in seen])
+        if disjoint > (2 if role_shared else 1):
+            return None
+        merged = CompiledQuery(a.operators, groups, a.sources + b.sources)
+        if merged.word_count() > self.max_query_words:
+            return None
+        return merged
+
+
+# ============================================================================
+# Search budget allocation
+# ============================================================================
+# --max-searches is split across the selected verticals by weight, with a
+# guaranteed minimum each, instead of the first verticals in dict order
+# eating the whole budget. Enrichment gets a reserved share up front and
+# whatever the search phase leaves over.
+
+def parse_budget_weights(spec: Optional[str]) -> Dict[str, float]:
+    """Parse 'PHARMA=2,EVENTS=0.5' into {vertical: weight}."""
+    weights: Dict[str, float] = {}
+    if not spec:
+        return weights
+    for part in spec.split(","):
+        name, sep, value = part.partition("=")
+        name = name.strip().upper()
+        if not sep or name not in VERTICAL_CONFIGS:
+            raise ValueError(f"Invalid budget weight: {part.strip()!r}")
+        weight = float(value)
+        if weight < 0:
+            raise ValueError(f"Budget weight must be >= 0: {part.strip()!r}")
+        weights[name] = weight
+    return weights
+
+
+class BudgetAllocator:
+    """
+    Fair-share split of the search budget across verticals.
+
+    Each vertical is granted its weighted share of what is left when its
+    turn comes, never less than `min_share` and never more than it has
+    queries for. When the budget cannot cover every minimum, the
+    minimums are dealt out one search at a time across the verticals,
+    so no vertical is left with nothing while another has two. Grants
+    are made one vertical at a time, so budget that an earlier vertical
+    leaves unused (cache hits, fewer queries) rolls over to the ones
+    after it, and finally to enrichment.
+    """
+
+    DEFAULT_MIN_SHARE = 2
+    DEFAULT_ENRICH_SHARE = 0.25
+
+    def __init__(
+        self,
+        total: int,
+        demand: Dict[str, int],
+        weights: Optional[Dict[str, float]] = None,
+        min_share: int = DEFAULT_MIN_SHARE,
+        enrich_share: float = 0.0,
+    ):
+        self.total = total
+        self.demand = dict(demand)
+        self.weights = {v: (weights or {}).get(v, 1.0) for v in demand}
+        self.min_share = min_share
+        self.enrich_reserve = int(round(total * min(max(enrich_share, 0.0), 1.0)))
+        self.granted: Dict[str, int] = {}
+        self.spent: Dict[str, int] = {}
+
+    @property
+    def remaining(self) -> int:
+        return self.total - sum(self.spent.values())
+
+    def _minimum(self, vertical: str) -> int:
+        if not self.weights[vertical]:
+            return 0
+        return min(self.min_share, self.demand[vertical])
+
+    def _minimums(self, pool: int, verticals: List[str]) -> Dict[str, int]:
+        """Guaranteed searches per vertical, scaled down to fit `pool`."""
+        wanted = {v: self._minimum(v) for v in verticals}
+        if sum(wanted.values()) <= pool:
+            return wanted
+        minimums = dict.fromkeys(verticals, 0)
+        pool = max(pool, 0)
+        while pool > 0:
+            for v in verticals:
+                if pool and minimums[v] < wanted[v]:
+                    minimums[v] += 1
+                    pool -= 1
+        return minimums
+
+    def _fair_split(self, pool: float, verticals: List[str]) -> Dict[str, float]:
+        """Weighted split of `pool`, capping each vertical at its demand."""
+        alloc = {v: 0.0 for v in verticals}
+        active = [v for v in verticals if self.weights[v] > 0]
+        while active and pool > 1e-9:
+            weight_sum = sum(self.weights[v] for v in active)
+            capped = [
+                v for v in active
+                if self.demand[v] - alloc[v] <= pool * self.weights[v] / weight_sum
+            ]
+            if not capped:
+                for v in active:
+                    alloc[v] += pool * self.weights[v] / weight_sum
+                break
+            for v in capped:
+                pool -= self.demand[v] - alloc[v]
+                alloc[v] = float(self.demand[v])
+                active.remove(v)
+        return alloc
+
+    def grant(self, vertical: str) -> int:
+        """Searches `vertical` may use now; call spend() once it is done."""
+        if vertical not in self.demand:
+            return 0
+        pool = self.remaining - self.enrich_reserve
+        waiting = [
+            v for v in self.demand if v not in self.spent and v != vertical
+        ]
+        share = self._fair_split(pool, [vertical] + waiting)[vertical]
+        minimums = self._minimums(pool, [vertical] + waiting)
+        held_back = sum(minimums[v] for v in waiting)
+        granted = max(int(round(share)), minimums[vertical])
+        granted = max(0, min(granted, self.demand[vertical], pool - held_back))
+        self.granted[vertical] = granted
+        return granted
+
+    def spend(self, vertical: str, used: int) -> None:
+        self.spent[vertical] = self.spent.get(vertical, 0) + used
+
+    def grant_enrichment(self) -> int:
+        """Enrichment gets its reserve plus everything search left over."""
+        granted = max(self.remaining, 0)
+        self.granted["enrichment"] = granted
+        return granted
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {"granted": granted, "used": self.spent.get(name, 0)}
+            for name, granted in self.granted.items()
+        }
+
+
+# ============================================================================
+# Batched email enrichment
+# ============================================================================
+# Several leads are packed into one query — `"A" OR "B" "Company" email` —
+# and each email found is attributed back to a lead by its local part
+# and by which name the snippet mentions.
+
+EMAIL_BATCH_MAX_NAME_WORDS = 3
+EMAIL_DOMAIN_STOPWORDS = {
+    "hospital", "clinica", "clinic", "instituto", "institute", "centro",
+    "center", "centre", "university", "universidad", "universidade",
+    "laboratorio", "laboratory", "group", "grupo", "health", "salud",
+}
+# Shared mailboxes: never a lead's own address, however the snippet reads
+GENERIC_EMAIL_LOCAL_PARTS = frozenset({
+    "info", "informes", "contact", "contacto", "contato", "admin",
+    "administracion", "secretaria", "secretary", "office", "oficina",
+    "hello", "hola", "noreply", "donotreply", "support", "soporte",
+    "suporte", "ventas", "sales", "vendas", "marketing", "rrhh", "hr",
+    "recepcion", "reception", "webmaster", "prensa", "press",
+    "comunicacion", "jobs", "careers", "empleos", "mail", "email",
+    "enquiries", "inquiries", "general", "consultas", "turnos",
+    "atendimento", "faleconosco",
+})
+GENERIC_EMAIL_SPLIT_RE = re.compile(r"[._+\-0-9]+")
+
+
+def _name_tokens(name: str) -> List[str]:
+    return [t for t in re.split(r"[^a-z]+", fold_text(name)) if len(t) >= 2]
+
+
+def plan_email_batches(
+    leads: List[Dict[str, Any]], batch_size: int
+) -> List[List[Dict[str, Any]]]:
+    """
+    Group leads that can share one email query.
+
+    Leads at the same company are batched together first; the remaining
+    leads with short names (≤ EMAIL_BATCH_MAX_NAME_WORDS words) are
+    batched by name alone. Everything else stays a batch of one.
+    """
+    if batch_size <= 1:
+        return [[lead] for lead in leads]
+
+    by_company: Dict[str, List[Dict[str, Any]]] = {}
+    for lead in leads:
+        company = fold_text(lead.get("company") or "").strip()
+        if company in ("", "[empresa]"):
+            company = ""
+        by_company.setdefault(company, []).append(lead)
+
+    batches: List[List[Dict[str, Any]]] = []
+    loose: List[Dict[str, Any]] = []
+    for company, group in by_company.items():
+        if not company or len(group) == 1:
+            loose.extend(group)
+            continue
+        for i in range(0, len(group), batch_size):
+            batches.append(group[i:i + batch_size])
+
+    short = []
+    for lead in loose:
+        if len(lead["full_name"].split()) <= EMAIL_BATCH_MAX_NAME_WORDS:
+            short.append(lead)
+        else:
+            batches.append([lead])
+    for i in range(0, len(short), batch_size):
+        batches.append(short[i:i + batch_size])
+    return batches
+
+
+def build_batch_email_queries(batch: List[Dict[str, Any]]) -> List[str]:
+    """Build the email queries for a batch of leads."""
+    if len(batch) == 1:
+        return build_email_search_queries(
+            batch[0]["full_name"], batch[0].get("company")
+        )
+    names = " OR ".join(
+        '"%s"' % lead["full_name"].strip().strip('"') for lead in batch
+    )
+    companies = {(lead.get("company") or "").strip().strip('"') for lead in batch}
+    queries = []
+    if len(companies) == 1 and companies != {""}:
+        queries.append(f'{names} "{companies.pop()}" email OR @')
+    queries.append(f"{names} email OR correo OR mailto")
+    return queries
+
+
+def score_email_for_lead(email: str, text: str, lead: Dict[str, Any]) -> int:
+    """
+    Score how likely `email` belongs to `lead` given the result text.
+
+    The local part matching the surname/first name is the strongest
+    signal; a mention of the full name or surname in the snippet and a
+    domain matching the lead's company add to it. Shared mailboxes
+    (info@, contacto@, secretaria.patologia@ ...) score 0.
+    """
+    tokens = _name_tokens(lead.get("full_name") or "")
+    if not tokens:
+        return 0
+    local, _, domain = email.partition("@")
+    if (
+        GENERIC_EMAIL_SPLIT_RE.split(local.lower())[0] in GENERIC_EMAIL_LOCAL_PARTS
+        or re.sub(r"[^a-z]", "", local.lower()) in GENERIC_EMAIL_LOCAL_PARTS
+    ):
+        return 0
+    local = re.sub(r"[^a-z]", "", local)
+    first, last = tokens[0], tokens[-1]
+    folded = fold_text(text)
+
+    score = 0
+    if len(last) >= 3 and last in local:
+        score += 3
+    if len(first) >= 3 and first in local:
+        score += 2
+    elif len(tokens) > 1 and local.startswith(first[0]) and last in local:
+        score += 1
+    if " ".join(tokens) in re.sub(r"[^a-z]+", " ", folded):
+        score += 2
+    elif len(last) >= 3 and last in folded:
+        score += 1
+    company_words = [
+        w for w in re.split(r"[^a-z]+", fold_text(lead.get("company") or ""))
+        if len(w) >= 4 and w not in EMAIL_DOMAIN_STOPWORDS
+    ]
+    if any(w in domain for w in company_words):
+        score += 1
+    return score
+
+
+def attribute_emails(
+    results: List[Dict[str, str]], batch: List[Dict[str, Any]]
+) -> Dict[str, str]:
+    """
+    Assign emails found in `results` to leads of `batch`.
+
+    Returns {lead id: email}. An email is assigned only when one lead
+    clearly outscores the others (score ≥ 2, no tie), and each email
+    and each lead is used at most once.
+    """
+    found: Dict[str, str] = {}
+    used = set()
+    for result in results:
+        text = f"{result.get('title', '')} {result.get('description', '')}"
+        for email in extract_emails_from_text(text):
+            if email in used:
+                continue
+            lead = pick_lead_for_email(
+                email, text, [lead for lead in batch if lead["id"] not in found]
+            )
+            if lead:
+                found[lead["id"]] = email
+                used.add(email)
+    return found
+
+
+def pick_lead_for_email(
+    email: str, text: str, leads: List[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """The lead that clearly owns `email` (score ≥ 2, no tie), if any."""
+    ranked = sorted(
+        ((score_email_for_lead(email, text, lead), lead) for lead in leads),
+        key=lambda pair: pair[0],
+        reverse=True,
+    )
+    if not ranked or ranked[0][0] < 2:
+        return None
+    if len(ranked) > 1 and ranked[1][0] == ranked[0][0]:
+        return None
+    return ranked[0][1]
+
+
+# Failed attempts are recorded in growth_leads.extra_data["email_enrichment"]
+# and back off exponentially, so leads that keep failing stop crowding
+# out ones never tried.
+
+ENRICH_RETRY_BASE_HOURS = 24.0
+ENRICH_RETRY_MAX_HOURS = 24.0 * 60
+ENRICH_MAX_QUERIES_KEPT = 10
+
+
+def enrichment_record(lead: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the lead's email enrichment record ({} if never attempted)."""
+    extra = lead.get("extra_data") or {}
+    if not isinstance(extra, dict):
+        return {}
+    return extra.get("email_enrichment") or {}
+
+
+def next_enrichment_attempt(attempts: int, last_attempt: datetime) -> datetime:
+    """Retry-after for a lead that failed `attempts` times: 1d, 2d, 4d… ≤60d."""
+    hours = min(
+        ENRICH_RETRY_BASE_HOURS * 2 ** max(attempts - 1, 0),
+        ENRICH_RETRY_MAX_HOURS,
+    )
+    return last_attempt + timedelta(hours=hours)
+
+
+def stream_leads_for_enrichment(
+    leads: Iterable[Dict[str, Any]],
+    counts: Optional[Dict[str, int]] = None,
+    now: Optional[datetime] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Drop leads still cooling down and order the rest for enrichment.
+
+    Never-attempted leads are yielded as they arrive (so enrichment can
+    start on the first page of a large backlog); retries are held back
+    and yielded once `leads` is exhausted, by fewest attempts and oldest
+    last attempt. Skipped leads are counted in counts["skipped"].
+    """
+    now = now or datetime.now(timezone.utc)
+    retries = []
+    for lead in leads:
+        record = enrichment_record(lead)
+        if not record.get("attempts"):
+            yield lead
+            continue
+        try:
+            retry_at = datetime.fromisoformat(record["next_attempt_at"])
+        except (KeyError, TypeError, ValueError):
+            retry_at = now
+        if retry_at > now:
+            if counts is not None:
+                counts["skipped"] = counts.get("skipped", 0) + 1
+            continue
+        retries.append(lead)
+    retries.sort(key=lambda lead: (
+        enrichment_record(lead).get("attempts", 0),
+        enrichment_record(lead).get("last_attempt_at", ""),
+    ))
+    yield from retries
+
+
+def order_leads_for_enrichment(
+    leads: Iterable[Dict[str, Any]], now: Optional[datetime] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    List form of stream_leads_for_enrichment: returns the ordered leads
+    and how many were skipped.
+    """
+    counts = {"skipped": 0}
+    ordered = list(stream_leads_for_enrichment(leads, counts, now))
+    return ordered, counts["skipped"]
+
+
+# ============================================================================
+# Result page fetching
+# ============================================================================
+# A ~160-character snippet rarely carries an email, but the pages behind
+# enrichment results often do (institutional staff lists, conference
+# programmes, ORCID profiles). With --fetch-pages the top non-LinkedIn
+# result pages of each enrichment query are downloaded and scanned as a
+# stream: at most max_bytes per page, reading stops as soon as every
+# lead of the batch has an email, requests to one domain are spaced by
+# domain_delay seconds, and a SQLite cache remembers what each URL
+# yielded so pages are not downloaded again on later runs.
+
+PAGE_SKIP_DOMAINS = frozenset({
+    "linkedin.com", "google.com", "facebook.com", "instagram.com",
+    "twitter.com", "x.com", "youtube.com",
+})
+PAGE_SKIP_EXTENSIONS = (
+    ".pdf", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx", ".zip",
+    ".png", ".jpg", ".jpeg", ".gif",
+)
+PAGE_CONTENT_TYPES = ("text/", "application/xhtml")
+# RFC 5321 caps an address at 254 characters
+EMAIL_MAX_CHARS = 254
+
+
+def page_domain(url: str) -> str:
+    """Host of a URL without a leading 'www.' (the politeness key)."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def page_urls(results: List[Dict[str, str]], limit: int) -> List[str]:
+    """Fetchable result URLs: http(s), not social sites or documents."""
+    urls: List[str] = []
+    for result in results:
+        url = result.get("url", "")
+        if not url.startswith(("http://", "https://")) or url in urls:
+            continue
+        domain = page_domain(url)
+        if any(
+            domain == skip or domain.endswith("." + skip)
+            for skip in PAGE_SKIP_DOMAINS
+        ):
+            continue
+        if urlsplit(url).path.lower().endswith(PAGE_SKIP_EXTENSIONS):
+            continue
+        urls.append(url)
+        if len(urls) >= limit:
+            break
+    return urls
+
+
+class StreamingEmailExtractor:
+    """
+    Finds emails in a page fed chunk by chunk, in bounded memory.
+
+    Bytes are decoded incrementally and only a short tail of text is kept
+    between chunks, long enough that an email split across two chunks is
+    still matched whole. Each email is reported once, with up to
+    CONTEXT_CHARS of text on either side for name matching.
+    """
+
+    CONTEXT_CHARS = 160
+
+    def __init__(self, encoding: str = "utf-8"):
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")
+        self._decoder = decoder(errors="replace")
+        self._tail = ""
+        # Absolute offsets: start of the tail, end of the scanned region
+        self._offset = 0
+        self._scanned_to = 0
+        self._seen: set = set()
+
+    def feed(self, data: bytes) -> List[Tuple[str, str]]:
+        """Scan another chunk; returns new (email, context) pairs."""
+        return self._scan(self._decoder.decode(data), final=False)
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Scan what is left once the page has been read to the end."""
+        return self._scan(self._decoder.decode(b"", final=True), final=True)
+
+    def _scan(self, text: str, final: bool) -> List[Tuple[str, str]]:
+        buf = self._tail + text
+        # Matches ending past the cutoff may still grow (or lack right
+        # context), so they wait for the next chunk
+        cutoff = len(buf) if final else len(buf) - self.CONTEXT_CHARS
+        found = []
+        if "@" in buf:
+            for match in EMAIL_RE.finditer(buf):
+                end = self._offset + match.end()
+                if end <= self._scanned_to:
+                    continue
+                if match.end() > cutoff:
+                    break
+                for email in extract_emails_from_text(match.group(0)):
+                    if email in self._seen:
+                        continue
+                    self._seen.add(email)
+                    found.append((email, buf[
+                        max(0, match.start() - self.CONTEXT_CHARS):
+                        match.end() + self.CONTEXT_CHARS
+                    ]))
+        if cutoff > 0:
+            keep = max(0, cutoff - EMAIL_MAX_CHARS - self.CONTEXT_CHARS)
+            self._scanned_to = max(self._scanned_to, self._offset + cutoff)
+            self._offset += keep
+            self._tail = buf[keep:]
+        else:
+            self._tail = buf
+        return found
+
+
+class PageNotRead(Exception):
+    """
+    Raised when a fetched page is not scanned (error status, throttled,
+    not HTML/text). `permanent` marks answers that are safe to cache as
+    an empty page: 404/410 and unreadable content types.
+    """
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class PageCache:
+    """
+    Persistent SQLite cache of what fetched pages yielded.
+
+    Stores the (email, context) pairs found on each URL rather than the
+    page itself, plus whether the page was read to the end (or to the
+    byte cap): a page whose scan stopped early because its leads were
+    matched is fetched again when another lead needs it. Entries expire
+    after `ttl_hours`.
+    """
+
+    DEFAULT_TTL_HOURS = 30 * 24
+
+    def __init__(
+        self, path: Optional[str] = None, ttl_hours: float = DEFAULT_TTL_HOURS
+    ):
+        self.path = path or _state_path("page_cache.sqlite3")
+        self.ttl_seconds = ttl_hours * 3600
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS page_cache ("
+            " url        TEXT PRIMARY KEY,"
+            " domain     TEXT NOT NULL,"
+            " emails     TEXT NOT NULL,"
+            " complete   INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[List[Tuple[str, str]]]:
+        """Emails of a fully read, unexpired page; None otherwise."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT emails, fetched_at FROM page_cache"
+                " WHERE url = ? AND complete = 1",
+                (url,),
+            ).fetchone()
+            if row and time.time() - row[1] <= self.ttl_seconds:
+                self.stats["hits"] += 1
+                return [tuple(pair) for pair in json.loads(row[0])]
+            self.stats["misses"] += 1
+            return None
+
+    def put(
+        self, url: str, emails: List[Tuple[str, str]], complete: bool
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_cache"
+                " (url, domain, emails, complete, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, page_domain(url), json.dumps(emails), int(complete),
+                 time.time()),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PageFetcher:
+    """
+    Fetches result pages concurrently and attributes the emails on them.
+
+    Politeness: one TokenBucket per domain, so requests to the same site
+    are at least `domain_delay` seconds apart (a 429 pauses that domain
+    for its Retry-After); different domains are fetched in parallel by
+    up to `concurrency` threads. Each page is streamed in CHUNK_BYTES
+    chunks and abandoned after `max_bytes`, when it is not HTML/text, or
+    once no lead is left without an email.
+    """
+
+    DEFAULT_CONCURRENCY = 4
+    DEFAULT_MAX_BYTES = 512 * 1024
+    DEFAULT_DOMAIN_DELAY = 5.0
+    MAX_PAGES_PER_QUERY = 5
+    CHUNK_BYTES = 16 * 1024
+    TIMEOUT_SECONDS = 10.0
+    USER_AGENT = "Mozilla/5.0 (compatible; DigpathoGrowth/1.0)"
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        domain_delay: float = DEFAULT_DOMAIN_DELAY,
+        cache: Optional[PageCache] = None,
+        client: Any = None,
+    ):
+        self.max_bytes = max_bytes
+        self.domain_delay = domain_delay
+        self.cache = cache
+        # A client passed in belongs to the caller, who closes it
+        self._owns_client = client is None
+        self.client = client or httpx.Client(
+            timeout=self.TIMEOUT_SECONDS,
+            follow_redirects=True,
+            headers={"User-Agent": self.USER_AGENT},
+        )
+        self.stats = {"pages": 0, "bytes": 0, "truncated": 0, "errors": 0,
+                      "emails_found": 0}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, concurrency), thread_name_prefix="page-fetcher"
+        )
+
+    def find_emails(
+        self,
+        urls: List[str],
+        leads: List[Dict[str, Any]],
+        taken: Iterable[str] = (),
+    ) -> Dict[str, str]:
+        """
+        Fetch `urls` and return {lead id: email} for `leads`.
+
+        Emails are assigned with pick_lead_for_email against the text
+        around them; emails in `taken` (already someone's) are ignored.
+        """
+        pending = {lead["id"]: lead for lead in leads}
+        found: Dict[str, str] = {}
+        used = set(taken)
+        lock = threading.Lock()
+
+        def scan(url: str) -> None:
+            for email, context in self.page_emails(url, lambda: not pending):
+                with lock:
+                    if email in used:
+                        continue
+                    lead = pick_lead_for_email(
+                        email, context, list(pending.values())
+                    )
+                    if lead:
+                        found[lead["id"]] = email
+                        used.add(email)
+                        del pending[lead["id"]]
+                        logger.info(
+                            "[PageFetcher] Found email for %s: %s (%s)",
+                            lead.get("full_name"), email, url,
+                        )
+                    if not pending:
+                        return
+
+        futures = [self._executor.submit(scan, url) for url in urls]
+        for future in futures:
+            if not pending:
+                future.cancel()
+                continue
+            future.result()
+        return found
+
+    def page_emails(
+        self, url: str, done: Callable[[], bool] = lambda: False
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        (email, context) pairs on a page, from the cache or the network.
+
+        Stops reading when `done()` turns true; what was read so far is
+        cached as an incomplete page. Pages that could not be read are
+        not cached, except as empty pages when PageNotRead says the
+        answer is permanent.
+        """
+        if done():
+            return
+        if self.cache:
+            cached = self.cache.get(url)
+            if cached is not None:
+                yield from cached
+                return
+        bucket = self._bucket(page_domain(url))
+        bucket.acquire()
+        # Other pages may have matched every lead while this one waited
+        if done():
+            return
+        emails: List[Tuple[str, str]] = []
+        complete = failed = False
+        stream = self._stream_page(url, bucket)
+        try:
+            for pair in stream:
+                emails.append(pair)
+                yield pair
+                if done():
+                    break
+            else:
+                complete = True
+        except PageNotRead as exc:
+            complete = exc.permanent
+            failed = not exc.permanent
+            with self._lock:
+                self.stats["errors"] += 1
+            logger.debug("[PageFetcher] %s: %s", url, exc)
+        except (httpx.HTTPError, httpx.InvalidURL) as exc:
+            failed = True
+            with self._lock:
+                self.stats["errors"] += 1
+            logger.debug("[PageFetcher] %s: %s", url, exc)
+        finally:
+            # Closes the response when reading stops early
+            stream.close()
+            with self._lock:
+                self.stats["emails_found"] += len(emails)
+            if self.cache and not failed:
+                self.cache.put(url, emails, complete)
+
+    def _stream_page(
+        self, url: str, bucket: TokenBucket
+    ) -> Iterator[Tuple[str, str]]:
+        with self.client.stream("GET", url) as response:
+            with self._lock:
+                self.stats["pages"] += 1
+            status = response.status_code
+            if status == 429:
+                bucket.pause(
+                    parse_retry_after(response.headers.get("Retry-After"))
+                    or self.domain_delay * 10
+                )
+                raise PageNotRead("HTTP 429")
+            if status >= 400:
+                raise PageNotRead(f"HTTP {status}", permanent=status in (404, 410))
+            content_type = response.headers.get("content-type", "")
+            if content_type and not content_type.startswith(PAGE_CONTENT_TYPES):
+                raise PageNotRead(content_type, permanent=True)
+            extractor = StreamingEmailExtractor(
+                response.charset_encoding or "utf-8"
+            )
+            received = 0
+            try:
+                for chunk in response.iter_bytes(self.CHUNK_BYTES):
+                    chunk = chunk[:self.max_bytes - received]
+                    received += len(chunk)
+                    yield from extractor.feed(chunk)
+                    if received >= self.max_bytes:
+                        with self._lock:
+                            self.stats["truncated"] += 1
+                        break
+                else:
+                    yield from extractor.close()
+            finally:
+                with self._lock:
+                    self.stats["bytes"] += received
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                bucket = TokenBucket(rate=1.0 / max(self.domain_delay, 0.001))
+                self._buckets[domain] = bucket
+            return bucket
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._owns_client:
+            self.client.close()
+        if self.cache:
+            self.cache.close()
+
+
+# ============================================================================
+# Work queue (multi-worker runs)
+# ============================================================================
+# With --work-queue, search queries and enrichment leads become rows in a
+# shared queue (migrations/008_growth_work_queue.sql on Supabase, or a
+# local SQLite file). Every worker enqueues the same tasks idempotently,
+# then claims rows under a time-limited lease that a heartbeat thread
+# keeps renewing. Leases of crashed workers expire and the rows are
+# claimed again, up to max_attempts times.
+
+class WorkQueue(Protocol):
+    """Claimable task rows shared by several workers of one sweep."""
+
+    sweep: str
+    worker_id: str
+
+    def enqueue(self, kind: str, tasks: List[Tuple[str, Dict[str, Any]]]) -> int: ...
+
+    def claim(self, kind: str, limit: int) -> List[Dict[str, Any]]: ...
+
+    def heartbeat(self, ids: List[int]) -> int: ...
+
+    def finish(
+        self,
+        task_id: int,
+        status: str = "done",
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> bool: ...
+
+    def counts(self, kind: str) -> Dict[str, int]: ...
+
+    def close(self) -> None: ...
+
+
+class SqliteWorkQueue:
+    """
+    Work queue in a local SQLite file.
+
+    A stand-in for the Postgres queue: workers on one machine (or on a
+    shared volume with working file locks) coordinate through it.
+    Claims run in an IMMEDIATE transaction so two processes cannot take
+    the same row.
+    """
+
+    DEFAULT_FILENAME = "work_queue.sqlite3"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        sweep: str = "default",
+        worker_id: str = "worker",
+        lease_seconds: int = 300,
+        max_attempts: int = 3,
+    ):
+        self.path = path or _state_path(self.DEFAULT_FILENAME)
+        self.sweep = sweep
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS work_queue ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " sweep TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " task_key TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL,"
+            " lease_owner TEXT,"
+            " lease_expires_at REAL,"
+            " result TEXT,"
+            " last_error TEXT,"
+            " updated_at REAL NOT NULL,"
+            " UNIQUE (sweep, kind, task_key))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_work_queue_claim"
+            " ON work_queue(sweep, kind, status, id)"
+        )
+
+    def enqueue(self, kind: str, tasks: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Add tasks not already in this sweep; returns how many were new."""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO work_queue"
+                    " (sweep, kind, task_key, payload, max_attempts, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (self.sweep, kind, key, json.dumps(payload),
+                         self.max_attempts, now)
+                        for key, payload in tasks
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def claim(self, kind: str, limit: int) -> List[Dict[str, Any]]:
+        """Lease up to `limit` pending or lease-expired rows."""
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE work_queue SET status = 'failed',"
+                    " last_error = COALESCE(last_error, 'lease expired too many times'),"
+                    " lease_owner = NULL, lease_expires_at = NULL, updated_at = ?"
+                    " WHERE sweep = ? AND kind = ? AND status = 'claimed'"
+                    " AND lease_expires_at < ? AND attempts >= max_attempts",
+                    (now, self.sweep, kind, now),
+                )
+                rows = self._conn.execute(
+                    "SELECT id, task_key, payload, attempts FROM work_queue"
+                    " WHERE sweep = ? AND kind = ? AND (status = 'pending'"
+                    " OR (status = 'claimed' AND lease_expires_at < ?))"
+                    " ORDER BY id LIMIT ?",
+                    (self.sweep, kind, now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE work_queue SET status = 'claimed',"
+                    " attempts = attempts + 1, lease_owner = ?,"
+                    " lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    [
+                        (self.worker_id, now + self.lease_seconds, now, row[0])
+                        for row in rows
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            {
+                "id": row[0],
+                "task_key": row[1],
+                "payload": json.loads(row[2]),
+                "attempts": row[3] + 1,
+            }
+            for row in rows
+        ]
+
+    def heartbeat(self, ids: List[int]) -> int:
+        """Renew the leases this worker still holds."""
+        if not ids:
+            return 0
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE work_queue SET lease_expires_at = ?, updated_at = ?"
+                " WHERE status = 'claimed' AND lease_owner = ?"
+                " AND id IN (%s)" % ",".join("?" * len(ids)),
+                [now + self.lease_seconds, now, self.worker_id, *ids],
+            )
+            return cursor.rowcount
+
+    def finish(
+        self,
+        task_id: int,
+        status: str = "done",
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """
+        Mark a claimed row done/failed, or 'pending' to hand it back
+        untried. False if this worker no longer holds the lease.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE work_queue SET status = ?,"
+                " attempts = CASE WHEN ? = 'pending'"
+                " THEN MAX(attempts - 1, 0) ELSE attempts END,"
+                " result = COALESCE(?, result), last_error = ?,"
+                " lease_owner = NULL, lease_expires_at = NULL, updated_at = ?"
+                " WHERE id = ? AND status = 'claimed' AND lease_owner = ?",
+                (
+                    status, status,
+                    json.dumps(result) if result is not None else None,
+                    error, time.time(), task_id, self.worker_id,
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def counts(self, kind: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM work_queue"
+                " WHERE sweep = ? AND kind = ? GROUP BY status",
+                (self.sweep, kind),
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SupabaseWorkQueue:
+    """
+    Work queue in the growth_work_queue table.
+
+    Claims, heartbeats and completions go through the RPCs in
+    migrations/008_growth_work_queue.sql, which use SKIP LOCKED so
+    workers on different machines never claim the same row.
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        sweep: str = "default",
+        worker_id: str = "worker",
+        lease_seconds: int = 300,
+        max_attempts: int = 3,
+    ):
+        self.db = db
+        self.sweep = sweep
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def enqueue(self, kind: str, tasks: List[Tuple[str, Dict[str, Any]]]) -> int:
+        if not tasks:
+            return 0
+        result = self.db.table("growth_work_queue").upsert(
+            [
+                {
+                    "sweep": self.sweep,
+                    "kind": kind,
+                    "task_key": key,
+                    "payload": payload,
+                    "max_attempts": self.max_attempts,
+                }
+                for key, payload in tasks
+            ],
+            on_conflict="sweep,kind,task_key",
+            ignore_duplicates=True,
+        ).execute()
+        return len(result.data or [])
+
+    def claim(self, kind: str, limit: int) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        result = self.db.rpc("claim_growth_work", {
+            "p_sweep": self.sweep,
+            "p_kind": kind,
+            "p_worker": self.worker_id,
+            "p_limit": limit,
+            "p_lease_seconds": self.lease_seconds,
+        }).execute()
+        return [
+            {
+                "id": row["id"],
+                "task_key": row["task_key"],
+                "payload": row["payload"],
+                "attempts": row["attempts"],
+            }
+            for row in result.data or []
+        ]
+
+    def heartbeat(self, ids: List[int]) -> int:
+        if not ids:
+            return 0
+        result = self.db.rpc("heartbeat_growth_work", {
+            "p_worker": self.worker_id,
+            "p_ids": ids,
+            "p_lease_seconds": self.lease_seconds,
+        }).execute()
+        return result.data or 0
+
+    def finish(
+        self,
+        task_id: int,
+        status: str = "done",
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        response = self.db.rpc("finish_growth_work", {
+            "p_worker": self.worker_id,
+            "p_id": task_id,
+            "p_status": status,
+            "p_result": result,
+            "p_error": error,
+        }).execute()
+        return bool(response.data)
+
+    def counts(self, kind: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for status in ("pending", "claimed", "done", "failed"):
+            result = (
+                self.db.table("growth_work_queue")
+                .select("id", count="exact")
+                .eq("sweep", self.sweep)
+                .eq("kind", kind)
+                .eq("status", status)
+                .limit(1)
+                .execute()
+            )
+            if result.count:
+                counts[status] = result.count
+        return counts
+
+    def close(self) -> None:
+        pass
+
+
+class LeaseKeeper:
+    """
+    Background heartbeat for the rows a worker currently holds.
+
+    Renews every held lease each lease_seconds / 3, so a slow search
+    (rate-limit backoff can take minutes) never loses its row, while a
+    dead worker's rows expire within one lease period.
+    """
+
+    def __init__(self, queue: WorkQueue, lease_seconds: int):
+        self.queue = queue
+        self.interval = max(lease_seconds / 3.0, 1.0)
+        self._held: set = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="lease-keeper", daemon=True
+        )
+        self._thread.start()
+
+    def hold(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            self._held.update(ids)
+
+    def release(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            self._held.difference_update(ids)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                ids = sorted(self._held)
+            if not ids:
+                continue
+            try:
+                renewed = self.queue.heartbeat(ids)
+                if renewed < len(ids):
+                    logger.warning(
+                        "[WorkQueue] Lost %d of %d leases",
+                        len(ids) - renewed, len(ids),
+                    )
+            except Exception as exc:
+                logger.warning("[WorkQueue] Heartbeat failed: %s", exc)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def build_work_queue(
+    spec: str,
+    db: Any = None,
+    sweep: Optional[str] = None,
+    worker_id: Optional[str] = None,
+    lease_seconds: int = 300,
+) -> WorkQueue:
+    """
+    Create a work queue from a --work-queue spec.
+
+    'supabase' uses the growth_work_queue table; 'sqlite' or
+    'sqlite:///path/to/file' uses a local SQLite file. The sweep
+    defaults to today's UTC date, so each day's runs share one queue.
+    """
+    sweep = sweep or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    worker_id = worker_id or default_worker_id()
+    if spec == "supabase":
+        if db is None:
+            raise ValueError("--work-queue supabase needs database access")
+        if isinstance(db, SqliteStorage):
+            raise ValueError(
+                "--work-queue supabase needs --storage supabase; "
+                "use --work-queue sqlite with SQLite storage"
+            )
+        return SupabaseWorkQueue(
+            db, sweep=sweep, worker_id=worker_id, lease_seconds=lease_seconds
+        )
+    if spec == "sqlite" or spec.startswith("sqlite:///"):
+        path = spec[len("sqlite:///"):] if spec != "sqlite" else ""
+        return SqliteWorkQueue(
+            path or None, sweep=sweep, worker_id=worker_id, lease_seconds=lease_seconds
+        )
+    raise ValueError(f"Unknown work queue: {spec!r}")
+
+
+# ============================================================================
+# Agent 1: SafeSearcher
+# ============================================================================
+# GTM: Implements the Google Dorking search patterns from each vertical
+# in the Bull's-eye framework.
+
+class SafeSearcher:
+    """
+    Searches for LinkedIn prospects via Google Dorking by vertical.
+
+    Uses a SearchBackend (googlesearch-python by default) to find LinkedIn
+    profile URLs matching the target roles and geographies defined in
+    VERTICAL_CONFIGS.
+
+    Rate limiting: one global token bucket shared by up to `concurrency`
+    queries in flight. It starts at one search every 10-20s (or the rate
+    saved by the previous run) and is tuned by an AdaptiveRateController:
+    faster while pages come back clean, halved on 429s and empty pages.
+    Backends that are not rate limited (fixture replay) skip it.
+    Max searches per run: configurable (default 20). Cache hits from
+    SearchCache do not count against it and skip the rate limiter.
+    HTTP 429 handling: wait for Retry-After when the engine sends it,
+    otherwise exponential backoff (30s, 60s, 120s), max 3 retries.
+    """
+
+    # Rate limiting constants
+    MIN_DELAY_SECONDS = 10
+    MAX_DELAY_SECONDS = 20
+    BACKOFF_BASE_SECONDS = 30
+    MAX_RETRIES = 3
+    RESULTS_PER_QUERY = 10
+    MAX_CONCURRENT_SEARCHES = 3
+
+    def __init__(
+        self,
+        max_searches: int = 20,
+        concurrency: int = MAX_CONCURRENT_SEARCHES,
+        cache: Optional[SearchCache] = None,
+        backend: Optional[SearchBackend] = None,
+        scheduler: Optional[QueryScheduler] = None,
+        page_fetcher: Optional[PageFetcher] = None,
+    ):
+        self.backend = backend or GoogleSearchBackend()
+        self.scheduler = scheduler
+        self.page_fetcher = page_fetcher
+        self.max_searches = max_searches
+        self.search_limit = max_searches
+        self.searches_done = 0
+        self._scored_queries: set = set()
+        # Queries whose last search errored or stayed rate limited; their
+        # empty result is not cached and their queue rows stay pending
+        self.failed_queries: set = set()
+        # Called with each query once all its leads have been consumed
+        self.on_query_done: Optional[Callable[[str], None]] = None
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.parser = ResultParser()
+
+        # Same average rate as the old uniform(MIN, MAX) sleep, but the
+        # wait now overlaps with the requests instead of following them.
+        mean_delay = (self.MIN_DELAY_SECONDS + self.MAX_DELAY_SECONDS) / 2
+        self.limiter: Optional[TokenBucket] = None
+        self.rate_control: Optional[AdaptiveRateController] = None
+        if self.backend.rate_limited:
+            self.limiter = TokenBucket(
+                rate=1.0 / mean_delay,
+                jitter=(self.MAX_DELAY_SECONDS - self.MIN_DELAY_SECONDS)
+                / (self.MAX_DELAY_SECONDS + self.MIN_DELAY_SECONDS),
+            )
+            self.rate_control = AdaptiveRateController(
+                self.limiter, self.backend.name
+            )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="safe-searcher",
+        )
+
+    def search_vertical(
+        self, vertical: str, skip: Iterable[str] = ()
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the leads found by a vertical's search queries.
+
+        A generator: queries run concurrently in the background and each
+        lead is yielded as soon as its result page is parsed, so the
+        caller can dedup and insert it while later queries are still
+        waiting on the network. Nothing is accumulated across queries.
+        Queries in `skip` (already done by a resumed run) are left out.
+
+        Yields raw lead dicts with keys:
+            full_name, job_title, company, linkedin_url, vertical,
+            source_query, geo
+        """
+        config = VERTICAL_CONFIGS.get(vertical)
+        if not config:
+            logger.error("Unknown vertical: %s", vertical)
+            return
+
+        skip = set(skip)
+        leads_found = yield from self._stream_queries(
+            [q for q in config["search_queries"] if q not in skip],
+            vertical,
+            lambda query, _: (vertical, query),
+        )
+        logger.info(
+            "[SafeSearcher] Vertical %s complete: %d leads found from %d searches",
+            vertical, leads_found, self.searches_done,
+        )
+
+    def search_compiled(
+        self, compiled: List[CompiledQuery], skip: Iterable[str] = ()
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream leads from a QueryCompiler cover set.
+
+        Each result is attributed back to the source vertical whose
+        original query it matches best; its geo is inferred from that
+        original query. source_query is the compiled query actually run.
+        """
+        skip = set(skip)
+        by_query = {c.query: c for c in compiled if c.query not in skip}
+
+        def attribute(query: str, result: Dict[str, str]) -> Tuple[str, str]:
+            return by_query[query].attribute(
+                f"{result.get('title', '')} {result.get('description', '')}"
+            )
+
+        leads_found = yield from self._stream_queries(
+            list(by_query), "compiled queries", attribute,
+            labels={q: "+".join(c.verticals) for q, c in by_query.items()},
+        )
+        logger.info(
+            "[SafeSearcher] Compiled queries complete: %d leads found "
+            "from %d searches",
+            leads_found, self.searches_done,
+        )
+
+    def search_tasks(
+        self, tasks: List[Tuple[str, str]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream leads for explicit (vertical, query) pairs, e.g. rows
+        claimed from a WorkQueue.
+        """
+        verticals = {query: vertical for vertical, query in tasks}
+        leads_found = yield from self._stream_queries(
+            list(verticals), "work queue",
+            lambda query, _: (verticals[query], query),
+            labels=verticals,
+        )
+        logger.info(
+            "[SafeSearcher] %d queued queries complete: %d leads found",
+            len(verticals), leads_found,
+        )
+
+    def _stream_queries(
+        self,
+        queries: List[str],
+        label: str,
+        attribute: Callable[[str, Dict[str, str]], Tuple[str, str]],
+        labels: Optional[Dict[str, str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run queries and yield parsed leads page by page.
+
+        Each result page is parsed in one ResultParser.parse_page call.
+
+        `attribute(query, result)` returns the (vertical, geo query) for a
+        hit. Records yield statistics for pages that were really searched.
+        Returns (via StopIteration) the number of leads yielded.
+        """
+        leads_found = 0
+        for query, results, cached in self._iter_search_results(
+            queries, label
+        ):
+            page = self.parser.parse_page(results, query, attribute=attribute)
+            query_leads = list(page.rows())
+            for lead in query_leads:
+                logger.info(
+                    "[SafeSearcher] Found: %s — %s at %s (%s)",
+                    lead["full_name"], lead["job_title"] or "?",
+                    lead["company"] or "?", lead["linkedin_url"],
+                )
+
+            logger.info(
+                "[SafeSearcher] Query returned %d LinkedIn profiles",
+                len(query_leads),
+            )
+            # Cached pages cost no budget, so they do not count as yield
+            if self.scheduler and not cached:
+                self.scheduler.record_search(
+                    query, (labels or {}).get(query, label), len(query_leads)
+                )
+                self._scored_queries.add(query)
+            else:
+                self._scored_queries.discard(query)
+
+            leads_found += len(query_leads)
+            yield from query_leads
+            if self.on_query_done:
+                self.on_query_done(query)
+        return leads_found
+
+    def record_new_lead(self, query: Optional[str]) -> None:
+        """
+        Credit a query with one lead that LeadManager actually inserted.
+
+        Feeds the QueryScheduler's yield statistics; ignored for queries
+        whose page came from the cache in this run.
+        """
+        if self.scheduler and query in self._scored_queries:
+            self.scheduler.record_new_leads(query, 1)
+
+    def search_emails_for_batch(
+        self, batch: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Find emails for a batch of leads with shared queries.
+
+        Returns ({lead id: email}, queries actually run). A batch of one
+        takes the first email found in the results; larger batches attribute each email to a lead via attribute_emails and
+        stop once every lead has one. With a page fetcher, leads still
+        without an email are looked up on the result pages themselves.
+        """
+        found: Dict[str, str] = {}
+        tried: List[str] = []
+        for query in build_batch_email_queries(batch):
+            results = self._cached_results(query)
+            if results is None:
+                if self.searches_done >= self.search_limit:
+                    break
+
+                logger.info(
+                    "[SafeSearcher] Email search for %d lead(s): %.80s...",
+                    len(batch), query,
+                )
+                results = self._execute_search(query)
+                self.searches_done += 1
+                self._store_results(query, results)
+                if query in self.failed_queries:
+                    continue
+            tried.append(query)
+
+            if len(batch) == 1:
+                for result in results:
+                    text = f"{result.get('title', '')} {result.get('description', '')}"
+                    emails = extract_emails_from_text(text)
+                    if emails:
+                        found[batch[0]["id"]] = emails[0]
+                        break
+            else:
+                pending = [lead for lead in batch if lead["id"] not in found]
+                for lead_id, email in attribute_emails(results, pending).items():
+                    if email not in found.values():
+                        found[lead_id] = email
+            if self.page_fetcher and len(found) < len(batch):
+                # Page fetches do not count against the search budget
+                found.update(self.page_fetcher.find_emails(
+                    page_urls(results, PageFetcher.MAX_PAGES_PER_QUERY),
+                    [lead for lead in batch if lead["id"] not in found],
+                    taken=found.values(),
+                ))
+            if len(found) == len(batch):
+                break
+
+        return found, tried
+
+    def search_all_verticals(
+        self, budget: Optional[BudgetAllocator] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream leads from searches across all verticals.
+
+        With a BudgetAllocator each vertical searches within its granted
+        share; otherwise verticals run in order until max_searches.
+        """
+        for vertical in VERTICAL_CONFIGS:
+            if self.searches_done >= self.max_searches and not self.cache:
+                break
+            if budget:
+                used_before = self.searches_done
+                self.limit_budget(budget.grant(vertical))
+                yield from self.search_vertical(vertical)
+                budget.spend(vertical, self.searches_done - used_before)
+            else:
+                yield from self.search_vertical(vertical)
+        self.limit_budget(None)
+
+    def limit_budget(self, searches: Optional[int]) -> None:
+        """
+        Allow at most `searches` more searches (None lifts the window).
+
+        The window never extends past max_searches.
+        """
+        if searches is None:
+            self.search_limit = self.max_searches
+        else:
+            self.search_limit = min(
+                self.max_searches, self.searches_done + max(searches, 0)
+            )
+
+    def close(self) -> None:
+        """Shut down the worker threads, save rate state, close the cache."""
+        self._executor.shutdown(wait=True)
+        if self.page_fetcher:
+            self.page_fetcher.close()
+        if self.rate_control:
+            self.rate_control.close()
+        if self.cache:
+            self.cache.close()
+        if self.scheduler:
+            self.scheduler.close()
+
+    def _cached_results(self, query: str) -> Optional[List[Dict[str, str]]]:
+        """Look a query up in the result cache (None on miss or no cache)."""
+        if not self.cache:
+            return None
+        results = self.cache.get(query, self.RESULTS_PER_QUERY)
+        if results is not None:
+            logger.info("[SafeSearcher] Cache hit: %.80s...", query)
+        return results
+
+    def _store_results(
+        self, query: str, results: List[Dict[str, str]]
+    ) -> None:
+        if self.cache and query not in self.failed_queries:
+            self.cache.put(query, self.RESULTS_PER_QUERY, results)
+
+    def _iter_search_results(
+        self, queries: List[str], label: str
+    ) -> Iterator[Tuple[str, List[Dict[str, str]], bool]]:
+        """
+        Run queries on the worker pool, yielding (query, results, cached)
+        in completion order.
+
+        Cached queries are yielded straight away without using budget.
+        With a scheduler, the next query to submit is the pending one
+        with the best yield score, otherwise queries go in list order.
+        At most `concurrency` queries are in flight; the shared limiter
+        decides when each one actually hits the engine. Budget is
+        reserved when a query is submitted, so the max_searches cap holds
+        even with several queries outstanding.
+        """
+        pending = list(queries)
+        in_flight: Dict[Any, str] = {}
+        limit_logged = False
+
+        while pending or in_flight:
+            while pending and len(in_flight) < self.concurrency:
+                if self.scheduler:
+                    query = self.scheduler.pop_next(pending)
+                else:
+                    query = pending.pop(0)
+                cached = self._cached_results(query)
+                if cached is not None:
+                    yield query, cached, True
+                    continue
+
+                if self.searches_done >= self.search_limit:
+                    # Keep draining: later queries may still be cache hits
+                    if not limit_logged:
+                        if self.search_limit < self.max_searches:
+                            logger.info(
+                                "[SafeSearcher] Budget share for %s used up "
+                                "(%d searches done)", label, self.searches_done,
+                            )
+                        else:
+                            logger.warning(
+                                "Reached max searches limit (%d). Stopping.",
+                                self.max_searches,
+                            )
+                        limit_logged = True
+                    continue
+
+                self.searches_done += 1
+                logger.info(
+                    "[SafeSearcher] Executing query %d/%d for %s: %.80s...",
+                    self.searches_done,
+                    self.max_searches,
+                    label,
+                    query,
+                )
+                future = self._executor.submit(self._execute_search, query)
+                in_flight[future] = query
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                query = in_flight.pop(future)
+                results = future.result()
+                self._store_results(query, results)
+                yield query, results, False
+
+    def _execute_search(self, query: str) -> List[Dict[str, str]]:
+        """
+        Execute a single backend search with retry/backoff on HTTP 429.
+
+        Safe to call from several threads: every attempt first takes a
+        token from the shared limiter, and a 429 pauses the limiter for
+        all callers (Retry-After if given, else exponential backoff) and
+        lowers the adaptive rate.
+
+        Returns list of dicts with 'url', 'title', 'description'.
+        """
+        for attempt in range(self.MAX_RETRIES + 1):
+            if self.limiter:
+                waited = self.limiter.acquire()
+                if waited:
+                    logger.debug(
+                        "[SafeSearcher] Rate limit: waited %.1fs before query",
+                        waited,
+                    )
+            try:
+                results = self.backend.search(query, self.RESULTS_PER_QUERY)
+                if self.rate_control:
+                    self.rate_control.on_success(len(results))
+                self.failed_queries.discard(query)
+                return results
+
+            except SearchRateLimited as exc:
+                backoff = exc.retry_after or (
+                    self.BACKOFF_BASE_SECONDS * (2 ** attempt)
+                )
+                if self.rate_control:
+                    self.rate_control.on_throttle(backoff)
+                if attempt >= self.MAX_RETRIES:
+                    logger.error(
+                        "[SafeSearcher] Still rate limited after %d retries: %s",
+                        self.MAX_RETRIES, exc,
+                    )
+                    self.failed_queries.add(query)
+                    return []
+                logger.warning(
+                    "[SafeSearcher] HTTP 429 — backing off %ds%s "
+                    "(attempt %d/%d)",
+                    backoff,
+                    " (Retry-After)" if exc.retry_after else "",
+                    attempt + 1, self.MAX_RETRIES,
+                )
+                if not self.limiter:
+                    time.sleep(backoff)
+
+            except Exception as exc:
+                logger.error(
+                    "[SafeSearcher] Search failed: %s", exc,
+                )
+                self.failed_queries.add(query)
+                return []
+
+        self.failed_queries.add(query)
+        return []
+
+
+# ============================================================================
+# Lead existence index
+# ============================================================================
+# LeadManager's "already in growth_leads?" check runs against a local copy
+# of the table's linkedin_url values instead of the database. The copy is
+# saved under the state directory (one file per Supabase project) and
+# refreshed at the start of each run by downloading only rows updated
+# since the previous sync.
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings (double hashing on blake2b).
+
+    Sized for `capacity` items at `error_rate` false positives; past
+    its capacity the rate degrades, so LeadIndex rebuilds it larger.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = 0.001,
+        size: Optional[int] = None,
+        hashes: Optional[int] = None,
+        bits: Optional[bytearray] = None,
+    ):
+        self.capacity = max(1, capacity)
+        self.size = size or max(
+            8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = hashes or max(
+            1, round(self.size / self.capacity * math.log(2))
+        )
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(item)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "size": self.size,
+            "hashes": self.hashes,
+            "bits": base64.b64encode(bytes(self.bits)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BloomFilter":
+        return cls(
+            data["capacity"],
+            size=data["size"],
+            hashes=data["hashes"],
+            bits=bytearray(base64.b64decode(data["bits"])),
+        )
+
+
+class LeadIndex:
+    """
+    Local index of the linkedin_url values already in growth_leads.
+
+    A plain set up to BLOOM_THRESHOLD rows, a BloomFilter beyond that;
+    `exact` says which (a Bloom hit still needs a DB check, a miss never
+    does). Saved as JSON, in a file named after `database_url` so two
+    projects never share one, and brought up to date with an
+    incremental sync on (updated_at, id). The index is rebuilt from
+    scratch every FULL_SYNC_DAYS, when the Bloom filter is over
+    capacity, or when an exact index holds more URLs than the table has
+    rows (leads were deleted).
+    """
+
+    BLOOM_THRESHOLD = 200_000
+    BLOOM_ERROR_RATE = 0.001
+    SYNC_PAGE_SIZE = 1000
+    FULL_SYNC_DAYS = 7
+
+    def __init__(
+        self, path: Optional[str] = None, database_url: Optional[str] = None
+    ):
+        if path is None:
+            name = "lead_index"
+            if database_url:
+                digest = hashlib.sha256(database_url.encode("utf-8")).hexdigest()
+                name = f"{name}-{digest[:16]}"
+            path = _state_path(f"{name}.json")
+        self.path = path
+        self.urls: set = set()
+        self.bloom: Optional[BloomFilter] = None
+        self.count = 0
+        # Highest updated_at downloaded so far, and when the last full
+        # rebuild happened
+        self.synced_through: Optional[str] = None
+        self.full_sync_at: Optional[str] = None
+        self.stats = {"downloaded": 0, "full_sync": False}
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                state = json.load(fh)
+            self.urls = set(state.get("urls") or ())
+            if state.get("bloom"):
+                self.bloom = BloomFilter.from_dict(state["bloom"])
+            self.count = state.get("count", len(self.urls))
+            self.synced_through = state.get("synced_through")
+            self.full_sync_at = state.get("full_sync_at")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("[LeadIndex] Ignoring unreadable %s: %s", self.path, exc)
+
+    @property
+    def exact(self) -> bool:
+        return self.bloom is None
+
+    def __contains__(self, url: str) -> bool:
+        if self.bloom is not None:
+            return url in self.bloom
+        return url in self.urls
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, url: str) -> None:
+        if url in self:
+            return
+        self.count += 1
+        if self.bloom is not None:
+            self.bloom.add(url)
+        else:
+            self.urls.add(url)
+
+    def needs_full_sync(self) -> bool:
+        if not self.full_sync_at:
+            return True
+        if self.bloom is not None and self.count > self.bloom.capacity:
+            return True
+        try:
+            last = datetime.fromisoformat(self.full_sync_at)
+        except ValueError:
+            return True
+        return datetime.now(timezone.utc) - last > timedelta(days=self.FULL_SYNC_DAYS)
+
+    def sync(self, db: Any) -> int:
+        """
+        Download rows updated since the last sync (all rows on a full
+        rebuild) and save the index. Returns the rows downloaded.
+        """
+        full = self.needs_full_sync()
+        since = None if full else self.synced_through
+        new_urls: set = set()
+        latest = self.synced_through
+        downloaded = 0
+        # Keyset pages: rows whose updated_at changes mid-sync (bulk
+        # updates bump it) can't shift later pages and skip rows
+        after: Optional[Tuple[str, str]] = None
+        while True:
+            query = db.table("growth_leads").select("id,linkedin_url,updated_at")
+            if since:
+                query = query.gte("updated_at", since)
+            if after:
+                updated_at, lead_id = (_postgrest_quote(str(v)) for v in after)
+                query = query.or_(
+                    f"updated_at.gt.{updated_at},"
+                    f"and(updated_at.eq.{updated_at},id.gt.{lead_id})"
+                )
+            result = (
+                query.order("updated_at").order("id")
+                .limit(self.SYNC_PAGE_SIZE)
+                .execute()
+            )
+            rows = result.data or []
+            for row in rows:
+                if row.get("linkedin_url"):
+                    new_urls.add(row["linkedin_url"])
+                updated = row.get("updated_at")
+                if updated and (latest is None or updated > latest):
+                    latest = updated
+            downloaded += len(rows)
+            if len(rows) < self.SYNC_PAGE_SIZE or not rows[-1].get("updated_at"):
+                break
+            after = (rows[-1]["updated_at"], rows[-1]["id"])
+
+        if full:
+            self.urls, self.bloom, self.count = set(), None, 0
+            self.full_sync_at = datetime.now(timezone.utc).isoformat()
+            if len(new_urls) > self.BLOOM_THRESHOLD:
+                # Room to grow before the next rebuild
+                self.bloom = BloomFilter(
+                    2 * len(new_urls), self.BLOOM_ERROR_RATE
+                )
+        for url in new_urls:
+            self.add(url)
+        self.synced_through = latest
+
+        if not full and self.exact:
+            # Deleted leads never show up in an incremental sync; a
+            # surplus of indexed URLs gives them away
+            total = (
+                db.table("growth_leads").select("id", count="exact")
+                .limit(1).execute().count
+            )
+            if total is not None and total < self.count:
+                logger.info(
+                    "[LeadIndex] %d leads indexed but %d in growth_leads; "
+                    "rebuilding", self.count, total,
+                )
+                self.full_sync_at = None
+                return downloaded + self.sync(db)
+
+        self.stats.update(downloaded=downloaded, full_sync=full)
+        self.save()
+        logger.info(
+            "[LeadIndex] %s sync: %d rows downloaded, %d leads indexed (%s)",
+            "Full" if full else "Incremental", downloaded, self.count,
+            "exact" if self.exact else "Bloom filter",
+        )
+        return downloaded
+
+    def save(self) -> None:
+        state = {
+            "count": self.count,
+            "synced_through": self.synced_through,
+            "full_sync_at": self.full_sync_at,
+            "urls": sorted(self.urls),
+            "bloom": self.bloom.to_dict() if self.bloom is not None else None,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        os.replace(tmp_path, self.path)
+
+
+# ============================================================================
+# CRM contact matching
+# ============================================================================
+# "Is this lead already a CRM contact?" is answered from an in-memory index
+# of the contacts table (email, first_name, last_name only), built on first
+# use and topped up with newly created contacts every REFRESH_SECONDS.
+# Names are compared as folded tokens, so 'José Pérez García', 'Jose Perez'
+# and 'Dr. José Luis Pérez García' all match a contact José / Pérez, while
+# 'José Luis Rodríguez García' (same given name, same maternal surname)
+# does not match José / Pérez García.
+
+NAME_PARTICLES = frozenset({
+    "de", "del", "la", "las", "los", "da", "das", "do", "dos", "di", "du",
+    "van", "von", "der", "den", "le", "y", "e",
+})
+NAME_TITLES = frozenset({
+    "dr", "dra", "prof", "profa", "lic", "mr", "mrs", "ms", "md", "phd",
+})
+
+
+def contact_name_tokens(name: Optional[str]) -> List[str]:
+    """Folded name words without particles, titles or initials."""
+    return [
+        t for t in _name_tokens(name or "")
+        if t not in NAME_PARTICLES and t not in NAME_TITLES
+    ]
+
+
+class ContactIndex:
+    """
+    Emails and blocking keys of every CRM contact, for O(1) matching.
+
+    A contact is filed under (first given name, surname) for each of
+    its surnames; those keys only find candidates. A lead matches when
+    its email is known (case-insensitive), or when a candidate found
+    through (its first name word, a later name word) is confirmed: the
+    lead's first surname is the contact's first surname, or the
+    contact has several surnames and the lead's name has them all.
+    The lead's first surname is its second word in names of up to
+    three words, else its second-to-last (given names, then paternal
+    and maternal surnames). Sharing only a maternal surname is never a
+    match.
+    """
+
+    PAGE_SIZE = 1000
+    REFRESH_SECONDS = 600
+
+    def __init__(self) -> None:
+        self.emails: set = set()
+        # (given name, surname) → surname tuples of the contacts filed there
+        self.keys: Dict[Tuple[str, str], set] = {}
+        self.count = 0
+        # Highest created_at loaded, and when the last refresh ran
+        self.synced_through: Optional[str] = None
+        self.refreshed_at: Optional[float] = None
+
+    def add(
+        self,
+        email: Optional[str],
+        first_name: Optional[str],
+        last_name: Optional[str],
+    ) -> None:
+        self.count += 1
+        if email:
+            self.emails.add(email.strip().lower())
+        given = contact_name_tokens(first_name)
+        surnames = tuple(contact_name_tokens(last_name))
+        if given:
+            for surname in surnames:
+                self.keys.setdefault((given[0], surname), set()).add(surnames)
+
+    def match(self, full_name: Optional[str], email: Optional[str]) -> bool:
+        if email and email.strip().lower() in self.emails:
+            return True
+        tokens = contact_name_tokens(full_name)
+        if len(tokens) < 2:
+            return False
+        first_surname = tokens[1] if len(tokens) <= 3 else tokens[-2]
+        later = set(tokens[1:])
+        return any(
+            surnames[0] == first_surname
+            or (len(surnames) > 1 and later.issuperset(surnames))
+            for t in tokens[1:]
+            for surnames in self.keys.get((tokens[0], t), ())
+        )
+
+    def stale(self) -> bool:
+        return (
+            self.refreshed_at is None
+            or time.monotonic() - self.refreshed_at > self.REFRESH_SECONDS
+        )
+
+    def refresh(self, db: Any) -> int:
+        """Load contacts created since the last refresh; returns how many."""
+        since = self.synced_through
+        latest = since
+        offset = 0
+        while True:
+            query = db.table("contacts").select(
+                "email,first_name,last_name,created_at"
+            )
+            if since:
+                # gte: rows sharing the boundary timestamp are re-read,
+                # which is harmless (keys are sets)
+                query = query.gte("created_at", since)
+            result = (
+                query.order("created_at")
+                .range(offset, offset + self.PAGE_SIZE - 1)
+                .execute()
+            )
+            rows = result.data or []
+            for row in rows:
+                self.add(row.get("email"), row.get("first_name"), row.get("last_name"))
+                created = row.get("created_at")
+                if created and (latest is None or created > latest):
+                    latest = created
+            offset += len(rows)
+            if len(rows) < self.PAGE_SIZE:
+                break
+        self.synced_through = latest
+        self.refreshed_at = time.monotonic()
+        logger.info(
+            "[ContactIndex] %d contacts loaded (%d emails, %d name keys)",
+            offset, len(self.emails), len(self.keys),
+        )
+        return offset
+
+
+# ============================================================================
+# Storage backends
+# ============================================================================
+# The agents use a small slice of the Supabase client: table(name) with
+# select / insert / upsert / update, the eq / neq / is_ / ilike / in_ /
+# gte / or_ filters, order, limit / range and execute() → .data, plus
+# the rpc() functions from migrations/. SqliteStorage implements that
+# slice over a local file mirroring growth_leads, growth_email_drafts and
+# contacts, so the real pipeline (dedup included) runs offline:
+#
+#   python ai_growth_system.py --mode full --storage sqlite:////tmp/crm.db
+
+class Storage(Protocol):
+    """The DB client interface the agents rely on (Supabase's Client fits)."""
+
+    def table(self, name: str) -> Any:
+        """Query builder for `name`; execute() returns a result with .data."""
+        ...
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> Any:
+        """Call a DB function; execute() on the returned object runs it."""
+        ...
+
+
+class StorageError(Exception):
+    """
+    A statement SqliteStorage rejected.
+
+    `code` is the equivalent Postgres SQLSTATE (23505 unique violation,
+    23503 foreign key, ...), as on the errors PostgREST returns.
+    """
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.code = code
+
+
+class StorageResult:
+    """What execute() returns: rows (or an RPC's value) and the exact count."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+# Tables mirrored from migrations/ (contacts: the columns the growth
+# system touches). ids and timestamps are filled in by SqliteStorage, as
+# ISO-8601 UTC strings, so they sort like the Postgres values.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS growth_leads (
+    id              TEXT PRIMARY KEY,
+    full_name       TEXT,
+    first_name      TEXT,
+    last_name       TEXT,
+    job_title       TEXT,
+    company         TEXT,
+    email           TEXT,
+    linkedin_url    TEXT UNIQUE,
+    vertical        TEXT NOT NULL
+                        CHECK (vertical IN ('DIRECT_B2B', 'PHARMA', 'INFLUENCER', 'EVENTS')),
+    source_query    TEXT,
+    geo             TEXT,
+    status          TEXT DEFAULT 'new'
+                        CHECK (status IN ('new', 'draft_generated', 'promoted', 'ignored')),
+    extra_data      TEXT DEFAULT '{}',
+    created_at      TEXT NOT NULL,
+    updated_at      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_growth_leads_vertical ON growth_leads(vertical);
+CREATE INDEX IF NOT EXISTS idx_growth_leads_status ON growth_leads(status);
+CREATE INDEX IF NOT EXISTS idx_growth_leads_email ON growth_leads(email);
+CREATE INDEX IF NOT EXISTS idx_growth_leads_created ON growth_leads(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_growth_leads_new_queue
+    ON growth_leads(vertical, created_at, id) WHERE status = 'new';
+CREATE INDEX IF NOT EXISTS idx_growth_leads_no_email_queue
+    ON growth_leads(vertical, created_at, id)
+    WHERE email IS NULL AND status <> 'ignored';
+CREATE INDEX IF NOT EXISTS idx_growth_leads_updated ON growth_leads(updated_at);
+
+CREATE TABLE IF NOT EXISTS growth_email_drafts (
+    id                  TEXT PRIMARY KEY,
+    lead_id             TEXT NOT NULL REFERENCES growth_leads(id) ON DELETE CASCADE,
+    subject             TEXT NOT NULL,
+    body                TEXT NOT NULL,
+    vertical            TEXT NOT NULL
+                            CHECK (vertical IN ('DIRECT_B2B', 'PHARMA', 'INFLUENCER', 'EVENTS')),
+    language            TEXT DEFAULT 'en'
+                            CHECK (language IN ('en', 'es', 'pt')),
+    status              TEXT DEFAULT 'draft_pending_review'
+                            CHECK (status IN ('draft_pending_review', 'approved', 'rejected', 'sent')),
+    generation_context  TEXT DEFAULT '{}',
+    reviewer_notes      TEXT,
+    created_at          TEXT NOT NULL,
+    reviewed_at         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_growth_drafts_status ON growth_email_drafts(status);
+CREATE INDEX IF NOT EXISTS idx_growth_drafts_lead_id ON growth_email_drafts(lead_id);
+
+CREATE TABLE IF NOT EXISTS contacts (
+    id              TEXT PRIMARY KEY,
+    first_name      TEXT,
+    last_name       TEXT,
+    email           TEXT,
+    phone           TEXT,
+    linkedin_url    TEXT,
+    job_title       TEXT,
+    country         TEXT,
+    source          TEXT,
+    created_at      TEXT NOT NULL,
+    updated_at      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email);
+CREATE INDEX IF NOT EXISTS idx_contacts_created ON contacts(created_at);
+"""
+
+# JSONB columns, stored as JSON text
+SQLITE_JSON_COLUMNS = {
+    "growth_leads": ("extra_data",),
+    "growth_email_drafts": ("generation_context",),
+    "contacts": (),
+}
+
+_SELECT_FIELD_RE = re.compile(
+    r"^(?:(\w+):)?(\w+)(?:->>?(\w+))?$"
+)
+
+
+def _casefold(value: Any) -> Any:
+    return value.casefold() if isinstance(value, str) else value
+
+
+def _split_filter_list(text: str) -> List[str]:
+    """Split a PostgREST logic list at top-level commas."""
+    parts, depth, quoted, start = [], 0, False, 0
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if quoted:
+            if ch == "\\":
+                i += 1
+            elif ch == '"':
+                quoted = False
+        elif ch == '"':
+            quoted = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _unquote_filter_value(value: str) -> str:
+    """Inverse of _postgrest_quote (unquoted values pass through)."""
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+class SqliteQuery:
+    """Supabase-style query builder over one SqliteStorage table."""
+
+    OPERATORS = {
+        "eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=",
+    }
+
+    def __init__(self, storage: "SqliteStorage", table: str):
+        self.storage = storage
+        self.table = table
+        self.columns = storage.columns(table)
+        self._op = "select"
+        self._fields = "*"
+        self._count: Optional[str] = None
+        self._rows: List[Dict[str, Any]] = []
+        self._values: Dict[str, Any] = {}
+        self._on_conflict: Optional[str] = None
+        self._ignore_duplicates = False
+        self._where: List[str] = []
+        self._params: List[Any] = []
+        self._order: List[str] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+
+    # -- statements ---------------------------------------------------------
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "SqliteQuery":
+        self._fields = columns
+        self._count = count
+        return self
+
+    def insert(self, rows: Any) -> "SqliteQuery":
+        self._op = "insert"
+        self._rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(
+        self,
+        rows: Any,
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: bool = False,
+    ) -> "SqliteQuery":
+        self.insert(rows)
+        self._op = "upsert"
+        self._on_conflict = self._column(on_conflict or "id")
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "SqliteQuery":
+        self._op = "update"
+        self._values = values
+        return self
+
+    # -- filters and modifiers ----------------------------------------------
+
+    def eq(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "lte", value)
+
+    def ilike(self, column: str, pattern: str) -> "SqliteQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "SqliteQuery":
+        return self._filter(column, "in", list(values))
+
+    def or_(self, filters: str) -> "SqliteQuery":
+        """PostgREST logic tree, e.g. 'a.eq.1,and(b.gt."x",c.is.null)'."""
+        sql, params = self._logic(filters, "OR")
+        self._where.append(f"({sql})")
+        self._params.extend(params)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "SqliteQuery":
+        self._order.append(
+            '"%s" %s' % (self._column(column), "DESC" if desc else "ASC")
+        )
+        return self
+
+    def limit(self, count: int) -> "SqliteQuery":
+        self._limit = count
+        return self
+
+    def range(self, start: int, end: int) -> "SqliteQuery":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def execute(self) -> StorageResult:
+        if self._op == "select":
+            return self.storage.run(self._execute_select)
+        if self._op == "update":
+            return self.storage.run(self._execute_update, write=True)
+        return self.storage.run(self._execute_insert, write=True)
+
+    # -- SQL ----------------------------------------------------------------
+
+    def _column(self, column: str) -> str:
+        if column not in self.columns:
+            raise StorageError(
+                f"column {self.table}.{column} does not exist", "42703"
+            )
+        return column
+
+    def _filter(self, column: str, op: str, value: Any) -> "SqliteQuery":
+        sql, params = self._condition(column, op, value)
+        self._where.append(sql)
+        self._params.extend(params)
+        return self
+
+    def _condition(self, column: str, op: str, value: Any) -> Tuple[str, List[Any]]:
+        column = '"%s"' % self._column(column)
+        if op in self.OPERATORS:
+            return f"{column} {self.OPERATORS[op]} ?", [self._encode(value)]
+        if op in ("like", "ilike"):
+            pattern = str(value).replace("*", "%")
+            if op == "like":
+                return f"{column} LIKE ?", [pattern]
+            return f"casefold({column}) LIKE casefold(?)", [pattern]
+        if op == "is":
+            literal = {"null": "NULL", "true": "1", "false": "0"}.get(
+                str(value).lower() if value is not None else "null"
+            )
+            if literal is None:
+                raise StorageError(f"invalid is value: {value!r}", "22P02")
+            return f"{column} IS {literal}", []
+        if op == "in":
+            if not value:
+                return "0", []
+            marks = ", ".join("?" * len(value))
+            return f"{column} IN ({marks})", [self._encode(v) for v in value]
+        raise StorageError(f"unsupported filter operator: {op}", "42883")
+
+    def _logic(self, text: str, joiner: str) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for part in _split_filter_list(text):
+            group = re.match(r"^(and|or)\((.*)\)$", part, re.S)
+            if group:
+                sql, args = self._logic(group.group(2), group.group(1).upper())
+            else:
+                try:
+                    column, op, value = part.split(".", 2)
+                except ValueError:
+                    raise StorageError(f"invalid filter: {part!r}", "PGRST100")
+                sql, args = self._condition(
+                    column, op, _unquote_filter_value(value)
+                )
+            clauses.append(f"({sql})")
+            params.extend(args)
+        return f" {joiner} ".join(clauses), params
+
+    def _where_sql(self) -> str:
+        return " WHERE " + " AND ".join(self._where) if self._where else ""
+
+    def _encode(self, value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False)
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    def _decode(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        for column in SQLITE_JSON_COLUMNS.get(self.table, ()):
+            if isinstance(record.get(column), str):
+                record[column] = json.loads(record[column])
+        return record
+
+    def _project(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the select() field list (aliases and -> / ->> paths)."""
+        if self._fields.strip() == "*":
+            return record
+        out = {}
+        for field in self._fields.split(","):
+            match = _SELECT_FIELD_RE.match(field.strip())
+            if not match:
+                raise StorageError(f"unsupported select field: {field!r}", "PGRST100")
+            alias, column, key = match.groups()
+            value = record[self._column(column)]
+            if key:
+                value = value.get(key) if isinstance(value, dict) else None
+            out[alias or key or column] = value
+        return out
+
+    def _execute_select(self, conn: sqlite3.Connection) -> StorageResult:
+        where = self._where_sql()
+        sql = f'SELECT * FROM "{self.table}"{where}'
+        if self._order:
+            sql += " ORDER BY " + ", ".join(self._order)
+        if self._limit is not None or self._offset:
+            sql += f" LIMIT {int(self._limit if self._limit is not None else -1)}"
+            sql += f" OFFSET {int(self._offset)}"
+        rows = conn.execute(sql, self._params).fetchall()
+        count = None
+        if self._count:
+            count = conn.execute(
+                f'SELECT COUNT(*) FROM "{self.table}"{where}', self._params
+            ).fetchone()[0]
+        return StorageResult(
+            [self._project(self._decode(row)) for row in rows], count
+        )
+
+    def _execute_insert(self, conn: sqlite3.Connection) -> StorageResult:
+        now = datetime.now(timezone.utc).isoformat()
+        out = []
+        for row in self._rows:
+            given = [self._column(column) for column in row]
+            record = {column: self._encode(row[column]) for column in given}
+            # Column defaults Postgres would fill in
+            record.setdefault("id", str(uuid.uuid4()))
+            for column in ("created_at", "updated_at"):
+                if column in self.columns:
+                    record.setdefault(column, now)
+            columns = ", ".join('"%s"' % column for column in record)
+            sql = (
+                f'INSERT INTO "{self.table}" ({columns}) '
+                f'VALUES ({", ".join("?" * len(record))})'
+            )
+            if self._op == "upsert" and self._ignore_duplicates:
+                sql += " ON CONFLICT DO NOTHING"
+            elif self._op == "upsert":
+                updates = [c for c in given if c != self._on_conflict]
+                sql += ' ON CONFLICT ("%s") DO ' % self._on_conflict
+                sql += (
+                    "UPDATE SET " + ", ".join(
+                        '"%s" = excluded."%s"' % (c, c) for c in updates
+                    )
+                    if updates else "NOTHING"
+                )
+            sql += " RETURNING *"
+            out.extend(
+                self._decode(r)
+                for r in conn.execute(sql, list(record.values())).fetchall()
+            )
+        return StorageResult(out)
+
+    def _execute_update(self, conn: sqlite3.Connection) -> StorageResult:
+        if not self._values:
+            return StorageResult([])
+        assignments = ", ".join(
+            '"%s" = ?' % self._column(column) for column in self._values
+        )
+        rows = conn.execute(
+            f'UPDATE "{self.table}" SET {assignments}{self._where_sql()} '
+            "RETURNING *",
+            [self._encode(v) for v in self._values.values()] + self._params,
+        ).fetchall()
+        return StorageResult([self._decode(row) for row in rows])
+
+
+class SqliteRpc:
+    """A pending SqliteStorage.rpc() call."""
+
+    def __init__(self, storage: "SqliteStorage", name: str, params: Dict[str, Any]):
+        self.storage = storage
+        self.name = name
+        self.params = params
+
+    def execute(self) -> StorageResult:
+        function = self.storage.FUNCTIONS.get(self.name)
+        if function is None:
+            raise StorageError(
+                f"Could not find the function {self.name} in SQLite storage",
+                "PGRST202",
+            )
+        return self.storage.run(
+            lambda conn: StorageResult(
+                getattr(self.storage, function)(conn, **self.params)
+            ),
+            write=True,
+        )
+
+
+class SqliteStorage:
+    """
+    Local SQLite stand-in for the Supabase client.
+
+    Implements the table/rpc slice described above (including
+    bulk_update_growth_leads and growth_leads_without_drafts from
+    migrations/009 and 010). Each execute() is one
+    transaction, so a multi-row insert goes in entirely or not at all;
+    constraint violations raise StorageError with the Postgres SQLSTATE.
+    """
+
+    DEFAULT_FILENAME = "growth.sqlite3"
+    # rpc() name → method implementing it
+    FUNCTIONS = {
+        "bulk_update_growth_leads": "_bulk_update_growth_leads",
+        "growth_leads_without_drafts": "_growth_leads_without_drafts",
+    }
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or _state_path(self.DEFAULT_FILENAME)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.create_function("casefold", 1, _casefold, deterministic=True)
+        self._conn.executescript(SQLITE_SCHEMA)
+        self._columns = {
+            table: {row[1] for row in self._conn.execute(
+                f'PRAGMA table_info("{table}")'
+            )}
+            for table in SQLITE_JSON_COLUMNS
+        }
+
+    def table(self, name: str) -> SqliteQuery:
+        return SqliteQuery(self, name)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> SqliteRpc:
+        return SqliteRpc(self, name, params)
+
+    def columns(self, table: str) -> set:
+        if table not in self._columns:
+            raise StorageError(f'relation "{table}" does not exist', "42P01")
+        return self._columns[table]
+
+    def run(
+        self, statement: Callable[[sqlite3.Connection], StorageResult],
+        write: bool = False,
+    ) -> StorageResult:
+        """Run a statement in its own transaction, mapping sqlite errors."""
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+                try:
+                    result = statement(self._conn)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.IntegrityError as exc:
+                text = str(exc)
+                code = next(
+                    (code for marker, code in (
+                        ("UNIQUE", "23505"), ("FOREIGN KEY", "23503"),
+                        ("CHECK", "23514"), ("NOT NULL", "23502"),
+                    ) if marker in text),
+                    "23000",
+                )
+                raise StorageError(text, code) from exc
+            except sqlite3.OperationalError as exc:
+                text = str(exc)
+                # Another process holding the write lock: retryable
+                code = "40001" if "locked" in text or "busy" in text else "42000"
+                raise StorageError(text, code) from exc
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _bulk_update_growth_leads(
+        self, conn: sqlite3.Connection, p_updates: List[Dict[str, Any]]
+    ) -> int:
+        """Same contract as the Postgres function in migrations/009."""
+        now = datetime.now(timezone.utc).isoformat()
+        updated = 0
+        for change in p_updates:
+            row = conn.execute(
+                "SELECT extra_data FROM growth_leads WHERE id = ?",
+                (change["id"],),
+            ).fetchone()
+            if row is None:
+                continue
+            values: Dict[str, Any] = {"updated_at": now}
+            for column in ("email", "status"):
+                if column in change:
+                    values[column] = change[column]
+            if "extra_data" in change:
+                merged = json.loads(row["extra_data"] or "{}")
+                merged.update(change["extra_data"] or {})
+                values["extra_data"] = json.dumps(merged, ensure_ascii=False)
+            conn.execute(
+                "UPDATE growth_leads SET %s WHERE id = ?" % ", ".join(
+                    '"%s" = ?' % column for column in values
+                ),
+                list(values.values()) + [change["id"]],
+            )
+            updated += 1
+        return updated
+
+    def _growth_leads_without_drafts(
+        self,
+        conn: sqlite3.Connection,
+        p_vertical: Optional[str] = None,
+        p_after_created_at: Optional[str] = None,
+        p_after_id: Optional[str] = None,
+        p_limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """Same contract as the Postgres function in migrations/010."""
+        sql = (
+            f"SELECT {DRAFT_LEAD_COLUMNS} FROM growth_leads l"
+            " WHERE status = 'new' AND NOT EXISTS ("
+            "SELECT 1 FROM growth_email_drafts d WHERE d.lead_id = l.id)"
+        )
+        params: List[Any] = []
+        if p_vertical is not None:
+            sql += " AND vertical = ?"
+            params.append(p_vertical)
+        if p_after_created_at is not None:
+            sql += " AND (created_at, id) > (?, ?)"
+            params += [p_after_created_at, p_after_id]
+        sql += " ORDER BY created_at, id LIMIT ?"
+        return [dict(row) for row in conn.execute(sql, params + [p_limit])]
+
+
+def build_storage(spec: str, http: Optional["HttpClients"] = None) -> Any:
+    """
+    Open the DB selected with --storage.
+
+    'supabase' connects with the project credentials (through the
+    pooled client of `http`); 'sqlite' or 'sqlite:///path/to/file'
+    opens a local SqliteStorage (default: growth.sqlite3 in the state
+    directory). As in SQLAlchemy URLs, three slashes give a relative
+    path and four an absolute one ('sqlite:////tmp/crm.db').
+    """
+    if spec == "supabase":
+        return _get_supabase_client(http)
+    if spec == "sqlite" or spec.startswith("sqlite:///"):
+        path = spec[len("sqlite:///"):] if spec != "sqlite" else ""
+        return SqliteStorage(path or None)
+    raise ValueError(f"Unknown storage: {spec!r}")
+
+
+# ============================================================================
+# Write-behind journal
+# ============================================================================
+# New leads and drafts are appended (and fsynced) to a local journal and
+# acknowledged straight away; a background thread upserts them to
+# Supabase in batches, retrying while the DB is slow or unreachable.
+# Rows carry client-generated ids (their idempotency keys) and the
+# upserts skip rows already there, so a journal replayed after a crash
+# or SIGTERM never creates duplicates. Lead updates made while rows are
+# still pending (statuses, found emails) are journaled behind them and
+# applied in order.
+
+# Conflict target of each journaled table's upsert
+JOURNAL_CONFLICT_KEYS = {
+    "growth_leads": "linkedin_url",
+    "growth_email_drafts": "id",
+}
+
+
+def is_transient_db_error(exc: Exception) -> bool:
+    """
+    True for DB errors worth retrying later.
+
+    Network failures, timeouts, gateway errors and Postgres connection,
+    resource and cancellation errors are transient; constraint and
+    validation errors are not.
+    """
+    if httpx is not None and isinstance(exc, httpx.TransportError):
+        return True
+    # SQLSTATE classes: 08 connection, 40 transaction rollback,
+    # 53 insufficient resources, 57 operator intervention (timeouts)
+    code = str(getattr(exc, "code", None) or "")
+    if code[:2] in ("08", "40", "53", "57"):
+        return True
+    text = str(exc).lower()
+    return any(marker in text for marker in (
+        "timed out", "timeout", "connection", "temporarily unavailable",
+        "502", "503", "504",
+    ))
+
+
+class WriteJournal:
+    """
+    Crash-safe write-behind buffer for growth_leads and draft rows.
+
+    append() writes rows to this process's JSON-lines journal in the
+    state directory with one fsync and returns. A flusher thread upserts
+    pending rows in batches of up to `batch_size`, in append order (so a
+    draft never goes in before its lead), then appends a "done" line for
+    them. Transient errors back off exponentially and retry; a batch the
+    DB rejects for its data is retried row by row, and rows it still
+    refuses are dropped with an error. append_update() and append_rpc()
+    journal an UPDATE ... WHERE id IN (...) or an RPC call, run alone
+    once every entry before it is written.
+
+    Journals of processes that are gone (crashed, killed) are adopted
+    when a new journal opens and their pending rows are sent first.
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+    FLUSH_INTERVAL = 1.0
+    MAX_BACKOFF = 60.0
+
+    def __init__(
+        self,
+        supabase_client: Any,
+        directory: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+    ):
+        self.db = supabase_client
+        self.directory = directory or _state_path("journal")
+        os.makedirs(self.directory, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.stats = {"queued": 0, "written": 0, "duplicates": 0,
+                      "dropped": 0, "replayed": 0, "retries": 0,
+                      "updates": 0}
+        self._pending: List[Dict[str, Any]] = []
+        self._seq = 0
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        # _lock guards the file and _pending; _flush_lock serializes flushes
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        # Locked before it gets its .jsonl name, so no other process
+        # can mistake it for an abandoned journal
+        name = f"{os.getpid()}-{int(time.time() * 1000)}"
+        tmp_path = os.path.join(self.directory, f"{name}.tmp")
+        self._fh = open(tmp_path, "a", encoding="utf-8")
+        if fcntl is not None:
+            fcntl.flock(self._fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self.path = os.path.join(self.directory, f"{name}.jsonl")
+        os.replace(tmp_path, self.path)
+        self._adopt_orphans()
+
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="write-journal", daemon=True
+        )
+        self._thread.start()
+
+    def append(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        """Journal rows for `table` (ids already set); returns once on disk."""
+        if not rows:
+            return
+        with self._lock:
+            self._journal([{"table": table, "row": row} for row in rows])
+            self.stats["queued"] += len(rows)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def append_update(
+        self, table: str, fields: Dict[str, Any], ids: List[str]
+    ) -> None:
+        """Journal `UPDATE table SET fields WHERE id IN ids`."""
+        if ids:
+            with self._lock:
+                self._journal([{"table": table, "update": fields, "ids": ids}])
+
+    def append_rpc(self, table: str, function: str, params: Dict[str, Any]) -> None:
+        """Journal an rpc(function, params) call that writes to `table`."""
+        with self._lock:
+            self._journal([{"table": table, "rpc": function, "params": params}])
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def pending_rows(self, table: str) -> List[Dict[str, Any]]:
+        """Rows for `table` not written yet (replayed ones included)."""
+        with self._lock:
+            return [
+                e["row"] for e in self._pending
+                if e["table"] == table and "row" in e
+            ]
+
+    def flush(self) -> int:
+        """
+        Write all pending rows now; returns how many are still pending.
+
+        Stops at the first transient failure (or while backing off from
+        one) instead of waiting for the DB; those rows stay journaled.
+        """
+        with self._flush_lock:
+            while time.monotonic() >= self._retry_at:
+                batch = self._next_batch()
+                if not batch or not self._write_batch(batch):
+                    break
+        return self.pending()
+
+    def close(self) -> None:
+        """Stop the flusher, make a last attempt, and tidy up the file."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._retry_at = 0.0
+        left = self.flush()
+        with self._lock:
+            self._fh.close()
+        if left:
+            logger.warning(
+                "[WriteJournal] %d entries not written yet; they stay in %s "
+                "and are replayed on the next run", left, self.path,
+            )
+        else:
+            os.remove(self.path)
+
+    def _journal(self, items: List[Dict[str, Any]]) -> None:
+        """Append entries to the file and _pending (caller holds _lock)."""
+        entries = []
+        for item in items:
+            self._seq += 1
+            entries.append(dict(item, seq=self._seq))
+        self._write_lines(entries)
+        self._pending.extend(entries)
+
+    def _write_lines(self, items: List[Dict[str, Any]]) -> None:
+        self._fh.write("".join(
+            json.dumps(item, ensure_ascii=False, default=str) + "\n"
+            for item in items
+        ))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def _adopt_orphans(self) -> None:
+        """Move the pending rows of abandoned journals into this one."""
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if path == self.path or not name.endswith(".jsonl"):
+                continue
+            try:
+                fh = open(path, "r+", encoding="utf-8")
+            except OSError:
+                continue
+            with fh:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        continue  # its process is still running
+                entries = self._read_pending(fh)
+                if entries:
+                    with self._lock:
+                        self._journal([
+                            {k: v for k, v in e.items() if k != "seq"}
+                            for e in entries
+                        ])
+                    self.stats["replayed"] += len(entries)
+                    logger.info(
+                        "[WriteJournal] Replaying %d unwritten rows from %s",
+                        len(entries), name,
+                    )
+                # Only now: a crash before this leaves the rows in both
+                # journals, which the idempotent upserts tolerate
+                os.remove(path)
+
+    @staticmethod
+    def _read_pending(fh: Any) -> List[Dict[str, Any]]:
+        """Entries of a journal file that have no "done" line."""
+        entries: Dict[int, Dict[str, Any]] = {}
+        for line in fh:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue  # torn last line of an interrupted append
+            if "done" in item:
+                for seq in item["done"]:
+                    entries.pop(seq, None)
+            else:
+                entries[item["seq"]] = item
+        return [entries[seq] for seq in sorted(entries)]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if not self._stop.is_set():
+                self.flush()
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Oldest pending rows, all for the same table, or one update."""
+        with self._lock:
+            batch: List[Dict[str, Any]] = []
+            for entry in self._pending:
+                if "row" not in entry:
+                    return batch or [entry]
+                if len(batch) >= self.batch_size or (
+                    batch and entry["table"] != batch[0]["table"]
+                ):
+                    break
+                batch.append(entry)
+            return batch
+
+    def _upsert(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """Upsert rows, skipping existing ones; returns how many went in."""
+        result = (
+            self.db.table(table)
+            .upsert(
+                rows,
+                on_conflict=JOURNAL_CONFLICT_KEYS[table],
+                ignore_duplicates=True,
+            )
+            .execute()
+        )
+        return len(result.data or [])
+
+    def _apply_update(self, entry: Dict[str, Any]) -> None:
+        if "rpc" in entry:
+            self.db.rpc(entry["rpc"], entry["params"]).execute()
+        else:
+            self.db.table(entry["table"]).update(entry["update"]).in_(
+                "id", entry["ids"]
+            ).execute()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        """Write one batch; False if a transient error stopped it."""
+        table = batch[0]["table"]
+        if "row" not in batch[0]:
+            try:
+                self._apply_update(batch[0])
+            except Exception as exc:
+                if is_transient_db_error(exc):
+                    self._back_off(exc)
+                    return False
+                logger.error(
+                    "[WriteJournal] Dropping %s update: %s", table, exc
+                )
+                self._ack(batch, 0, dropped=1)
+                return True
+            self._ack(batch, 0, updates=1)
+            self._backoff = 0.0
+            return True
+        try:
+            written = self._upsert(table, [entry["row"] for entry in batch])
+        except Exception as exc:
+            if is_transient_db_error(exc):
+                self._back_off(exc)
+                return False
+            return self._write_rows(batch, exc)
+        self._ack(batch, written)
+        self._backoff = 0.0
+        return True
+
+    def _write_rows(self, batch: List[Dict[str, Any]], exc: Exception) -> bool:
+        """Retry a rejected batch row by row so only bad rows are dropped."""
+        table = batch[0]["table"]
+        logger.warning(
+            "[WriteJournal] Batch of %d %s rows rejected (%s); "
+            "writing one by one", len(batch), table, exc,
+        )
+        done = 0
+        written = dropped = 0
+        for entry in batch:
+            try:
+                written += self._upsert(table, [entry["row"]])
+            except Exception as row_exc:
+                if is_transient_db_error(row_exc):
+                    self._ack(batch[:done], written, dropped)
+                    self._back_off(row_exc)
+                    return False
+                logger.error(
+                    "[WriteJournal] Dropping %s row %s: %s",
+                    table, entry["row"].get("id"), row_exc,
+                )
+                dropped += 1
+            done += 1
+        self._ack(batch, written, dropped)
+        return True
+
+    def _ack(
+        self,
+        entries: List[Dict[str, Any]],
+        written: int,
+        dropped: int = 0,
+        updates: int = 0,
+    ) -> None:
+        """Mark a written prefix of _pending done in the file."""
+        if not entries:
+            return
+        with self._lock:
+            del self._pending[:len(entries)]
+            if self._pending:
+                self._write_lines([{"done": [e["seq"] for e in entries]}])
+            else:
+                # Nothing left to replay: start the file over
+                self._fh.truncate(0)
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+            self.stats["written"] += written
+            self.stats["dropped"] += dropped
+            self.stats["updates"] += updates
+            self.stats["duplicates"] += len(entries) - written - dropped - updates
+
+    def _back_off(self, exc: Exception) -> None:
+        self.stats["retries"] += 1
+        self._backoff = min(self.MAX_BACKOFF, max(1.0, self._backoff * 2))
+        self._retry_at = time.monotonic() + self._backoff
+        logger.warning(
+            "[WriteJournal] Supabase write failed (%s); %d entries kept in "
+            "the journal, retrying in %.0fs",
+            exc, self.pending(), self._backoff,
+        )
+
+
+# ============================================================================
+# Agent 2: LeadManager
+# ============================================================================
+# GTM: Manages the prospect pipeline from raw discovery to DB insertion.
+
+# Columns read back for each phase (created_at/id drive keyset pagination)
+DRAFT_LEAD_COLUMNS = (
+    "id,full_name,job_title,company,email,linkedin_url,vertical,geo,created_at"
+)
+ENRICH_LEAD_COLUMNS = (
+    "id,full_name,company,vertical,created_at,"
+    "email_enrichment:extra_data->email_enrichment"
+)
+
+
+class LeadManager:
+    """
+    Validates, deduplicates, and inserts leads into Supabase.
+
+    Dedup is based on linkedin_url (unique constraint in DB).
+    Tags each lead with its vertical from VERTICAL_CONFIGS.
+    Leads are written in chunks of `batch_size` with a single
+    upsert(..., on_conflict="linkedin_url", ignore_duplicates=True).
+    With a LeadIndex, the growth_leads dedup check is a local lookup;
+    the DB is only asked about Bloom filter hits. With a ContactIndex,
+    so is the CRM contacts check. With a WriteJournal, new rows get
+    their id here and are journaled instead of upserted; the journal
+    writes them in the background. URLs journaled during the run (or
+    that a dry run would have inserted) count as existing leads, as
+    they may not be in growth_leads yet. Dry runs with a DB dedup
+    against it like real runs; only the writes are skipped.
+
+    Status and email changes made by the pipeline are buffered
+    (queue_status, queue_email, record_enrichment_attempt) and written
+    by flush_updates: one UPDATE ... WHERE id IN (...) per status and
+    one bulk_update_growth_leads RPC (migrations/009) for per-lead
+    values. Leads to draft come from the growth_leads_without_drafts
+    RPC (migrations/010) when the DB has it.
+    """
+
+    DEFAULT_BATCH_SIZE = 50
+    DEFAULT_PAGE_SIZE = 500
+    # Buffered lead updates are flushed at this many leads or this age
+    UPDATE_BATCH_SIZE = 100
+    UPDATE_FLUSH_SECONDS = 30.0
+
+    def __init__(
+        self,
+        supabase_client: Any,
+        dry_run: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        lead_index: Optional[LeadIndex] = None,
+        contact_index: Optional[ContactIndex] = None,
+        journal: Optional[WriteJournal] = None,
+    ):
+        self.db = supabase_client
+        self.dry_run = dry_run
+        self.batch_size = max(1, batch_size)
+        self.lead_index = lead_index
+        self.contact_index = contact_index
+        self.journal = journal
+        self._index_synced = False
+        # linkedin_urls journaled (or dry-run inserted) but possibly
+        # not in growth_leads
+        self._unwritten_urls: set = {
+            row.get("linkedin_url")
+            for row in (journal.pending_rows("growth_leads") if journal else ())
+        }
+        # Buffered updates: {lead id: status}, {lead id: {column: value}}
+        self._pending_status: Dict[str, str] = {}
+        self._pending_rows: Dict[str, Dict[str, Any]] = {}
+        self._pending_since: Optional[float] = None
+        self._bulk_rpc = True
+        self._drafts_rpc = True
+        # Called after each chunk's inserted records have been consumed
+        self.on_batch_done: Optional[Callable[[], None]] = None
+        self.stats = {
+            "processed": 0,
+            "inserted": 0,
+            "duplicates": 0,
+            "errors": 0,
+        }
+
+    def process_leads(
+        self, raw_leads: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Process a stream of raw leads from SafeSearcher.
+
+        A generator: leads are pulled from `raw_leads` in chunks of
+        `batch_size`, each chunk is validated, deduplicated and inserted
+        with one upsert, and its inserted records are yielded straight
+        away. Stats are logged when the stream ends.
+        """
+        try:
+            yield from self._process_lead_stream(raw_leads)
+        finally:
+            if self.lead_index is not None and self._index_synced:
+                self.lead_index.save()
+            self._log_stats()
+
+    def _process_lead_stream(
+        self, raw_leads: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Dedup and insert leads in chunks, yielding inserted records."""
+        chunk: List[Dict[str, Any]] = []
+        for lead in raw_leads:
+            chunk.append(lead)
+            if len(chunk) >= self.batch_size:
+                yield from self._process_chunk(chunk)
+                chunk = []
+                if self.on_batch_done:
+                    self.on_batch_done()
+        if chunk:
+            yield from self._process_chunk(chunk)
+        if self.on_batch_done:
+            self.on_batch_done()
+
+    def _process_chunk(
+        self, leads: List[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Validate and dedup a chunk in memory, then insert it in one upsert.
+
+        Costs at most four round trips per chunk (existing leads, CRM
+        contacts by email and by name, the upsert) instead of four per
+        lead. Stats and log lines per lead are the same as one-by-one
+        inserts: a repeat of a URL earlier in the stream counts as a
+        duplicate, as it would have been found in growth_leads.
+        """
+        valid: List[Dict[str, Any]] = []
+        for lead in leads:
+            self.stats["processed"] += 1
+            linkedin_url = lead.get("linkedin_url", "").strip()
+
+            if not linkedin_url:
+                logger.warning("[LeadManager] Skipping lead with empty LinkedIn URL")
+                self.stats["errors"] += 1
+                continue
+
+            if not self._is_valid_linkedin_url(linkedin_url):
+                logger.warning(
+                    "[LeadManager] Invalid LinkedIn URL: %s", linkedin_url
+                )
+                self.stats["errors"] += 1
+                continue
+            valid.append(dict(lead, linkedin_url=linkedin_url))
+
+        # Check for existing leads in growth_leads (dedup by LinkedIn URL)
+        existing = self._existing_lead_urls(
+            [lead["linkedin_url"] for lead in valid]
+        )
+        existing.update(
+            lead["linkedin_url"] for lead in valid
+            if lead["linkedin_url"] in self._unwritten_urls
+        )
+        # Check if these people already exist in the CRM contacts table
+        candidates = [lead for lead in valid if lead["linkedin_url"] not in existing]
+        known = {id(candidates[i]) for i in self._existing_contacts(candidates)}
+
+        records: List[Dict[str, Any]] = []
+        for lead in valid:
+            linkedin_url = lead["linkedin_url"]
+            if linkedin_url in existing:
+                logger.debug(
+                    "[LeadManager] Duplicate skipped (growth_leads): %s", linkedin_url
+                )
+                self.stats["duplicates"] += 1
+                continue
+            if id(lead) in known:
+                logger.info(
+                    "[LeadManager] Already in CRM contacts, skipping: %s (%s)",
+                    lead.get("full_name", ""), lead.get("email") or "no email",
+                )
+                self.stats["duplicates"] += 1
+                continue
+            existing.add(linkedin_url)
+            records.append(self._build_record(lead))
+
+        if self.dry_run:
+            for record in records:
+                self._unwritten_urls.add(record["linkedin_url"])
                 logger.info(
                     "[LeadManager][DRY-RUN] Would insert: %s (%s) — %s",
                     record["full_name"],
@@ -1369,65 +5727,176 @@ class LeadManager:
                     record["linkedin_url"],
                 )
                 self.stats["inserted"] += 1
-                inserted.append(record)
+                yield record
+            return
+        if not records:
+            return
+
+        if self.journal is not None:
+            for record in records:
+                record["id"] = str(uuid.uuid4())
+            self.journal.append("growth_leads", records)
+            # Not added to the lead index: the journal may still drop a
+            # row, and the next sync picks up the ones written
+            for record in records:
+                self._unwritten_urls.add(record["linkedin_url"])
+                self.stats["inserted"] += 1
+                logger.info(
+                    "[LeadManager] Queued for insert: %s (%s)",
+                    record["full_name"], record["vertical"],
+                )
+                yield record
+            return
+
+        try:
+            result = (
+                self.db.table("growth_leads")
+                .upsert(records, on_conflict="linkedin_url", ignore_duplicates=True)
+                .execute()
+            )
+        except Exception as exc:
+            # One bad row fails the whole statement; retry row by row so
+            # the others still go in and the bad one is reported alone
+            logger.warning(
+                "[LeadManager] Bulk insert of %d leads failed (%s); "
+                "inserting one by one", len(records), exc,
+            )
+            for record in records:
+                yield from self._insert_one(record)
+            return
+
+        # Rows skipped by ON CONFLICT DO NOTHING are not returned
+        inserted = {row.get("linkedin_url"): row for row in result.data or []}
+        for record in records:
+            row = inserted.get(record["linkedin_url"])
+            if self.lead_index is not None:
+                self.lead_index.add(record["linkedin_url"])
+            if row is None:
+                self.stats["duplicates"] += 1
+                logger.debug(
+                    "[LeadManager] Duplicate (DB constraint): %s",
+                    record["linkedin_url"],
+                )
                 continue
+            self.stats["inserted"] += 1
+            logger.info(
+                "[LeadManager] Inserted: %s (%s)",
+                record["full_name"], record["vertical"],
+            )
+            yield row
+
+    def _build_record(self, lead: Dict[str, Any]) -> Dict[str, Any]:
+        """growth_leads row for a validated raw lead."""
+        # Split full_name into first/last
+        first_name, last_name = self._split_name(lead.get("full_name", ""))
+        return {
+            "full_name": lead.get("full_name"),
+            "first_name": first_name,
+            "last_name": last_name,
+            "job_title": lead.get("job_title"),
+            "company": lead.get("company"),
+            "email": lead.get("email"),
+            "linkedin_url": lead["linkedin_url"],
+            "vertical": lead.get("vertical", "DIRECT_B2B"),
+            "source_query": lead.get("source_query"),
+            "geo": lead.get("geo"),
+            "status": "new",
+            "extra_data": {"description": lead.get("description", "")},
+        }
 
-            try:
-                result = (
-                    self.db.table("growth_leads")
-                    .insert(record)
-                    .execute()
+    def _insert_one(self, record: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Insert a single row, yielding it back if it went in."""
+        linkedin_url = record["linkedin_url"]
+        try:
+            result = (
+                self.db.table("growth_leads")
+                .insert(record)
+                .execute()
+            )
+        except Exception as exc:
+            # Handle unique constraint violation as duplicate
+            exc_str = str(exc).lower()
+            if "duplicate" in exc_str or "unique" in exc_str:
+                if self.lead_index is not None:
+                    self.lead_index.add(linkedin_url)
+                self.stats["duplicates"] += 1
+                logger.debug(
+                    "[LeadManager] Duplicate (DB constraint): %s",
+                    linkedin_url,
                 )
-                if result.data:
-                    inserted.append(result.data[0])
-                    self.stats["inserted"] += 1
-                    logger.info(
-                        "[LeadManager] Inserted: %s (%s)",
-                        record["full_name"], record["vertical"],
-                    )
-                else:
-                    self.stats["errors"] += 1
-                    logger.error(
-                        "[LeadManager] Insert returned no data for: %s",
-                        record["linkedin_url"],
-                    )
-            except Exception as exc:
-                # Handle unique constraint violation as duplicate
-                exc_str = str(exc).lower()
-                if "duplicate" in exc_str or "unique" in exc_str:
-                    self.stats["duplicates"] += 1
-                    logger.debug(
-                        "[LeadManager] Duplicate (DB constraint): %s",
-                        linkedin_url,
-                    )
-                else:
-                    self.stats["errors"] += 1
-                    logger.error(
-                        "[LeadManager] DB insert error for %s: %s",
-                        linkedin_url, exc,
-                    )
+            else:
+                self.stats["errors"] += 1
+                logger.error(
+                    "[LeadManager] DB insert error for %s: %s",
+                    linkedin_url, exc,
+                )
+            return
 
-        self._log_stats()
-        return inserted
+        if result.data:
+            self.stats["inserted"] += 1
+            if self.lead_index is not None:
+                self.lead_index.add(linkedin_url)
+            logger.info(
+                "[LeadManager] Inserted: %s (%s)",
+                record["full_name"], record["vertical"],
+            )
+            yield result.data[0]
+        else:
+            self.stats["errors"] += 1
+            logger.error(
+                "[LeadManager] Insert returned no data for: %s",
+                linkedin_url,
+            )
 
     def get_leads_without_drafts(
-        self, vertical: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Fetch leads with status='new' (no draft generated yet)."""
-        try:
+        self,
+        vertical: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream leads with status='new' (no draft generated yet).
+
+        Only the columns the copywriter uses are read, a page at a time.
+        With the growth_leads_without_drafts RPC, leads that already
+        have a draft row are left out too, whatever their status says.
+        """
+        if self.dry_run and not self.db:
+            return
+
+        def rpc_page(after: Optional[Tuple[str, str]]) -> List[Dict[str, Any]]:
+            return self.db.rpc("growth_leads_without_drafts", {
+                "p_vertical": vertical,
+                "p_after_created_at": after[0] if after else None,
+                "p_after_id": after[1] if after else None,
+                "p_limit": page_size,
+            }).execute().data or []
+
+        if self._drafts_rpc:
+            try:
+                first = rpc_page(None)
+            except Exception as exc:
+                logger.warning(
+                    "[LeadManager] growth_leads_without_drafts failed (%s); "
+                    "selecting leads by status (see migrations/010)", exc,
+                )
+                self._drafts_rpc = False
+            else:
+                yield from self._iter_pages(
+                    rpc_page, page_size, "leads without drafts", first=first,
+                )
+                return
+
+        def query() -> Any:
             query = (
                 self.db.table("growth_leads")
-                .select("*")
+                .select(DRAFT_LEAD_COLUMNS)
                 .eq("status", "new")
             )
-            if vertical:
-                query = query.eq("vertical", vertical)
+            return query.eq("vertical", vertical) if vertical else query
 
-            result = query.order("created_at", desc=False).execute()
-            return result.data or []
-        except Exception as exc:
-            logger.error("[LeadManager] Error fetching leads: %s", exc)
-            return []
+        yield from self._iter_pages(
+            self._keyset_pages(query, page_size), page_size, "leads",
+        )
 
     def update_lead_status(self, lead_id: str, status: str) -> None:
         """Update the status of a lead."""
@@ -1447,26 +5916,83 @@ class LeadManager:
             )
 
     def get_leads_without_email(
-        self, vertical: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Fetch leads that don't have an email yet."""
+        self,
+        vertical: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream leads that don't have an email yet.
+
+        Reads only what enrichment needs; of extra_data just the
+        email_enrichment record, so each lead's extra_data holds that
+        key alone (record_enrichment_attempt merges it back).
+        """
         if self.dry_run and not self.db:
-            return []
-        try:
+            return
+
+        def query() -> Any:
             query = (
                 self.db.table("growth_leads")
-                .select("*")
+                .select(ENRICH_LEAD_COLUMNS)
                 .is_("email", "null")
                 .neq("status", "ignored")
             )
-            if vertical:
-                query = query.eq("vertical", vertical)
+            return query.eq("vertical", vertical) if vertical else query
 
-            result = query.order("created_at", desc=False).execute()
-            return result.data or []
-        except Exception as exc:
-            logger.error("[LeadManager] Error fetching leads without email: %s", exc)
-            return []
+        pages = self._keyset_pages(query, page_size)
+        for lead in self._iter_pages(pages, page_size, "leads without email"):
+            record = lead.pop("email_enrichment", None)
+            lead["extra_data"] = {"email_enrichment": record} if record else {}
+            yield lead
+
+    def _iter_pages(
+        self,
+        fetch_page: Callable[[Optional[Tuple[str, str]]], List[Dict[str, Any]]],
+        page_size: int,
+        what: str,
+        first: Optional[List[Dict[str, Any]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Keyset pagination over (created_at, id): each page asks for rows
+        after the last one seen, so pages stay cheap deep into a large
+        backlog and rows updated meanwhile are neither skipped nor
+        repeated. Pages are fetched as the caller consumes them;
+        `first` is a first page the caller already fetched.
+        """
+        after: Optional[Tuple[str, str]] = None
+        rows = first
+        while True:
+            if rows is None:
+                try:
+                    rows = fetch_page(after)
+                except Exception as exc:
+                    logger.error("[LeadManager] Error fetching %s: %s", what, exc)
+                    return
+            yield from rows
+            if len(rows) < page_size:
+                return
+            after = (rows[-1]["created_at"], rows[-1]["id"])
+            rows = None
+
+    @staticmethod
+    def _keyset_pages(
+        query: Callable[[], Any], page_size: int
+    ) -> Callable[[Optional[Tuple[str, str]]], List[Dict[str, Any]]]:
+        """Page fetcher for _iter_pages over a table query."""
+        def fetch_page(after: Optional[Tuple[str, str]]) -> List[Dict[str, Any]]:
+            page = query()
+            if after:
+                created_at, lead_id = (_postgrest_quote(str(v)) for v in after)
+                page = page.or_(
+                    f"created_at.gt.{created_at},"
+                    f"and(created_at.eq.{created_at},id.gt.{lead_id})"
+                )
+            return (
+                page.order("created_at").order("id")
+                .limit(page_size).execute().data or []
+            )
+
+        return fetch_page
 
     def update_lead_email(self, lead_id: str, email: str) -> None:
         """Update a lead's email address."""
@@ -1486,67 +6012,345 @@ class LeadManager:
                 "[LeadManager] Error updating email for %s: %s", lead_id, exc
             )
 
-    def _lead_exists(self, linkedin_url: str) -> bool:
-        """Check if a lead with this LinkedIn URL already exists."""
+    def record_enrichment_attempt(
+        self,
+        lead: Dict[str, Any],
+        queries: List[str],
+        email: Optional[str],
+    ) -> None:
+        """
+        Record an email enrichment attempt in the lead's extra_data.
+
+        Stores the attempt count, timestamps, queries tried and outcome
+        under extra_data["email_enrichment"]; failures also get a
+        next_attempt_at from the exponential retry schedule.
+        """
+        now = datetime.now(timezone.utc)
+        record = dict(enrichment_record(lead))
+        attempts = record.get("attempts", 0) + 1
+        record.update({
+            "attempts": attempts,
+            "last_attempt_at": now.isoformat(),
+            "outcome": "found" if email else "not_found",
+            "queries": (record.get("queries", []) + queries)[-ENRICH_MAX_QUERIES_KEPT:],
+        })
+        if email:
+            record.pop("next_attempt_at", None)
+        else:
+            record["next_attempt_at"] = next_enrichment_attempt(attempts, now).isoformat()
+
+        extra = dict(lead.get("extra_data") or {})
+        extra["email_enrichment"] = record
+        lead["extra_data"] = extra
         if self.dry_run:
-            return False
+            logger.debug(
+                "[LeadManager][DRY-RUN] Enrichment attempt %d for %s: %s",
+                attempts, lead.get("id"), record["outcome"],
+            )
+            return
+        self._queue_row(lead["id"], extra_data={"email_enrichment": record})
+
+    def queue_status(self, lead_id: str, status: str) -> None:
+        """Buffer a status change; see flush_updates."""
+        if self.dry_run:
+            logger.info(
+                "[LeadManager][DRY-RUN] Would update lead %s → %s",
+                lead_id, status,
+            )
+            return
+        self._pending_status[lead_id] = status
+        self._maybe_flush()
+
+    def queue_email(self, lead_id: str, email: str) -> None:
+        """Buffer a found email; see flush_updates."""
+        if self.dry_run:
+            logger.info(
+                "[LeadManager][DRY-RUN] Would set email for %s → %s",
+                lead_id, email,
+            )
+            return
+        self._queue_row(lead_id, email=email)
+
+    def _queue_row(self, lead_id: str, **fields: Any) -> None:
+        pending = self._pending_rows.setdefault(lead_id, {})
+        if "extra_data" in fields and "extra_data" in pending:
+            fields["extra_data"] = dict(pending["extra_data"], **fields["extra_data"])
+        pending.update(fields)
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        now = time.monotonic()
+        if self._pending_since is None:
+            self._pending_since = now
+        pending = len(self._pending_status) + len(self._pending_rows)
+        if (
+            pending >= self.UPDATE_BATCH_SIZE
+            or now - self._pending_since >= self.UPDATE_FLUSH_SECONDS
+        ):
+            self.flush_updates()
+
+    def flush_updates(self) -> None:
+        """
+        Write all buffered updates.
+
+        Status changes are grouped into one UPDATE ... WHERE id IN (...)
+        per status; emails and extra_data keys go in one
+        bulk_update_growth_leads call, which merges extra_data into the
+        stored object. Without that RPC (migration 009 not applied) they
+        fall back to one update per lead, after reading the extra_data
+        to merge into.
+
+        Journaled leads are written first, since the updates may refer
+        to them; while the journal can't reach the DB, the updates are
+        journaled behind them instead, so they survive to the next run.
+        """
+        journal_pending = self.journal is not None and self.journal.flush()
+        statuses, rows = self._pending_status, self._pending_rows
+        self._pending_status, self._pending_rows = {}, {}
+        self._pending_since = None
+        if not statuses and not rows:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        if journal_pending:
+            self._journal_updates(statuses, rows, now)
+            return
+
+        by_status: Dict[str, List[str]] = {}
+        for lead_id, status in statuses.items():
+            by_status.setdefault(status, []).append(lead_id)
+        for status, ids in by_status.items():
+            try:
+                self.db.table("growth_leads").update(
+                    {"status": status, "updated_at": now}
+                ).in_("id", ids).execute()
+                logger.debug(
+                    "[LeadManager] %d leads → %s", len(ids), status,
+                )
+            except Exception as exc:
+                logger.error(
+                    "[LeadManager] Error updating %d leads → %s: %s",
+                    len(ids), status, exc,
+                )
+
+        if rows and self._bulk_rpc:
+            try:
+                self.db.rpc("bulk_update_growth_leads", {
+                    "p_updates": [
+                        dict(fields, id=lead_id) for lead_id, fields in rows.items()
+                    ],
+                }).execute()
+                logger.debug("[LeadManager] Bulk-updated %d leads", len(rows))
+                rows = {}
+            except Exception as exc:
+                logger.warning(
+                    "[LeadManager] bulk_update_growth_leads failed (%s); "
+                    "updating leads one by one (see migrations/009)", exc,
+                )
+                self._bulk_rpc = False
+        stored: Dict[str, Dict[str, Any]] = {}
+        merge_ids = [
+            lead_id for lead_id, fields in rows.items() if "extra_data" in fields
+        ]
+        if merge_ids:
+            try:
+                result = (
+                    self.db.table("growth_leads")
+                    .select("id,extra_data")
+                    .in_("id", merge_ids)
+                    .execute()
+                )
+                stored = {
+                    row["id"]: row.get("extra_data") or {}
+                    for row in result.data or []
+                }
+            except Exception as exc:
+                logger.error("[LeadManager] Error reading extra_data: %s", exc)
+        for lead_id, fields in rows.items():
+            if "extra_data" in fields:
+                if lead_id not in stored:
+                    # Writing the patch alone would wipe the other keys
+                    fields = {k: v for k, v in fields.items() if k != "extra_data"}
+                    if not fields:
+                        continue
+                else:
+                    fields = dict(
+                        fields, extra_data=dict(stored[lead_id], **fields["extra_data"])
+                    )
+            try:
+                self.db.table("growth_leads").update(
+                    dict(fields, updated_at=now)
+                ).eq("id", lead_id).execute()
+            except Exception as exc:
+                logger.error(
+                    "[LeadManager] Error updating lead %s: %s", lead_id, exc
+                )
+
+    def _journal_updates(
+        self,
+        statuses: Dict[str, str],
+        rows: Dict[str, Dict[str, Any]],
+        now: str,
+    ) -> None:
+        """Queue buffered updates in the journal, behind the rows."""
+        logger.warning(
+            "[LeadManager] Journaled leads not written yet; journaling %d "
+            "lead updates behind them",
+            len(statuses.keys() | rows.keys()),
+        )
+        by_status: Dict[str, List[str]] = {}
+        for lead_id, status in statuses.items():
+            by_status.setdefault(status, []).append(lead_id)
+        for status, ids in by_status.items():
+            self.journal.append_update(
+                "growth_leads", {"status": status, "updated_at": now}, ids
+            )
+        if rows and self._bulk_rpc:
+            self.journal.append_rpc("growth_leads", "bulk_update_growth_leads", {
+                "p_updates": [
+                    dict(fields, id=lead_id) for lead_id, fields in rows.items()
+                ],
+            })
+            return
+        for lead_id, fields in rows.items():
+            # Without the RPC extra_data can't be merged later: a patch
+            # written alone would wipe the other keys
+            fields = {k: v for k, v in fields.items() if k != "extra_data"}
+            if fields:
+                self.journal.append_update(
+                    "growth_leads", dict(fields, updated_at=now), [lead_id]
+                )
+
+    def _existing_lead_urls(self, linkedin_urls: List[str]) -> set:
+        """The subset of `linkedin_urls` already in growth_leads."""
+        # Dry runs still read (only writes are skipped) when there is a DB
+        if not linkedin_urls or self.db is None:
+            return set()
+        candidates = list(dict.fromkeys(linkedin_urls))
+        if self._sync_lead_index():
+            candidates = [url for url in candidates if url in self.lead_index]
+            if self.lead_index.exact or not candidates:
+                return set(candidates)
         try:
             result = (
                 self.db.table("growth_leads")
-                .select("id")
-                .eq("linkedin_url", linkedin_url)
-                .limit(1)
+                .select("linkedin_url")
+                .in_("linkedin_url", candidates)
                 .execute()
             )
-            return bool(result.data)
+            return {row["linkedin_url"] for row in result.data or []}
         except Exception as exc:
             logger.error("[LeadManager] Dedup check error: %s", exc)
+            return set()
+
+    def _sync_lead_index(self) -> bool:
+        """
+        Bring the lead index up to date on first use; False if there is
+        no index (or its sync failed and dedup falls back to the DB).
+        """
+        if self.lead_index is None:
             return False
+        if not self._index_synced:
+            try:
+                self.lead_index.sync(self.db)
+            except Exception as exc:
+                logger.error(
+                    "[LeadManager] Lead index sync failed, checking the DB "
+                    "instead: %s", exc,
+                )
+                self.lead_index = None
+                return False
+            self._index_synced = True
+        return True
 
-    def _contact_exists(self, full_name: str, email: Optional[str]) -> bool:
-        """Check if a contact with this name or email already exists in the CRM."""
-        if self.dry_run:
+    def _refresh_contact_index(self) -> bool:
+        """
+        Load or top up the contact index when stale; False if there is
+        no index (or loading failed and the check falls back to the DB).
+        """
+        if self.contact_index is None:
             return False
+        if self.contact_index.stale():
+            try:
+                self.contact_index.refresh(self.db)
+            except Exception as exc:
+                logger.error(
+                    "[LeadManager] Contact index refresh failed, checking "
+                    "the DB instead: %s", exc,
+                )
+                self.contact_index = None
+                return False
+        return True
+
+    def _existing_contacts(self, leads: List[Dict[str, Any]]) -> set:
+        """
+        Indexes of `leads` already in the CRM contacts table.
+
+        Uses the ContactIndex when there is one. Otherwise matches by
+        email first (most reliable), then by first + last name
+        (case-insensitive), one query each for the whole chunk.
+        """
+        if not leads or self.db is None:
+            return set()
+        if self._refresh_contact_index():
+            return {
+                i for i, lead in enumerate(leads)
+                if self.contact_index.match(lead.get("full_name"), lead.get("email"))
+            }
+        known = set()
         try:
-            # Check by email first (most reliable)
-            if email:
+            emails = {lead["email"] for lead in leads if lead.get("email")}
+            if emails:
                 result = (
                     self.db.table("contacts")
-                    .select("id")
-                    .eq("email", email)
-                    .limit(1)
+                    .select("email")
+                    .in_("email", sorted(emails))
                     .execute()
                 )
-                if result.data:
-                    return True
+                found = {row.get("email") for row in result.data or []}
+                known.update(
+                    i for i, lead in enumerate(leads)
+                    if lead.get("email") and lead["email"] in found
+                )
 
-            # Check by full name (first_name + last_name)
-            if full_name:
-                first_name, last_name = self._split_name(full_name)
+            names = {}
+            for i, lead in enumerate(leads):
+                if i in known:
+                    continue
+                first_name, last_name = self._split_name(lead.get("full_name", ""))
                 if first_name and last_name:
-                    result = (
-                        self.db.table("contacts")
-                        .select("id")
-                        .ilike("first_name", first_name)
-                        .ilike("last_name", last_name)
-                        .limit(1)
-                        .execute()
+                    names[i] = (first_name, last_name)
+            if names:
+                result = (
+                    self.db.table("contacts")
+                    .select("first_name,last_name")
+                    .or_(",".join(
+                        "and(first_name.ilike.%s,last_name.ilike.%s)" % (
+                            _postgrest_quote(first), _postgrest_quote(last),
+                        )
+                        for first, last in dict.fromkeys(names.values())
+                    ))
+                    .execute()
+                )
+                found_names = {
+                    (
+                        (row.get("first_name") or "").lower(),
+                        (row.get("last_name") or "").lower(),
                     )
-                    if result.data:
-                        return True
-
-            return False
+                    for row in result.data or []
+                }
+                known.update(
+                    i for i, (first, last) in names.items()
+                    if (first.lower(), last.lower()) in found_names
+                )
+            return known
         except Exception as exc:
             logger.error("[LeadManager] CRM contacts dedup check error: %s", exc)
-            return False
+            return known
 
     @staticmethod
     def _is_valid_linkedin_url(url: str) -> bool:
         """Basic validation for LinkedIn profile URLs."""
-        return bool(re.match(
-            r"https?://(www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+/?",
-            url,
-        ))
+        return bool(LINKEDIN_PROFILE_URL_RE.match(url))
 
     @staticmethod
     def _split_name(full_name: str) -> Tuple[Optional[str], Optional[str]]:
@@ -1602,14 +6406,25 @@ class ContextualCopywriter:
     ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages"
     ANTHROPIC_MODEL = "claude-sonnet-4-5-20250929"
 
-    def __init__(self, supabase_client: Any, dry_run: bool = False):
+    def __init__(
+        self,
+        supabase_client: Any,
+        dry_run: bool = False,
+        http_client: Any = None,
+        journal: Optional[WriteJournal] = None,
+    ):
         self.db = supabase_client
         self.dry_run = dry_run
+        self.journal = journal
         self.anthropic_key = (
             os.environ.get("ANTHROPIC_API_KEY")
             or os.environ.get("VITE_ANTHROPIC_API_KEY")
         )
         self.use_ai = bool(self.anthropic_key and httpx)
+        # Kept open across drafts so the API connection is reused
+        self.http = http_client
+        if self.use_ai and self.http is None:
+            self.http = httpx.Client(timeout=30.0)
         if self.use_ai:
             logger.info("[Copywriter] AI mode enabled — emails will be generated with Claude")
         else:
@@ -1625,14 +6440,16 @@ class ContextualCopywriter:
 
     def generate_drafts_for_vertical(
         self,
-        leads: List[Dict[str, Any]],
+        leads: Iterable[Dict[str, Any]],
         vertical: Optional[str] = None,
+        on_lead_done: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Generate email drafts for a list of leads.
+        Generate email drafts for a list (or stream) of leads.
 
         Each lead must have: full_name, company, job_title, vertical, geo.
         Missing fields get visible placeholders: [NOMBRE], [EMPRESA], etc.
+        `on_lead_done(lead)` is called after each lead has been handled.
         """
         drafts_created = []
 
@@ -1659,6 +6476,8 @@ class ContextualCopywriter:
                     lead.get("linkedin_url"), exc,
                 )
                 self.stats["errors"] += 1
+            if on_lead_done:
+                on_lead_done(lead)
 
         self._log_stats()
         return drafts_created
@@ -1740,6 +6559,15 @@ class ContextualCopywriter:
             )
             return draft_record
 
+        if self.journal is not None:
+            draft_record["id"] = str(uuid.uuid4())
+            self.journal.append("growth_email_drafts", [draft_record])
+            logger.info(
+                "[Copywriter] Draft queued (%s) for %s (%s) — %s [%s]",
+                generation_method, name, company, vertical, lang,
+            )
+            return draft_record
+
         try:
             result = (
                 self.db.table("growth_email_drafts")
@@ -1884,7 +6712,7 @@ Recuerda:
 - Si la empresa es conocida en el sector, menciónala de forma natural."""
 
         try:
-            response = httpx.post(
+            response = self.http.post(
                 self.ANTHROPIC_API_URL,
                 headers={
                     "Content-Type": "application/json",
@@ -1898,7 +6726,6 @@ Recuerda:
                     "system": system_prompt,
                     "messages": [{"role": "user", "content": user_prompt}],
                 },
-                timeout=30.0,
             )
 
             if response.status_code != 200:
@@ -1954,6 +6781,81 @@ Recuerda:
         )
 
 
+# ============================================================================
+# Run checkpoints
+# ============================================================================
+# A full run is throttled to a few searches per minute, so a crash halfway
+# used to throw away tens of minutes of budget. GrowthPipeline saves its
+# position after every query, enrichment batch and draft to
+# .growth_state/runs/<run id>.json; --resume <run id> picks up there.
+
+class RunCheckpoint:
+    """
+    Progress of one pipeline run, saved atomically as JSON.
+
+    `state` holds the run's configuration (so a resume repeats it
+    exactly), the current phase, completed phases, queries done per
+    vertical, budget spent, leads already enriched/drafted, running
+    result counts and — in full dry-run mode — the pending leads the
+    draft phase still needs.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, path: Optional[str] = None):
+        self.run_id = run_id or "%s-%s" % (
+            datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S"),
+            os.urandom(2).hex(),
+        )
+        self.path = path or _state_path("runs", f"{self.run_id}.json")
+        self.state: Dict[str, Any] = {
+            "run_id": self.run_id,
+            "status": "running",
+            "config": {},
+            "phase": None,
+            "phases_done": [],
+            "queries_done": {},
+            "verticals_done": [],
+            "searches_done": 0,
+            "budget": {"granted": {}, "spent": {}},
+            "enrich_attempted_ids": [],
+            "drafted_ids": [],
+            "counts": {},
+            "pending_leads": [],
+        }
+
+    @classmethod
+    def load(cls, run_id: str) -> "RunCheckpoint":
+        """Load a saved run; raises FileNotFoundError if there is none."""
+        checkpoint = cls(run_id)
+        with open(checkpoint.path, encoding="utf-8") as fh:
+            checkpoint.state.update(json.load(fh))
+        return checkpoint
+
+    def save(self) -> None:
+        self.state["updated_at"] = datetime.now(timezone.utc).isoformat()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(self.state, fh, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.path)
+
+    def phase_done(self, phase: str) -> bool:
+        return phase in self.state["phases_done"]
+
+    def start_phase(self, phase: str) -> None:
+        self.state["phase"] = phase
+        self.save()
+
+    def finish_phase(self, phase: str) -> None:
+        self.state["phases_done"].append(phase)
+        self.save()
+
+    def queries_done(self, key: str) -> List[str]:
+        return self.state["queries_done"].get(key, [])
+
+    def mark_query(self, key: str, query: str) -> None:
+        self.state["queries_done"].setdefault(key, []).append(query)
+
+
 # ============================================================================
 # Pipeline Orchestrator
 # ============================================================================
@@ -1975,24 +6877,194 @@ class GrowthPipeline:
         mode: str = "full",
         dry_run: bool = False,
         max_searches: int = 20,
+        concurrency: int = SafeSearcher.MAX_CONCURRENT_SEARCHES,
+        search_cache: bool = True,
+        cache_ttl_hours: float = SearchCache.DEFAULT_TTL_HOURS,
+        cache_max_entries: int = SearchCache.DEFAULT_MAX_ENTRIES,
+        search_backend: str = "google",
+        search_url: Optional[str] = None,
+        record_dir: Optional[str] = None,
+        replay_dir: Optional[str] = None,
+        search_rate_limit: Optional[bool] = None,
+        query_scheduler: bool = True,
+        compile_queries: bool = False,
+        enrich_batch_size: int = 1,
+        insert_batch_size: int = LeadManager.DEFAULT_BATCH_SIZE,
+        read_page_size: int = LeadManager.DEFAULT_PAGE_SIZE,
+        lead_index: bool = True,
+        contact_index: bool = True,
+        fetch_pages: bool = False,
+        page_max_bytes: int = PageFetcher.DEFAULT_MAX_BYTES,
+        page_domain_delay: float = PageFetcher.DEFAULT_DOMAIN_DELAY,
+        http_max_connections: int = HttpClients.DEFAULT_MAX_CONNECTIONS,
+        http_max_keepalive: int = HttpClients.DEFAULT_MAX_KEEPALIVE,
+        http_timeout: Optional[float] = None,
+        write_behind: bool = True,
+        storage: str = "supabase",
+        budget_weights: Optional[Dict[str, float]] = None,
+        budget_min_share: int = BudgetAllocator.DEFAULT_MIN_SHARE,
+        enrich_share: float = BudgetAllocator.DEFAULT_ENRICH_SHARE,
+        work_queue: Optional[str] = None,
+        sweep: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = 300,
+        checkpoint: Optional[RunCheckpoint] = None,
+        gazetteer_path: Optional[str] = None,
     ):
         self.vertical = vertical
         self.mode = mode
         self.dry_run = dry_run
         self.max_searches = max_searches
+        self.compile_queries = compile_queries
+        self.enrich_batch_size = max(1, enrich_batch_size)
+        self.read_page_size = max(1, read_page_size)
+        self.budget_weights = budget_weights or {}
+        self.budget_min_share = budget_min_share
+        self.enrich_share = enrich_share
+        self.budget: Optional[BudgetAllocator] = None
+
+        if gazetteer_path:
+            try:
+                GAZETTEER.add(Gazetteer.load(gazetteer_path))
+            except (OSError, ValueError, KeyError) as exc:
+                logger.error("Cannot load gazetteer %s: %s", gazetteer_path, exc)
+                sys.exit(1)
+
+        # Connection pools shared by the agents, closed at the end of run()
+        self.http: Optional[HttpClients] = None
+        if httpx is not None:
+            self.http = HttpClients(
+                max_connections=http_max_connections,
+                max_keepalive=http_max_keepalive,
+                timeout=http_timeout,
+            )
 
-        # Initialize Supabase client
+        # Initialize the DB client (Supabase, or a local SQLite file)
         _load_env()
         if dry_run:
             logger.info("=== DRY RUN MODE — No database writes ===")
+        if dry_run and storage == "supabase":
             self.db = self._get_db_client_or_none()
         else:
-            self.db = _get_supabase_client()
+            try:
+                self.db = build_storage(storage, self.http)
+            except ValueError as exc:
+                logger.error("%s", exc)
+                sys.exit(1)
+        # Dedup lookups against a local file are already cheap
+        local_db = isinstance(self.db, SqliteStorage)
+        if local_db:
+            logger.info("Storage: SQLite %s", self.db.path)
 
         # Initialize agents
-        self.searcher = SafeSearcher(max_searches=max_searches)
-        self.lead_manager = LeadManager(self.db, dry_run=dry_run)
-        self.copywriter = ContextualCopywriter(self.db, dry_run=dry_run)
+        backend = build_search_backend(
+            search_backend,
+            url=search_url,
+            record_dir=record_dir,
+            replay_dir=replay_dir,
+            rate_limited=search_rate_limit,
+            http=self.http,
+        )
+        # Recording must see real engine responses and replaying is
+        # already local, so both bypass the cache.
+        if search_cache and (record_dir or replay_dir):
+            logger.info("Search cache disabled while recording/replaying")
+            search_cache = False
+        cache = (
+            SearchCache(ttl_hours=cache_ttl_hours, max_entries=cache_max_entries)
+            if search_cache else None
+        )
+        page_fetcher = None
+        if fetch_pages and httpx is None:
+            logger.warning("httpx not installed; --fetch-pages disabled")
+        elif fetch_pages:
+            page_fetcher = PageFetcher(
+                max_bytes=page_max_bytes,
+                domain_delay=page_domain_delay,
+                cache=PageCache() if search_cache else None,
+                client=self.http.get(
+                    "pages",
+                    follow_redirects=True,
+                    headers={"User-Agent": PageFetcher.USER_AGENT},
+                ),
+            )
+        self.searcher = SafeSearcher(
+            max_searches=max_searches,
+            concurrency=concurrency,
+            cache=cache,
+            backend=backend,
+            scheduler=QueryScheduler(
+                results_per_query=SafeSearcher.RESULTS_PER_QUERY
+            ) if query_scheduler else None,
+            page_fetcher=page_fetcher,
+        )
+        # Leads and drafts go through the journal (replaying any rows an
+        # earlier run left unwritten)
+        self.journal = (
+            WriteJournal(self.db) if write_behind and not dry_run else None
+        )
+        self.lead_manager = LeadManager(
+            self.db,
+            dry_run=dry_run,
+            journal=self.journal,
+            batch_size=insert_batch_size,
+            lead_index=(
+                LeadIndex(database_url=_supabase_url())
+                if lead_index and not dry_run and not local_db
+                else None
+            ),
+            contact_index=(
+                ContactIndex() if contact_index and not dry_run and not local_db
+                else None
+            ),
+        )
+        self.lease_seconds = lease_seconds
+        self.queue: Optional[WorkQueue] = None
+        if work_queue:
+            try:
+                self.queue = build_work_queue(
+                    work_queue, db=self.db, sweep=sweep,
+                    worker_id=worker_id, lease_seconds=lease_seconds,
+                )
+            except ValueError as exc:
+                logger.error("%s", exc)
+                sys.exit(1)
+            logger.info(
+                "Work queue: %s, sweep %s, worker %s",
+                work_queue, self.queue.sweep, self.queue.worker_id,
+            )
+        self._dry_run_leads: List[Dict[str, Any]] = []
+        self.copywriter = ContextualCopywriter(
+            self.db,
+            dry_run=dry_run,
+            http_client=self.http.get("anthropic") if self.http else None,
+            journal=self.journal,
+        )
+
+        self.checkpoint = checkpoint
+        self.counts = {
+            "leads_found": 0,
+            "leads_inserted": 0,
+            "leads_enriched": 0,
+            "drafts_created": 0,
+        }
+        # Budget key the searches in progress are charged to, and the
+        # searches_done value they were last charged up to
+        self._budget_key: Optional[str] = None
+        self._budget_mark = 0
+        # Checkpoint key for completed queries (vertical or "compiled")
+        self._query_scope: Optional[str] = None
+        self._drafts_mark = 0
+        # Queries whose leads are pulled but maybe not yet inserted
+        self._unflushed_queries: List[Tuple[Optional[str], str]] = []
+        self.searcher.on_query_done = self._on_query_done
+        self.lead_manager.on_batch_done = self._on_leads_flushed
+
+    @classmethod
+    def resume(cls, run_id: str) -> "GrowthPipeline":
+        """Rebuild an interrupted run from its checkpoint."""
+        checkpoint = RunCheckpoint.load(run_id)
+        return cls(**checkpoint.state["config"], checkpoint=checkpoint)
 
     def run(self) -> Dict[str, Any]:
         """Execute the pipeline based on the configured mode."""
@@ -2009,22 +7081,56 @@ class GrowthPipeline:
             "mode": self.mode,
             "vertical": self.vertical,
             "dry_run": self.dry_run,
-            "leads_found": 0,
-            "leads_inserted": 0,
-            "leads_enriched": 0,
-            "drafts_created": 0,
         }
 
         verticals = self._resolve_verticals()
+        self.budget = BudgetAllocator(
+            self.max_searches,
+            {v: len(VERTICAL_CONFIGS[v]["search_queries"]) for v in verticals},
+            weights=self.budget_weights,
+            min_share=self.budget_min_share,
+            enrich_share=self.enrich_share if self.mode == "full" else 0.0,
+        )
+        checkpoint = self.checkpoint
+        if checkpoint:
+            self._restore_checkpoint()
 
-        if self.mode in ("search", "full"):
-            results.update(self._run_search_phase(verticals))
-
-        if self.mode in ("enrich", "full"):
-            results.update(self._run_enrich_phase(verticals))
-
-        if self.mode in ("draft", "full"):
-            results.update(self._run_draft_phase(verticals))
+        try:
+            for phase, modes, run_phase in (
+                ("search", ("search", "full"), self._run_search_phase),
+                ("enrich", ("enrich", "full"), self._run_enrich_phase),
+                ("draft", ("draft", "full"), self._run_draft_phase),
+            ):
+                if self.mode not in modes:
+                    continue
+                if checkpoint and checkpoint.phase_done(phase):
+                    logger.info(
+                        "[Pipeline] Phase %s already done in run %s",
+                        phase, checkpoint.run_id,
+                    )
+                    continue
+                if checkpoint:
+                    checkpoint.start_phase(phase)
+                run_phase(verticals)
+                self.lead_manager.flush_updates()
+                if checkpoint:
+                    self._save_checkpoint()
+                    checkpoint.finish_phase(phase)
+            if checkpoint:
+                checkpoint.state["status"] = "complete"
+                self._save_checkpoint()
+        finally:
+            # Also on errors, so leads already drafted/enriched are marked
+            self.lead_manager.flush_updates()
+            if self.journal:
+                self.journal.close()
+            results.update(self.counts)
+            results.update(self._search_stats())
+            self.searcher.close()
+            if self.queue:
+                self.queue.close()
+            if self.http:
+                self.http.close()
 
         self._print_summary(results)
         return results
@@ -2034,108 +7140,499 @@ class GrowthPipeline:
     ) -> Dict[str, int]:
         """Execute search + lead insertion."""
         logger.info("\n--- Phase 1: Search & Lead Insertion ---")
-        total_found = 0
-        total_inserted = 0
+        checkpoint = self.checkpoint
 
-        for v in verticals:
-            if self.searcher.searches_done >= self.max_searches:
-                break
-            logger.info("\n[Pipeline] Searching vertical: %s", v)
-            raw_leads = self.searcher.search_vertical(v)
-            total_found += len(raw_leads)
+        if self.queue:
+            if self.compile_queries:
+                logger.warning(
+                    "[Pipeline] --compile-queries is ignored with --work-queue"
+                )
+            self._run_queued_search(verticals)
+        elif self.compile_queries:
+            # Compiled queries span verticals, so they share one pool
+            compiled = QueryCompiler().compile(verticals)
+            logger.info("\n[Pipeline] Searching compiled queries")
+            self._use_budget(
+                "compiled queries",
+                self.budget.remaining - self.budget.enrich_reserve,
+            )
+            self._query_scope = "compiled"
+            self._insert_stream(self.searcher.search_compiled(
+                compiled,
+                skip=checkpoint.queries_done("compiled") if checkpoint else (),
+            ))
+            self._use_budget(None, None)
+        else:
+            for v in verticals:
+                if checkpoint and v in checkpoint.state["verticals_done"]:
+                    continue
+                # With a cache, an exhausted budget can still serve cached pages
+                if (
+                    self.searcher.searches_done >= self.max_searches
+                    and not self.searcher.cache
+                ):
+                    break
+                if v in self.budget.granted:
+                    # Resumed mid-vertical: only what is left of its grant
+                    grant = self.budget.granted[v] - self.budget.spent.get(v, 0)
+                else:
+                    grant = self.budget.grant(v)
+                self._use_budget(v, grant)
+                self._query_scope = v
+                logger.info(
+                    "\n[Pipeline] Searching vertical: %s (budget: %d searches)",
+                    v, self.searcher.search_limit - self.searcher.searches_done,
+                )
+                self._insert_stream(self.searcher.search_vertical(
+                    v, skip=checkpoint.queries_done(v) if checkpoint else (),
+                ))
+                self._use_budget(None, None)
+                if checkpoint:
+                    checkpoint.state["verticals_done"].append(v)
+                    self._save_checkpoint()
+        self._query_scope = None
+
+        return {
+            "leads_found": self.counts["leads_found"],
+            "leads_inserted": self.counts["leads_inserted"],
+        }
+
+    def _run_queued_search(self, verticals: List[str]) -> None:
+        """
+        Enqueue every vertical's queries, then search claimed ones.
+
+        Queries are enqueued interleaved across verticals so all of them
+        progress while workers drain the queue. Each worker claims at
+        most as many rows as it has budget left for; rows of a worker
+        that dies mid-search are reclaimed once their lease expires.
+        """
+        pairs = [
+            (i, v, q)
+            for v in verticals
+            for i, q in enumerate(VERTICAL_CONFIGS[v]["search_queries"])
+        ]
+        pairs.sort(key=lambda pair: pair[0])
+        added = self.queue.enqueue("search", [
+            (
+                f"{v}|{search_key(q, SafeSearcher.RESULTS_PER_QUERY)}",
+                {"vertical": v, "query": q},
+            )
+            for _, v, q in pairs
+        ])
+        logger.info(
+            "\n[Pipeline] Work queue sweep %s: %d new search tasks",
+            self.queue.sweep, added,
+        )
+
+        self._use_budget(
+            "work queue", self.budget.remaining - self.budget.enrich_reserve
+        )
+        keeper = LeaseKeeper(self.queue, self.lease_seconds)
+        try:
+            while True:
+                room = self.searcher.search_limit - self.searcher.searches_done
+                claimed = self.queue.claim(
+                    "search", min(self.searcher.concurrency, room)
+                )
+                if not claimed:
+                    break
+                ids = [row["id"] for row in claimed]
+                keeper.hold(ids)
+                self._insert_stream(self.searcher.search_tasks([
+                    (row["payload"]["vertical"], row["payload"]["query"])
+                    for row in claimed
+                ]))
+                failed = 0
+                for row in claimed:
+                    # Errored or rate-limited searches go back to the queue
+                    if row["payload"]["query"] in self.searcher.failed_queries:
+                        self.queue.finish(row["id"], status="pending")
+                        failed += 1
+                    else:
+                        self.queue.finish(row["id"])
+                keeper.release(ids)
+                if failed:
+                    # Reclaiming them now would only spend budget on an
+                    # engine that is still failing; a later run retries
+                    logger.warning(
+                        "[Pipeline] %d queued searches failed; "
+                        "left pending for the next sweep", failed,
+                    )
+                    break
+        finally:
+            # Unfinished rows keep their lease until it expires
+            keeper.stop()
+            self._use_budget(None, None)
 
-            inserted = self.lead_manager.process_leads(raw_leads)
-            total_inserted += len(inserted)
+    def _insert_stream(self, leads: Iterator[Dict[str, Any]]) -> None:
+        """
+        Push a searcher lead stream through LeadManager.
+
+        Leads are deduped and inserted in chunks of --insert-batch-size
+        as they are parsed, while the searcher's other queries are still
+        in flight.
+        """
+        for record in self.lead_manager.process_leads(
+            self._count_found(leads)
+        ):
+            self.counts["leads_inserted"] += 1
+            if not self.dry_run:
+                # Dry-run "inserts" are not real new leads (without a DB
+                # nothing is deduped), so they stay out of query_yield
+                self.searcher.record_new_lead(record.get("source_query"))
+            if self.dry_run and self.mode == "full":
+                # No DB to read back from in the draft phase
+                self._dry_run_leads.append(record)
+
+    def _count_found(
+        self, leads: Iterator[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        # Counted as they stream so checkpoints taken mid-phase are exact
+        for lead in leads:
+            self.counts["leads_found"] += 1
+            yield lead
+
+    def _use_budget(self, key: Optional[str], searches: Optional[int]) -> None:
+        """
+        Charge the searches made so far, then let `searches` more be
+        charged to budget `key` (None/None closes the window).
+        """
+        self._charge_budget()
+        self._budget_key = key
+        if key and searches is not None:
+            self.budget.granted.setdefault(key, searches)
+        self.searcher.limit_budget(searches)
+
+    def _charge_budget(self) -> None:
+        if self._budget_key:
+            self.budget.spend(
+                self._budget_key,
+                self.searcher.searches_done - self._budget_mark,
+            )
+        self._budget_mark = self.searcher.searches_done
+
+    def _on_query_done(self, query: str) -> None:
+        """
+        Charge the query's search; it is checkpointed once LeadManager
+        has inserted the chunk holding its last leads.
+        """
+        self._charge_budget()
+        if self.checkpoint:
+            self._unflushed_queries.append((self._query_scope, query))
 
-        return {"leads_found": total_found, "leads_inserted": total_inserted}
+    def _on_leads_flushed(self) -> None:
+        """Checkpoint the queries whose leads are now all inserted."""
+        if not self.checkpoint:
+            return
+        for scope, query in self._unflushed_queries:
+            if scope:
+                self.checkpoint.mark_query(scope, query)
+        self._unflushed_queries = []
+        self._save_checkpoint()
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint:
+            return
+        state = self.checkpoint.state
+        state["counts"] = dict(self.counts)
+        state["searches_done"] = self.searcher.searches_done
+        state["budget"] = {
+            "granted": dict(self.budget.granted),
+            "spent": dict(self.budget.spent),
+        }
+        state["pending_leads"] = self._dry_run_leads
+        self.checkpoint.save()
+
+    def _restore_checkpoint(self) -> None:
+        state = self.checkpoint.state
+        self.counts.update(state["counts"])
+        self.searcher.searches_done = state["searches_done"]
+        self._budget_mark = self.searcher.searches_done
+        self.budget.granted.update(state["budget"]["granted"])
+        self.budget.spent.update(state["budget"]["spent"])
+        self._dry_run_leads = list(state["pending_leads"])
+        if state["phase"]:
+            logger.info(
+                "[Pipeline] Resuming run %s in phase %s "
+                "(%d searches already used)",
+                self.checkpoint.run_id, state["phase"],
+                self.searcher.searches_done,
+            )
+        else:
+            logger.info(
+                "[Pipeline] Run id %s (resume with --resume %s)",
+                self.checkpoint.run_id, self.checkpoint.run_id,
+            )
 
     def _run_enrich_phase(
         self, verticals: List[str]
     ) -> Dict[str, int]:
         """Find emails for existing leads that don't have one."""
         logger.info("\n--- Phase: Email Enrichment ---")
-        total_enriched = 0
+        self._use_budget("enrichment", self.budget.grant_enrichment())
+        try:
+            if self.queue:
+                self._enrich_queued(verticals)
+            else:
+                self._enrich_verticals(verticals)
+        finally:
+            self._use_budget(None, None)
+        return {"leads_enriched": self.counts["leads_enriched"]}
+
+    def _enrich_verticals(self, verticals: List[str]) -> None:
+        """
+        Enrich each vertical's email-less leads.
 
+        Leads stream in pages from the DB; never-attempted ones are
+        enriched as they arrive, retries once the backlog has been read.
+        """
         for v in verticals:
-            if self.searcher.searches_done >= self.max_searches:
+            if self.searcher.searches_done >= self.searcher.search_limit:
                 break
 
-            leads = self.lead_manager.get_leads_without_email(vertical=v)
-            if not leads:
+            logger.info("[Pipeline] Enriching leads in %s", v)
+            cooling = {"skipped": 0}
+            leads = stream_leads_for_enrichment(
+                self._enrichable(self.lead_manager.get_leads_without_email(
+                    vertical=v, page_size=self.read_page_size,
+                )),
+                cooling,
+            )
+            seen = 0
+            budget_left = True
+            while budget_left:
+                # Batches are planned over a page's worth of leads at a time
+                window = list(itertools.islice(leads, self.read_page_size))
+                if not window:
+                    break
+                seen += len(window)
+                for batch in plan_email_batches(window, self.enrich_batch_size):
+                    if self.searcher.searches_done >= self.searcher.search_limit:
+                        logger.warning(
+                            "[Pipeline] Enrichment budget reached"
+                        )
+                        budget_left = False
+                        break
+
+                    found, queries = self.searcher.search_emails_for_batch(batch)
+                    if not queries:
+                        budget_left = False
+                        break
+                    self._apply_enrichment(batch, found, queries)
+
+            if not seen and not cooling["skipped"]:
                 logger.info("[Pipeline] No leads without email in %s", v)
-                continue
+            if cooling["skipped"]:
+                logger.info(
+                    "[Pipeline] Skipping %d leads in %s still in retry backoff",
+                    cooling["skipped"], v,
+                )
 
-            logger.info(
-                "[Pipeline] Enriching %d leads in %s",
-                len(leads), v,
+    def _enrich_queued(self, verticals: List[str]) -> None:
+        """
+        Enqueue the enrichable leads, then enrich claimed ones.
+
+        Leads are enqueued in retry-schedule order (never-attempted
+        first); each worker claims a few batches' worth at a time and
+        hands rows back untried when its budget runs out.
+        """
+        tasks = []
+        for v in verticals:
+            leads, _ = order_leads_for_enrichment(self._enrichable(
+                self.lead_manager.get_leads_without_email(
+                    vertical=v, page_size=self.read_page_size,
+                )
+            ))
+            tasks.extend(
+                (
+                    str(lead["id"]),
+                    {key: lead.get(key) for key in (
+                        "id", "full_name", "company", "vertical", "extra_data",
+                    )},
+                )
+                for lead in leads
             )
+        added = self.queue.enqueue("enrich", tasks)
+        logger.info(
+            "[Pipeline] Work queue sweep %s: %d new enrichment tasks",
+            self.queue.sweep, added,
+        )
 
-            for lead in leads:
-                if self.searcher.searches_done >= self.max_searches:
-                    logger.warning(
-                        "[Pipeline] Max searches reached during enrichment"
-                    )
+        keeper = LeaseKeeper(self.queue, self.lease_seconds)
+        try:
+            while self.searcher.searches_done < self.searcher.search_limit:
+                claimed = self.queue.claim("enrich", 4 * self.enrich_batch_size)
+                if not claimed:
                     break
+                ids = [row["id"] for row in claimed]
+                keeper.hold(ids)
+                rows = {row["payload"]["id"]: row for row in claimed}
+                for batch in plan_email_batches(
+                    [row["payload"] for row in claimed], self.enrich_batch_size
+                ):
+                    found, queries = self.searcher.search_emails_for_batch(batch)
+                    if not queries:
+                        for lead in batch:
+                            self.queue.finish(rows[lead["id"]]["id"], status="pending")
+                        continue
+                    complete = self._apply_enrichment(batch, found, queries)
+                    for lead in batch:
+                        email = found.get(lead["id"])
+                        if not email and not complete:
+                            # Budget ran out mid-batch: hand the row back
+                            self.queue.finish(rows[lead["id"]]["id"], status="pending")
+                            continue
+                        self.queue.finish(
+                            rows[lead["id"]]["id"], result={"email": email},
+                        )
+                keeper.release(ids)
+        finally:
+            keeper.stop()
+
+    def _apply_enrichment(
+        self,
+        batch: List[Dict[str, Any]],
+        found: Dict[str, str],
+        queries: List[str],
+    ) -> bool:
+        """
+        Record the attempt for each lead, save found emails, checkpoint.
 
-                name = lead.get("full_name")
-                company = lead.get("company")
-                if not name:
-                    continue
-
-                email = self.searcher.search_email_for_lead(name, company)
-                if email:
-                    self.lead_manager.update_lead_email(lead["id"], email)
-                    total_enriched += 1
-                    logger.info(
-                        "[Pipeline] Enriched: %s → %s", name, email,
-                    )
-
-        return {"leads_enriched": total_enriched}
+        A lead left without an email only counts as a failed attempt when
+        every query planned for its batch was run; if the budget ran out
+        partway, it is left untouched for a later run. Returns whether the
+        batch's queries were all run.
+        """
+        complete = len(queries) >= len(build_batch_email_queries(batch))
+        for lead in batch:
+            email = found.get(lead["id"])
+            if not email and not complete:
+                continue
+            self.lead_manager.record_enrichment_attempt(lead, queries, email)
+            if self.checkpoint:
+                self.checkpoint.state["enrich_attempted_ids"].append(lead["id"])
+            if not email:
+                continue
+            self.lead_manager.queue_email(lead["id"], email)
+            self.counts["leads_enriched"] += 1
+            logger.info(
+                "[Pipeline] Enriched: %s → %s", lead["full_name"], email,
+            )
+        self._charge_budget()
+        self._save_checkpoint()
+        return complete
+
+    def _enrichable(
+        self, leads: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Leads with a name that this run has not already tried."""
+        attempted = set(
+            self.checkpoint.state["enrich_attempted_ids"]
+            if self.checkpoint else ()
+        )
+        return (
+            lead for lead in leads
+            if lead.get("full_name") and lead["id"] not in attempted
+        )
 
     def _run_draft_phase(
         self, verticals: List[str]
     ) -> Dict[str, int]:
         """Generate email drafts for leads without drafts."""
         logger.info("\n--- Phase 2: Email Draft Generation ---")
-        total_drafts = 0
+        drafted = set(
+            self.checkpoint.state["drafted_ids"] if self.checkpoint else ()
+        )
 
         for v in verticals:
             logger.info("\n[Pipeline] Generating drafts for vertical: %s", v)
 
             if self.dry_run and self.mode == "full":
                 # In full+dry_run, use the leads we just "found"
-                leads = [
-                    r for r in self.searcher.results
+                leads: Iterable[Dict[str, Any]] = [
+                    r for r in self._dry_run_leads
                     if r.get("vertical") == v
                 ]
             else:
+                # Streamed page by page: drafting starts on the first page
                 leads = self.lead_manager.get_leads_without_drafts(
-                    vertical=v
+                    vertical=v, page_size=self.read_page_size,
                 )
+            leads = (
+                lead for lead in leads if self._lead_key(lead) not in drafted
+            )
 
-            if not leads:
+            first = next(leads, None)
+            if first is None:
                 logger.info(
                     "[Pipeline] No new leads for %s — skipping draft generation",
                     v,
                 )
                 continue
 
-            logger.info(
-                "[Pipeline] Found %d leads needing drafts in %s",
-                len(leads), v,
-            )
-            drafts = self.copywriter.generate_drafts_for_vertical(leads, v)
-            total_drafts += len(drafts)
-
-            # Update lead status to 'draft_generated'
-            for lead in leads:
-                lead_id = lead.get("id")
-                if lead_id:
-                    self.lead_manager.update_lead_status(
-                        lead_id, "draft_generated"
-                    )
+            logger.info("[Pipeline] Drafting leads needing drafts in %s", v)
+            self.copywriter.generate_drafts_for_vertical(
+                itertools.chain([first], leads), v,
+                on_lead_done=self._on_lead_drafted,
+            )
+
+        return {"drafts_created": self.counts["drafts_created"]}
+
+    def _on_lead_drafted(self, lead: Dict[str, Any]) -> None:
+        """Mark one lead drafted right away, so a resume never redrafts it."""
+        # Update lead status to 'draft_generated'
+        lead_id = lead.get("id")
+        if lead_id:
+            self.lead_manager.queue_status(lead_id, "draft_generated")
+        created = self.copywriter.stats["drafts_created"]
+        self.counts["drafts_created"] += created - self._drafts_mark
+        self._drafts_mark = created
+        if self.checkpoint:
+            self.checkpoint.state["drafted_ids"].append(self._lead_key(lead))
+            self._save_checkpoint()
 
-        return {"drafts_created": total_drafts}
+    @staticmethod
+    def _lead_key(lead: Dict[str, Any]) -> str:
+        # Dry-run records have no id yet
+        return lead.get("id") or lead.get("linkedin_url") or lead.get("full_name")
+
+    def _search_stats(self) -> Dict[str, Any]:
+        """Cache, budget, rate, query-yield, HTTP and journal figures for the summary."""
+        stats: Dict[str, Any] = {}
+        if self.searcher.cache:
+            stats["search_cache"] = dict(self.searcher.cache.stats)
+        if self.searcher.scheduler:
+            stats["query_yield"] = self.searcher.scheduler.summary()
+        if self.budget and self.budget.granted:
+            stats["search_budget"] = self.budget.summary()
+        page_fetcher = self.searcher.page_fetcher
+        if page_fetcher and page_fetcher.stats["pages"]:
+            stats["page_fetch"] = dict(page_fetcher.stats)
+            if page_fetcher.cache:
+                stats["page_fetch"]["cache_hits"] = page_fetcher.cache.stats["hits"]
+        if self.queue:
+            stats["work_queue"] = {
+                "sweep": self.queue.sweep,
+                "search": self.queue.counts("search"),
+                "enrich": self.queue.counts("enrich"),
+            }
+        rate_control = self.searcher.rate_control
+        if rate_control:
+            stats["search_rate"] = dict(
+                rate_control.stats,
+                initial_per_min=rate_control.initial_rate * 60,
+                final_per_min=rate_control.rate * 60,
+            )
+        http_stats = self.http.summary() if self.http else {}
+        if http_stats:
+            stats["http"] = http_stats
+        if self.journal and (
+            self.journal.stats["queued"] or self.journal.stats["replayed"]
+        ):
+            stats["write_journal"] = dict(
+                self.journal.stats, pending=self.journal.pending()
+            )
+        return stats
 
     def _resolve_verticals(self) -> List[str]:
         """Resolve the vertical argument to a list of vertical names."""
@@ -2149,7 +7646,7 @@ class GrowthPipeline:
     def _get_db_client_or_none(self) -> Any:
         """Try to create a Supabase client; return None if not possible."""
         try:
-            return _get_supabase_client()
+            return _get_supabase_client(self.http)
         except SystemExit:
             logger.warning(
                 "No Supabase credentials found. Dry-run will proceed "
@@ -2160,6 +7657,83 @@ class GrowthPipeline:
     @staticmethod
     def _print_summary(results: Dict[str, Any]) -> None:
         """Print a final summary of the pipeline run."""
+        details = ""
+        cache_stats = results.get("search_cache")
+        if cache_stats:
+            details += (
+                "  Search cache: %d hits, %d misses "
+                "(%d searches saved)\n" % (
+                    cache_stats["hits"], cache_stats["misses"],
+                    cache_stats["hits"],
+                )
+            )
+        yield_rows = results.get("query_yield")
+        if yield_rows:
+            details += "  Query yield (new leads/search, all runs):\n"
+            for row in yield_rows:
+                details += "    %5.2f  %3d searches  [%s] %.60s\n" % (
+                    row["yield"], row["searches"], row["vertical"],
+                    row["query"].replace("site:linkedin.com/in ", ""),
+                )
+        budget = results.get("search_budget")
+        if budget:
+            details += "  Search budget (used/granted): %s\n" % ", ".join(
+                "%s %d/%d" % (name, row["used"], row["granted"])
+                for name, row in budget.items()
+            )
+        page_stats = results.get("page_fetch")
+        if page_stats:
+            details += (
+                "  Pages fetched: %d (%.1f MB, %d truncated, %d errors, "
+                "%d cached), %d emails seen\n" % (
+                    page_stats["pages"], page_stats["bytes"] / 1e6,
+                    page_stats["truncated"], page_stats["errors"],
+                    page_stats.get("cache_hits", 0), page_stats["emails_found"],
+                )
+            )
+        queue_stats = results.get("work_queue")
+        if queue_stats:
+            for kind in ("search", "enrich"):
+                if queue_stats[kind]:
+                    details += "  Work queue %s (%s): %s\n" % (
+                        kind, queue_stats["sweep"], ", ".join(
+                            "%d %s" % (n, status)
+                            for status, n in sorted(queue_stats[kind].items())
+                        ),
+                    )
+        rate_stats = results.get("search_rate")
+        if rate_stats:
+            details += (
+                "  Search rate: %.1f → %.1f searches/min "
+                "(%d clean, %d throttled, %d empty pages)\n" % (
+                    rate_stats["initial_per_min"], rate_stats["final_per_min"],
+                    rate_stats["clean"], rate_stats["throttled"],
+                    rate_stats["empty"],
+                )
+            )
+        journal_stats = results.get("write_journal")
+        if journal_stats:
+            details += (
+                "  Write-behind: %d rows queued, %d replayed, %d written, "
+                "%d already in DB (counted above when queued), %d dropped, "
+                "%d updates, %d pending\n" % (
+                    journal_stats["queued"], journal_stats["replayed"],
+                    journal_stats["written"], journal_stats["duplicates"],
+                    journal_stats["dropped"], journal_stats["updates"],
+                    journal_stats["pending"],
+                )
+            )
+        http_stats = results.get("http")
+        if http_stats:
+            details += "  HTTP connections (requests/opened, reused): %s\n" % (
+                ", ".join(
+                    "%s %d/%d %.0f%%" % (
+                        upstream, row["requests"], row["connections"],
+                        100.0 * row["reused"] / row["requests"],
+                    )
+                    for upstream, row in http_stats.items()
+                )
+            )
         logger.info(
             "\n" + "=" * 60 + "\n"
             "  PIPELINE SUMMARY\n"
@@ -2168,6 +7742,7 @@ class GrowthPipeline:
             "  Leads inserted: %d\n"
             "  Leads enriched (email): %d\n"
             "  Drafts created: %d\n"
+            "%s"
             "  \n"
             "  All drafts saved with status='draft_pending_review'.\n"
             "  Review in Supabase dashboard before sending.\n" +
@@ -2179,6 +7754,7 @@ class GrowthPipeline:
             results["leads_inserted"],
             results.get("leads_enriched", 0),
             results["drafts_created"],
+            details,
         )
 
 
@@ -2201,6 +7777,8 @@ def build_parser() -> argparse.ArgumentParser:
             "  %(prog)s --vertical all --mode enrich\n"
             "  %(prog)s --vertical all --mode full\n"
             "  %(prog)s --vertical all --mode full --dry-run\n"
+            "  %(prog)s --vertical all --mode search --record fixtures/\n"
+            "  %(prog)s --vertical all --mode full --dry-run --replay fixtures/\n"
             "\n"
             "Verticals: DIRECT_B2B, PHARMA, INFLUENCER, EVENTS, all\n"
             "Modes:     search (find leads), enrich (find emails for existing leads),\n"
@@ -2231,6 +7809,308 @@ def build_parser() -> argparse.ArgumentParser:
         default=20,
         help="Maximum number of Google searches per run (default: 20)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=SafeSearcher.MAX_CONCURRENT_SEARCHES,
+        help=(
+            "Search queries kept in flight under the shared rate limiter "
+            "(default: %d)" % SafeSearcher.MAX_CONCURRENT_SEARCHES
+        ),
+    )
+    parser.add_argument(
+        "--search-cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            "Reuse search result pages cached on disk; hits do not count "
+            "against --max-searches (default: enabled)"
+        ),
+    )
+    parser.add_argument(
+        "--search-cache-ttl",
+        type=float,
+        default=SearchCache.DEFAULT_TTL_HOURS,
+        metavar="HOURS",
+        help="Hours before a cached result page expires (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--search-cache-size",
+        type=int,
+        default=SearchCache.DEFAULT_MAX_ENTRIES,
+        metavar="N",
+        help="Max cached result pages, LRU-evicted (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--search-backend",
+        choices=["google", "http"],
+        default="google",
+        help=(
+            "Search provider: google (googlesearch-python) or http "
+            "(SearXNG-style JSON API at --search-url) (default: google)"
+        ),
+    )
+    parser.add_argument(
+        "--search-url",
+        default=None,
+        help="Endpoint for --search-backend http (or SEARCH_BACKEND_URL)",
+    )
+    parser.add_argument(
+        "--search-rate-limit",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=(
+            "Force the search rate limiter on/off (default: on for google "
+            "and http, off for --replay)"
+        ),
+    )
+    parser.add_argument(
+        "--record",
+        metavar="DIR",
+        default=None,
+        help="Save every search result page as a JSON fixture in DIR",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        default=None,
+        help=(
+            "Replay fixtures recorded with --record instead of searching "
+            "(offline, no rate limits)"
+        ),
+    )
+    parser.add_argument(
+        "--query-scheduler",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            "Run each vertical's most productive queries first, based on "
+            "new leads per search in past runs (default: enabled)"
+        ),
+    )
+    parser.add_argument(
+        "--compile-queries",
+        action="store_true",
+        default=False,
+        help=(
+            "Merge overlapping search queries within each selected vertical "
+            "into a smaller cover set; results are attributed back to their "
+            "source query. Each merged query still returns one page of "
+            "results, so fewer searches also means fewer result slots (e.g. "
+            "35 → 30 queries is 350 → 300 results)"
+        ),
+    )
+    parser.add_argument(
+        "--enrich-batch-size",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Pack up to N leads sharing a company (or with short names) into "
+            "one email search; found emails are matched back to each lead by "
+            "name and domain (default: 1, one lead per search)"
+        ),
+    )
+    parser.add_argument(
+        "--insert-batch-size",
+        type=int,
+        default=LeadManager.DEFAULT_BATCH_SIZE,
+        metavar="N",
+        help=(
+            "Dedup and insert found leads N at a time, one upsert per chunk "
+            f"(default: {LeadManager.DEFAULT_BATCH_SIZE})"
+        ),
+    )
+    parser.add_argument(
+        "--http-max-connections",
+        type=int,
+        default=HttpClients.DEFAULT_MAX_CONNECTIONS,
+        metavar="N",
+        help=(
+            "Connection pool size per upstream (Supabase, Claude API, "
+            f"search, pages) (default: {HttpClients.DEFAULT_MAX_CONNECTIONS})"
+        ),
+    )
+    parser.add_argument(
+        "--http-keepalive",
+        type=int,
+        default=HttpClients.DEFAULT_MAX_KEEPALIVE,
+        metavar="N",
+        help=(
+            "Idle connections kept open per upstream "
+            f"(default: {HttpClients.DEFAULT_MAX_KEEPALIVE})"
+        ),
+    )
+    parser.add_argument(
+        "--http-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "Request timeout for every upstream (default: per upstream, "
+            "%s)" % ", ".join(
+                f"{name} {int(t)}s" for name, t in HttpClients.TIMEOUTS.items()
+            )
+        ),
+    )
+    parser.add_argument(
+        "--read-page-size",
+        type=int,
+        default=LeadManager.DEFAULT_PAGE_SIZE,
+        metavar="N",
+        help=(
+            "Leads read per page when streaming the draft and enrichment "
+            f"backlogs (default: {LeadManager.DEFAULT_PAGE_SIZE})"
+        ),
+    )
+    parser.add_argument(
+        "--storage",
+        default="supabase",
+        metavar="URL",
+        help=(
+            "Database: supabase (default) or sqlite / sqlite:///path for a "
+            "local file with the same tables, for offline runs, realistic "
+            "dry-runs and benchmarks. sqlite:///crm.db is relative to the "
+            "working directory; use four slashes for an absolute path "
+            "(sqlite:////tmp/crm.db)"
+        ),
+    )
+    parser.add_argument(
+        "--write-behind",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            "Journal new leads and drafts locally and write them to "
+            "Supabase in the background; unwritten rows are replayed on "
+            "the next run (default: enabled)"
+        ),
+    )
+    parser.add_argument(
+        "--lead-index",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            "Dedup found leads against a local, incrementally synced copy "
+            "of growth_leads' LinkedIn URLs instead of querying the DB "
+            "(default: enabled)"
+        ),
+    )
+    parser.add_argument(
+        "--contact-index",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            "Match found leads against CRM contacts in memory, ignoring "
+            "accents, case, particles and middle names (default: enabled; "
+            "--no-contact-index uses exact DB name queries)"
+        ),
+    )
+    parser.add_argument(
+        "--fetch-pages",
+        action="store_true",
+        default=False,
+        help=(
+            "During email enrichment, also download the top non-LinkedIn "
+            "result pages (staff lists, programmes, ORCID) and scan them "
+            "for the lead's email; needs httpx"
+        ),
+    )
+    parser.add_argument(
+        "--page-max-bytes",
+        type=int,
+        default=PageFetcher.DEFAULT_MAX_BYTES,
+        metavar="BYTES",
+        help=(
+            "Stop reading a fetched page after this many bytes "
+            f"(default: {PageFetcher.DEFAULT_MAX_BYTES})"
+        ),
+    )
+    parser.add_argument(
+        "--page-domain-delay",
+        type=float,
+        default=PageFetcher.DEFAULT_DOMAIN_DELAY,
+        metavar="SECONDS",
+        help=(
+            "Minimum seconds between page fetches from the same domain "
+            f"(default: {PageFetcher.DEFAULT_DOMAIN_DELAY:g})"
+        ),
+    )
+    parser.add_argument(
+        "--budget-weights",
+        default=None,
+        metavar="SPEC",
+        help=(
+            "Relative share of --max-searches per vertical, e.g. "
+            "'PHARMA=2,EVENTS=0.5' (default: equal weights)"
+        ),
+    )
+    parser.add_argument(
+        "--budget-min-share",
+        type=int,
+        default=BudgetAllocator.DEFAULT_MIN_SHARE,
+        metavar="N",
+        help=(
+            "Minimum searches guaranteed to each vertical "
+            f"(default: {BudgetAllocator.DEFAULT_MIN_SHARE})"
+        ),
+    )
+    parser.add_argument(
+        "--enrich-share",
+        type=float,
+        default=BudgetAllocator.DEFAULT_ENRICH_SHARE,
+        metavar="FRACTION",
+        help=(
+            "Fraction of --max-searches reserved for email enrichment in "
+            f"full mode (default: {BudgetAllocator.DEFAULT_ENRICH_SHARE})"
+        ),
+    )
+    parser.add_argument(
+        "--work-queue",
+        default=None,
+        metavar="SPEC",
+        help=(
+            "Share searches and enrichment with other workers through a "
+            "leased work queue: 'supabase' (growth_work_queue table, see "
+            "migrations/008) or 'sqlite[:///path]' for a local file"
+        ),
+    )
+    parser.add_argument(
+        "--sweep",
+        default=None,
+        help=(
+            "Work queue sweep name; workers with the same sweep split one "
+            "set of tasks (default: today's UTC date)"
+        ),
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Lease owner name for this worker (default: hostname-pid)",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=int,
+        default=300,
+        help="Work queue lease length, renewed by heartbeats (default: 300)",
+    )
+    parser.add_argument(
+        "--gazetteer",
+        default=None,
+        metavar="FILE",
+        help=(
+            "JSON list of extra places for geo/language inference, each "
+            "{name, kind, language, country, aliases}"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        default=None,
+        metavar="RUN_ID",
+        help=(
+            "Continue an interrupted run from its checkpoint, with the "
+            "options it was started with (the run id is logged at start)"
+        ),
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -2248,12 +8128,60 @@ def main() -> None:
     if args.verbose:
         logging.getLogger("digpatho.growth").setLevel(logging.DEBUG)
 
-    pipeline = GrowthPipeline(
+    try:
+        budget_weights = parse_budget_weights(args.budget_weights)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    options = dict(
         vertical=args.vertical,
         mode=args.mode,
         dry_run=args.dry_run,
         max_searches=args.max_searches,
+        concurrency=args.concurrency,
+        search_cache=args.search_cache,
+        cache_ttl_hours=args.search_cache_ttl,
+        cache_max_entries=args.search_cache_size,
+        search_backend=args.search_backend,
+        search_url=args.search_url,
+        record_dir=args.record,
+        replay_dir=args.replay,
+        search_rate_limit=args.search_rate_limit,
+        query_scheduler=args.query_scheduler,
+        compile_queries=args.compile_queries,
+        enrich_batch_size=args.enrich_batch_size,
+        insert_batch_size=args.insert_batch_size,
+        read_page_size=args.read_page_size,
+        http_max_connections=args.http_max_connections,
+        http_max_keepalive=args.http_keepalive,
+        http_timeout=args.http_timeout,
+        write_behind=args.write_behind,
+        storage=args.storage,
+        lead_index=args.lead_index,
+        contact_index=args.contact_index,
+        fetch_pages=args.fetch_pages,
+        page_max_bytes=args.page_max_bytes,
+        page_domain_delay=args.page_domain_delay,
+        budget_weights=budget_weights,
+        budget_min_share=args.budget_min_share,
+        enrich_share=args.enrich_share,
+        work_queue=args.work_queue,
+        sweep=args.sweep,
+        worker_id=args.worker_id,
+        lease_seconds=args.lease_seconds,
+        gazetteer_path=args.gazetteer,
     )
+    if args.resume:
+        try:
+            pipeline = GrowthPipeline.resume(args.resume)
+        except FileNotFoundError:
+            parser.error(f"No checkpoint found for run {args.resume!r}")
+    else:
+        checkpoint = RunCheckpoint()
+        checkpoint.state["config"] = options
+        pipeline = GrowthPipeline(**options, checkpoint=checkpoint)
+    # SIGTERM exits through run()'s cleanup, which flushes buffered writes
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
     pipeline.run()
 
 
@@ -0,0 +1,179 @@
+-- ============================================================
+-- Growth System — Distributed work queue
+-- ============================================================
+-- Lets several ai_growth_system.py workers (different machines or
+-- egress IPs) share one prospecting sweep:
+--
+--   python ai_growth_system.py --mode search --work-queue supabase
+--
+-- Search queries and enrichment leads become rows in
+-- growth_work_queue. Workers claim rows with a time-limited lease,
+-- renew it with heartbeats while working, and mark rows done. A row
+-- whose lease expires (worker crashed or lost connectivity) is
+-- claimable again, up to max_attempts claims.
+--
+-- task_key is unique per sweep (e.g. 'search|10|<query>'), so every
+-- worker can enqueue the same tasks idempotently and no query runs
+-- twice within a sweep.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS growth_work_queue (
+    id                  BIGSERIAL PRIMARY KEY,
+    sweep               TEXT NOT NULL,
+    kind                TEXT NOT NULL
+                            CHECK (kind IN ('search', 'enrich')),
+    task_key            TEXT NOT NULL,
+    payload             JSONB NOT NULL DEFAULT '{}',
+    status              TEXT NOT NULL DEFAULT 'pending'
+                            CHECK (status IN ('pending', 'claimed', 'done', 'failed')),
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    max_attempts        INTEGER NOT NULL DEFAULT 3,
+    lease_owner         TEXT,
+    lease_expires_at    TIMESTAMPTZ,
+    result              JSONB,
+    last_error          TEXT,
+    created_at          TIMESTAMPTZ DEFAULT NOW(),
+    updated_at          TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE (sweep, kind, task_key)
+);
+
+-- Claim path: oldest claimable rows of a kind within a sweep
+CREATE INDEX IF NOT EXISTS idx_growth_work_queue_claim
+    ON growth_work_queue(sweep, kind, status, id);
+
+-- Expired-lease scan
+CREATE INDEX IF NOT EXISTS idx_growth_work_queue_lease
+    ON growth_work_queue(lease_expires_at) WHERE status = 'claimed';
+
+
+-- =========================
+-- claim_growth_work
+-- =========================
+-- Atomically claims up to p_limit rows for p_worker. Pending rows and
+-- rows whose lease has expired are both claimable; SKIP LOCKED keeps
+-- concurrent workers from blocking on (or double-claiming) the same
+-- rows. Rows that have used up max_attempts are marked 'failed'.
+
+CREATE OR REPLACE FUNCTION claim_growth_work(
+    p_sweep TEXT,
+    p_kind TEXT,
+    p_worker TEXT,
+    p_limit INTEGER DEFAULT 1,
+    p_lease_seconds INTEGER DEFAULT 300
+)
+RETURNS SETOF growth_work_queue
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE growth_work_queue
+       SET status = 'failed',
+           last_error = COALESCE(last_error, 'lease expired too many times'),
+           lease_owner = NULL,
+           lease_expires_at = NULL,
+           updated_at = NOW()
+     WHERE sweep = p_sweep
+       AND kind = p_kind
+       AND status = 'claimed'
+       AND lease_expires_at < NOW()
+       AND attempts >= max_attempts;
+
+    RETURN QUERY
+    UPDATE growth_work_queue q
+       SET status = 'claimed',
+           attempts = q.attempts + 1,
+           lease_owner = p_worker,
+           lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+           updated_at = NOW()
+     WHERE q.id IN (
+           SELECT id
+             FROM growth_work_queue
+            WHERE sweep = p_sweep
+              AND kind = p_kind
+              AND (status = 'pending'
+                   OR (status = 'claimed' AND lease_expires_at < NOW()))
+            ORDER BY id
+            LIMIT p_limit
+              FOR UPDATE SKIP LOCKED
+     )
+    RETURNING q.*;
+END;
+$$;
+
+
+-- =========================
+-- heartbeat_growth_work
+-- =========================
+-- Extends the leases p_worker still holds; returns how many were
+-- renewed. A lease already reclaimed by another worker is not renewed.
+
+CREATE OR REPLACE FUNCTION heartbeat_growth_work(
+    p_worker TEXT,
+    p_ids BIGINT[],
+    p_lease_seconds INTEGER DEFAULT 300
+)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH renewed AS (
+        UPDATE growth_work_queue
+           SET lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+               updated_at = NOW()
+         WHERE id = ANY(p_ids)
+           AND status = 'claimed'
+           AND lease_owner = p_worker
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM renewed;
+$$;
+
+
+-- =========================
+-- finish_growth_work
+-- =========================
+-- Marks a claimed row done (or failed, or back to pending when
+-- p_status = 'pending' for work the worker gave up without trying).
+-- Only the current lease owner can finish a row; returns false if the
+-- lease was lost.
+
+CREATE OR REPLACE FUNCTION finish_growth_work(
+    p_worker TEXT,
+    p_id BIGINT,
+    p_status TEXT DEFAULT 'done',
+    p_result JSONB DEFAULT NULL,
+    p_error TEXT DEFAULT NULL
+)
+RETURNS BOOLEAN
+LANGUAGE sql
+AS $$
+    WITH finished AS (
+        UPDATE growth_work_queue
+           SET status = p_status,
+               attempts = CASE WHEN p_status = 'pending'
+                               THEN GREATEST(attempts - 1, 0)
+                               ELSE attempts END,
+               result = COALESCE(p_result, result),
+               last_error = p_error,
+               lease_owner = NULL,
+               lease_expires_at = NULL,
+               updated_at = NOW()
+         WHERE id = p_id
+           AND status = 'claimed'
+           AND lease_owner = p_worker
+        RETURNING 1
+    )
+    SELECT EXISTS (SELECT 1 FROM finished);
+$$;
+
+
+-- =========================
+-- Row Level Security (RLS)
+-- =========================
+-- Workers use the SERVICE_ROLE key (bypasses RLS); the UI may read
+-- queue progress.
+
+ALTER TABLE growth_work_queue ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Authenticated users can read growth_work_queue" ON growth_work_queue;
+
+CREATE POLICY "Authenticated users can read growth_work_queue"
+    ON growth_work_queue FOR SELECT TO authenticated USING (true);
@@ -0,0 +1,46 @@
+-- ============================================================
+-- Growth System — Bulk lead updates
+-- ============================================================
+-- LeadManager buffers per-lead changes made during a run (emails found
+-- by enrichment, enrichment attempt records in extra_data) and writes
+-- them with one call instead of one PATCH per lead:
+--
+--   select bulk_update_growth_leads('[
+--     {"id": "…", "email": "a@b.org", "extra_data": {…}},
+--     {"id": "…", "extra_data": {…}}
+--   ]');
+--
+-- Only the keys present in each element are changed, and extra_data is
+-- merged into the stored object (top-level keys replaced, others kept),
+-- so callers can send just the keys they own. updated_at is bumped on
+-- every row touched. Status changes that share one value are sent as
+-- a plain UPDATE … WHERE id IN (…) and don't need this.
+--
+-- Without this function the script falls back to one update per lead.
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION bulk_update_growth_leads(p_updates JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH changes AS (
+        SELECT (u->>'id')::UUID AS id, u
+          FROM jsonb_array_elements(p_updates) AS u
+    ),
+    updated AS (
+        UPDATE growth_leads g
+           SET email = CASE WHEN c.u ? 'email'
+                            THEN c.u->>'email' ELSE g.email END,
+               status = CASE WHEN c.u ? 'status'
+                             THEN c.u->>'status' ELSE g.status END,
+               extra_data = CASE WHEN c.u ? 'extra_data'
+                                 THEN COALESCE(g.extra_data, '{}'::JSONB)
+                                      || (c.u->'extra_data')
+                                 ELSE g.extra_data END,
+               updated_at = NOW()
+          FROM changes c
+         WHERE g.id = c.id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$;
@@ -0,0 +1,77 @@
+-- ============================================================
+-- Growth System — Queue read indexes and draft anti-join
+-- ============================================================
+-- The pipeline's hottest reads page through growth_leads one vertical
+-- at a time, in (created_at, id) order (keyset pagination):
+--
+--   draft phase:       status = 'new' AND vertical = ?
+--   enrichment phase:  email IS NULL AND status <> 'ignored' AND vertical = ?
+--
+-- With only the single-column indexes from 001, Postgres has to
+-- combine or filter large row sets for these. Each partial index below
+-- holds exactly the rows one read wants, in the order it reads them,
+-- so a page is a single index range scan.
+--
+-- growth_leads_without_drafts() returns 'new' leads that also have no
+-- growth_email_drafts row (an anti-join probing
+-- idx_growth_drafts_lead_id), so a lead whose status update was lost
+-- after its draft was saved is not drafted again. ai_growth_system.py
+-- uses it when present and falls back to the status filter otherwise.
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS idx_growth_leads_new_queue
+    ON growth_leads(vertical, created_at, id)
+    WHERE status = 'new';
+
+CREATE INDEX IF NOT EXISTS idx_growth_leads_no_email_queue
+    ON growth_leads(vertical, created_at, id)
+    WHERE email IS NULL AND status <> 'ignored';
+
+-- Anti-join probe (created in 001; repeated for hand-made setups)
+CREATE INDEX IF NOT EXISTS idx_growth_drafts_lead_id
+    ON growth_email_drafts(lead_id);
+
+
+-- =========================
+-- growth_leads_without_drafts
+-- =========================
+-- One page of leads to draft, after the (p_after_created_at,
+-- p_after_id) key of the previous page (NULL for the first page).
+-- A single STABLE SELECT, so Postgres inlines it and plans with the
+-- actual arguments (the vertical test folds away).
+
+CREATE OR REPLACE FUNCTION growth_leads_without_drafts(
+    p_vertical TEXT DEFAULT NULL,
+    p_after_created_at TIMESTAMPTZ DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL,
+    p_limit INTEGER DEFAULT 500
+)
+RETURNS TABLE (
+    id              UUID,
+    full_name       TEXT,
+    job_title       TEXT,
+    company         TEXT,
+    email           TEXT,
+    linkedin_url    TEXT,
+    vertical        TEXT,
+    geo             TEXT,
+    created_at      TIMESTAMPTZ
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT l.id, l.full_name, l.job_title, l.company, l.email,
+           l.linkedin_url, l.vertical, l.geo, l.created_at
+      FROM growth_leads l
+     WHERE l.status = 'new'
+       AND (p_vertical IS NULL OR l.vertical = p_vertical)
+       AND (p_after_created_at IS NULL
+            OR (l.created_at, l.id) > (p_after_created_at, p_after_id))
+       AND NOT EXISTS (
+           SELECT 1
+             FROM growth_email_drafts d
+            WHERE d.lead_id = l.id
+       )
+     ORDER BY l.created_at, l.id
+     LIMIT p_limit;
+$$;